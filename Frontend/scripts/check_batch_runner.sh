@@ -0,0 +1,47 @@
+#!/bin/bash
+shopt -s nullglob
+
+# Checks that the session batch runner writes the same session files as running the
+# frontend once per session input file, for a day of session inputs.
+# Usage: bash scripts/check_batch_runner.sh [<day_session_inputs>]
+
+# Directory configuration
+INPUT_DIR="${1:-inputs/daily_session_inputs/day_1_session_inputs}"
+SRC_DIR="src"
+CURRENT_BANK_ACCOUNTS_FILE="inputs/current_bank_accounts.txt"
+BATCH_OUTPUT_DIR="$(mktemp -d)"
+LOOP_OUTPUT_DIR="$(mktemp -d)"
+trap 'rm -rf "$BATCH_OUTPUT_DIR" "$LOOP_OUTPUT_DIR"' EXIT
+
+# Replay the day in one batch
+python "$SRC_DIR/session_batch_runner.py" \
+    "$CURRENT_BANK_ACCOUNTS_FILE" \
+    "$INPUT_DIR" \
+    "$BATCH_OUTPUT_DIR" \
+    --workers 2
+
+# Replay the day one session at a time, numbered in the batch runner's order
+input_files=("$INPUT_DIR"/*.input)
+session_number=0
+for input_file in $(printf '%s\n' "$INPUT_DIR"/*.input | sort -V)
+do
+    session_number=$((session_number + 1))
+
+    python "$SRC_DIR/banking_system_frontend.py" \
+        "$CURRENT_BANK_ACCOUNTS_FILE" \
+        "$LOOP_OUTPUT_DIR/session_$session_number.txt" \
+        "$session_number" \
+        "${#input_files[@]}" \
+        < "$input_file" \
+        > "$LOOP_OUTPUT_DIR/session_$session_number.out" \
+        2> /dev/null
+done
+
+# Compare session files
+if diff -r "$LOOP_OUTPUT_DIR" "$BATCH_OUTPUT_DIR"
+then
+    echo "Batch runner check: PASS"
+else
+    echo "Batch runner check: FAIL"
+    exit 1
+fi
@@ -0,0 +1,27 @@
+import sys
+
+ACTIVE = sys.intern("A")
+DISABLED = sys.intern("D")
+
+
+class Account:
+    """
+    Stores a single bank account loaded from the input file.
+    Uses slots instead of a per-account dict to keep the memory footprint small,
+    and interns the status code so that all accounts share it.
+    """
+
+    __slots__ = ("number", "holder_name", "status", "balance")
+
+    def __init__(self, number, holder_name, status, balance):
+        """
+        Constructs an Account object.
+        :param number: Account number
+        :param holder_name: Account holder name
+        :param status: Account status code ('A' or 'D')
+        :param balance: Account balance as a string
+        """
+        self.number = number
+        self.holder_name = holder_name
+        self.status = sys.intern(status)
+        self.balance = balance
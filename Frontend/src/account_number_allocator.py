@@ -0,0 +1,79 @@
+MAX_ACCOUNT_NUMBER = 99999
+SESSION_BLOCK_SIZE = 100
+
+
+class AccountNumberAllocator:
+    """
+    Hands out new account numbers from a range, in order, never the same one twice.
+    Frontend sessions that run at the same time each allocate from their own blocks
+    of the numbers above the highest existing account number, so that they never
+    create two accounts with the same number. The blocks of the sessions take turns:
+    when a session has used up its block, it moves on to its next block, past the
+    blocks of all the other sessions.
+    """
+
+    def __init__(
+        self,
+        first_number,
+        last_number=MAX_ACCOUNT_NUMBER,
+        block_size=None,
+        block_stride=None,
+    ):
+        """
+        Constructs an AccountNumberAllocator object.
+        :param first_number: First account number to hand out
+        :param last_number: Last account number to hand out
+        :param block_size: Number of account numbers per block, or None to hand out
+                           the whole range as one block
+        :param block_stride: Distance from the first number of a block to the first
+                             number of the next one, or None if there is no next block
+        """
+        self.next_number = first_number
+        self.last_number = last_number
+        self.block_first_number = first_number
+        self.block_last_number = (
+            last_number if block_size is None else first_number + block_size - 1
+        )
+        self.block_stride = block_stride
+
+    def allocate(self):
+        """
+        Hands out the next account number.
+        :return: A unique 5-digit account number string, or None if the range is used up
+        """
+        if self.next_number > self.block_last_number and self.block_stride is not None:
+            block_size = self.block_last_number - self.block_first_number + 1
+            self.block_first_number += self.block_stride
+            self.block_last_number = self.block_first_number + block_size - 1
+            self.next_number = self.block_first_number
+
+        if (
+            self.next_number > self.block_last_number
+            or self.next_number > self.last_number
+        ):
+            return None
+
+        account_number = self.next_number
+        self.next_number += 1
+        return f"{account_number:05d}"
+
+
+def reserve_session_blocks(
+    high_water_mark, session_number, num_sessions=None, block_size=SESSION_BLOCK_SIZE
+):
+    """
+    Reserves the blocks of account numbers of a session. The blocks only depend on
+    the session number and the number of sessions, so sessions running in separate
+    processes never overlap.
+    :param high_water_mark: Highest existing account number
+    :param session_number: Session number, counted from 1
+    :param num_sessions: Number of sessions running at the same time, or None if
+                         unknown, in which case the session only gets its first block
+    :param block_size: Number of account numbers per block
+    :return: AccountNumberAllocator object handing out the session's blocks
+    """
+    first_number = high_water_mark + 1 + (session_number - 1) * block_size
+    block_stride = None if num_sessions is None else num_sessions * block_size
+    return AccountNumberAllocator(
+        first_number, MAX_ACCOUNT_NUMBER, block_size, block_stride
+    )
@@ -1,4 +1,8 @@
-import random
+from account import Account, ACTIVE
+from account_number_allocator import (
+    AccountNumberAllocator,
+    reserve_session_blocks,
+)
 
 
 class BankAccounts:
@@ -6,13 +10,18 @@ class BankAccounts:
     Manages bank accounts loaded from the input file.
     Allows for account validation, status checks, balance retrieval,
     and account number generation.
+    Accounts are indexed by account number, and by casefolded holder name and
+    account number, so that validating an account never scans the accounts.
     """
 
     def __init__(self):
         """
         Constructs a BankAccounts object.
         """
-        self.accounts = []
+        self.accounts = {}
+        self.holder_index = set()
+        self.high_water_mark = 0
+        self.allocator = AccountNumberAllocator(1)
 
     def load_accounts(self, filename):
         """
@@ -20,7 +29,9 @@ class BankAccounts:
         Stops reading when the END_OF_FILE record is reached.
         :param filename: Path to the input file
         """
-        self.accounts = []
+        self.accounts = {}
+        self.holder_index = set()
+        self.high_water_mark = 0
         try:
             with open(filename, "r") as file:
                 for record in file:
@@ -33,17 +44,28 @@ class BankAccounts:
                     if account_holder_name == "END OF FILE":
                         break
 
-                    account = {
-                        "number": account_number,
-                        "holder_name": account_holder_name,
-                        "status": account_status,
-                        "balance": account_balance,
-                    }
+                    account = Account(
+                        account_number,
+                        account_holder_name,
+                        account_status,
+                        account_balance,
+                    )
 
-                    self.accounts.append(account)
+                    # Like a scan, lookups by number find the first record of a number.
+                    self.accounts.setdefault(account_number, account)
+                    self.holder_index.add(
+                        (account_holder_name.casefold(), account_number)
+                    )
+                    if account_number.isdigit():
+                        self.high_water_mark = max(
+                            self.high_water_mark, int(account_number)
+                        )
 
         except FileNotFoundError:
-            self.accounts = []
+            self.accounts = {}
+            self.holder_index = set()
+            self.high_water_mark = 0
+        self.allocator = AccountNumberAllocator(self.high_water_mark + 1)
 
     def account_exists(self, account_holder_name, account_number):
         """
@@ -53,14 +75,7 @@ class BankAccounts:
         :param account_number: Account number
         :return: True if the account exists, False otherwise
         """
-        account_holder_name = account_holder_name.lower()
-        for account in self.accounts:
-            if (
-                account["holder_name"].lower() == account_holder_name
-                and account["number"] == account_number
-            ):
-                return True
-        return False
+        return (account_holder_name.casefold(), account_number) in self.holder_index
 
     def is_account_active(self, account_number):
         """
@@ -68,10 +83,8 @@ class BankAccounts:
         :param account_number: Account number
         :return: True if the account is active, False otherwise
         """
-        for account in self.accounts:
-            if account["number"] == account_number:
-                return account["status"] == "A"
-        return False
+        account = self.accounts.get(account_number)
+        return account is not None and account.status == ACTIVE
 
     def get_account_balance(self, account_number):
         """
@@ -79,24 +92,26 @@ class BankAccounts:
         :param account_number: Account number
         :return: Account balance as a string, or None if not found
         """
-        for account in self.accounts:
-            if account["number"] == account_number:
-                return account["balance"]
-        return None
+        account = self.accounts.get(account_number)
+        return account.balance if account is not None else None
 
-    def generate_account_number(self):
+    def reserve_session_numbers(self, session_number, num_sessions=None):
         """
-        Generates a unique 5-digit account number for new accounts, sequentially.
-        :return: A unique 5-digit account number string
+        Restricts the account numbers handed out from now on to the blocks of a
+        session, so that sessions running at the same time never hand out the same
+        account number.
+        :param session_number: Session number, counted from 1
+        :param num_sessions: Number of sessions running at the same time, or None if
+                             unknown, in which case the session only gets one block
         """
-        if not self.accounts:
-            return "00001"
-
-        existing_numbers = [
-            int(account["number"])
-            for account in self.accounts
-            if account["number"].isdigit()
-        ]
+        self.allocator = reserve_session_blocks(
+            self.high_water_mark, session_number, num_sessions
+        )
 
-        next_number = max(existing_numbers) + 1
-        return f"{next_number:05d}"
+    def generate_account_number(self):
+        """
+        Generates a unique 5-digit account number for new accounts, sequentially,
+        above the highest existing account number.
+        :return: A unique 5-digit account number string, or None if none is left
+        """
+        return self.allocator.allocate()
@@ -14,13 +14,17 @@ Output files:
 Instructions:
 1. Open the terminal
 2. Change the directory to 'frontend/src': cd frontend/src
-3. Run this file: python banking_system_frontend.py <current_bank_accounts_file> <bank_account_transactions_file>
+3. Run this file: python banking_system_frontend.py <current_bank_accounts_file> <bank_account_transactions_file> [<session_number> [<num_sessions>]]
+
+When several sessions run at the same time, giving each one its own session number
+makes them create accounts from disjoint blocks of account numbers. Given the number
+of sessions as well, a session that uses up its block moves on to a further one.
 """
 
 from session import Session
 from bank_accounts import BankAccounts
 from transaction_executor import TransactionExecutor
-from transaction_file_writer import TransactionFileWriter
+from transaction_file_writer import FLUSH_EVERY_RECORD, TransactionFileWriter
 import sys
 
 
@@ -30,15 +34,42 @@ class BankingSystemFrontend:
     Coordinates user login, menu display, transaction handling, and session termination.
     """
 
-    def __init__(self, current_bank_accounts_file, bank_account_transactions_file):
+    def __init__(
+        self,
+        current_bank_accounts_file,
+        bank_account_transactions_file,
+        accounts=None,
+        session_number=None,
+        num_sessions=None,
+        flush_every=FLUSH_EVERY_RECORD,
+        flush_interval=None,
+        fsync=False,
+    ):
         """
         Constructs a BankingSystemFrontend object.
+        :param current_bank_accounts_file: 'Current bank accounts' file path, or None
+                                           if the accounts are already loaded
+        :param bank_account_transactions_file: 'Bank account transactions' file path
+        :param accounts: BankAccounts object already loaded, shared by several
+                         sessions, or None to load the accounts at login
+        :param session_number: Number of the session among the sessions running at
+                               the same time, counted from 1, or None if it runs alone
+        :param num_sessions: Number of sessions running at the same time, or None
+        :param flush_every: Number of transaction records between flushes of the
+                            'bank account transactions' file, or None
+        :param flush_interval: Maximum number of seconds a transaction record waits to
+                               be flushed, or None
+        :param fsync: Whether to fsync the file after each flush
         """
         self.session = None
-        self.accounts = BankAccounts()
+        self.accounts = accounts if accounts is not None else BankAccounts()
         self.executor = TransactionExecutor(self.accounts)
-        self.writer = TransactionFileWriter(bank_account_transactions_file)
+        self.writer = TransactionFileWriter(
+            bank_account_transactions_file, flush_every, flush_interval, fsync
+        )
         self.current_bank_accounts_file = current_bank_accounts_file
+        self.session_number = session_number
+        self.num_sessions = num_sessions
 
     def run(self):
         """
@@ -46,15 +77,24 @@ class BankingSystemFrontend:
         """
         print("Banking System\n")
         self.login()
-        self.accounts.load_accounts(self.current_bank_accounts_file)
-
-        while self.session.is_active:
-            if self.session.user_type == "SU":
-                self.display_standard_menu()
-            else:
-                self.display_admin_menu()
-
-        self.logout()
+        if self.current_bank_accounts_file is not None:
+            self.accounts.load_accounts(self.current_bank_accounts_file)
+        if self.session_number is not None:
+            self.accounts.reserve_session_numbers(
+                self.session_number, self.num_sessions
+            )
+
+        # Records already made reach the file even if the session ends abruptly.
+        try:
+            while self.session.is_active:
+                if self.session.user_type == "SU":
+                    self.display_standard_menu()
+                else:
+                    self.display_admin_menu()
+
+            self.logout()
+        finally:
+            self.writer.close()
 
     def login(self):
         """
@@ -127,11 +167,13 @@ class BankingSystemFrontend:
     def logout(self):
         """
         Handles program logout.
-        Generates and writes the logout transaction record.
+        Generates and writes the logout transaction record, and closes the
+        'bank account transactions' file.
         """
         transaction_record = self.executor.execute_logout()
         if transaction_record:
             self.writer.write_transaction_record(transaction_record)
+        self.writer.close()
 
         print("Logout completed.")
 
@@ -183,16 +225,21 @@ class BankingSystemFrontend:
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
+    if len(sys.argv) not in (3, 4, 5):
         print(
-            "Usage: python banking_system_frontend.py <current_bank_accounts_file> <bank_account_transactions_file>"
+            "Usage: python banking_system_frontend.py <current_bank_accounts_file> <bank_account_transactions_file> [<session_number> [<num_sessions>]]"
         )
         sys.exit(1)
 
     current_bank_accounts_file = sys.argv[1]
     bank_account_transactions_file = sys.argv[2]
+    session_number = int(sys.argv[3]) if len(sys.argv) >= 4 else None
+    num_sessions = int(sys.argv[4]) if len(sys.argv) == 5 else None
 
     app = BankingSystemFrontend(
-        current_bank_accounts_file, bank_account_transactions_file
+        current_bank_accounts_file,
+        bank_account_transactions_file,
+        session_number=session_number,
+        num_sessions=num_sessions,
     )
     app.run()
@@ -0,0 +1,215 @@
+"""
+Session Batch Runner
+
+Replays a day of frontend session input files in one process pool, instead of
+starting the frontend once per session with its input redirected. The current bank
+accounts file is loaded once and shared by every session, and the sessions run in
+parallel, since none of them changes the accounts another one sees. Each session
+creates accounts from its own blocks of account numbers, so that no two sessions
+create the same account. A session's records are written to its file in one go,
+when it ends, rather than flushed one by one.
+
+Each session input file is replayed as the scripted input of its own
+BankingSystemFrontend, and produces the same files as a separate run would:
+- session_<N>.txt: The 'bank account transactions' file of the session.
+- session_<N>.out: The console output of the session.
+
+Sessions are numbered from 1 in the order of the numbers in the input file names, so
+session_10.input comes after session_2.input.
+
+A session that fails does not stop the others. Its console output file ends with the
+error, and it is reported at the end of the run, as are the sessions whose input ends
+before they log out.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'frontend/src': cd frontend/src
+3. Run this file:
+   python session_batch_runner.py <current_bank_accounts_file> <session_inputs_dir>
+   <session_outputs_dir> [--workers N]
+"""
+
+from bank_accounts import BankAccounts
+from banking_system_frontend import BankingSystemFrontend
+from contextlib import redirect_stdout
+import argparse
+import glob
+import io
+import multiprocessing
+import os
+import re
+import sys
+import traceback
+
+SESSION_INPUT_PATTERN = "*.input"
+
+# Accounts shared by the sessions replayed in a worker process
+worker_accounts = None
+
+
+def natural_sort_key(path):
+    """
+    Provides a sort key that orders file names by the numbers in them.
+    :param path: File path
+    :return: Sort key
+    """
+    # Splitting on digit runs puts the numbers at the odd indices.
+    parts = re.split(r"(\d+)", os.path.basename(path))
+    return [int(part) if index % 2 else part for index, part in enumerate(parts)], path
+
+
+def init_worker(accounts):
+    """
+    Stores the accounts shared by the sessions replayed in a worker process.
+    :param accounts: BankAccounts object
+    """
+    global worker_accounts
+    worker_accounts = accounts
+
+
+def replay_session(session_files):
+    """
+    Replays one session input file through the frontend.
+    :param session_files: Tuple of (session number, number of sessions, session input
+                          file path, 'bank account transactions' file path, console
+                          output file path)
+    :return: Tuple of (whether the session logged out, error message if the session
+             failed, or None)
+    """
+    (
+        session_number,
+        num_sessions,
+        session_input_file,
+        bank_account_transactions_file,
+        console_output_file,
+    ) = session_files
+    with open(session_input_file, "r") as file:
+        session_input = io.StringIO(file.read())
+    # The frontend appends its records, so a previous run's file must not remain.
+    if os.path.exists(bank_account_transactions_file):
+        os.remove(bank_account_transactions_file)
+
+    console_output = io.StringIO()
+    frontend = BankingSystemFrontend(
+        None,
+        bank_account_transactions_file,
+        accounts=worker_accounts,
+        session_number=session_number,
+        num_sessions=num_sessions,
+        flush_every=None,
+    )
+    logged_out = True
+    error = None
+    stdin = sys.stdin
+    sys.stdin = session_input
+    try:
+        with redirect_stdout(console_output):
+            frontend.run()
+    except EOFError:
+        logged_out = False
+    except Exception as exception:
+        # A failing session must not stop the others, so it is reported instead.
+        logged_out = False
+        error = f"{type(exception).__name__}: {exception}"
+        console_output.write(traceback.format_exc())
+    finally:
+        sys.stdin = stdin
+
+    with open(console_output_file, "w") as file:
+        file.write(console_output.getvalue())
+    return logged_out, error
+
+
+def run_sessions(
+    current_bank_accounts_file, session_inputs_dir, session_outputs_dir, workers=1
+):
+    """
+    Replays every session input file of a directory.
+    :param current_bank_accounts_file: 'Current bank accounts' file path
+    :param session_inputs_dir: Directory of the session input files
+    :param session_outputs_dir: Directory to write the session files to
+    :param workers: Number of worker processes replaying sessions
+    :return: List of (session input file path, whether the session logged out, error
+             message if the session failed, or None)
+    """
+    session_input_files = sorted(
+        glob.glob(os.path.join(session_inputs_dir, SESSION_INPUT_PATTERN)),
+        key=natural_sort_key,
+    )
+    tasks = [
+        (
+            session_number,
+            len(session_input_files),
+            session_input_file,
+            os.path.join(session_outputs_dir, f"session_{session_number}.txt"),
+            os.path.join(session_outputs_dir, f"session_{session_number}.out"),
+        )
+        for session_number, session_input_file in enumerate(session_input_files, 1)
+    ]
+
+    accounts = BankAccounts()
+    accounts.load_accounts(current_bank_accounts_file)
+    if workers > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(
+            workers, initializer=init_worker, initargs=(accounts,)
+        ) as pool:
+            results = pool.map(replay_session, tasks)
+    else:
+        init_worker(accounts)
+        results = [replay_session(task) for task in tasks]
+
+    return [
+        (session_input_file, logged_out, error)
+        for session_input_file, (logged_out, error) in zip(session_input_files, results)
+    ]
+
+
+def parse_arguments():
+    """
+    Parses the command-line arguments.
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Replays a day of banking system front-end sessions.",
+        usage="python session_batch_runner.py "
+        "<current_bank_accounts_file> "
+        "<session_inputs_dir> "
+        "<session_outputs_dir> [--workers N]",
+    )
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument("session_inputs_dir")
+    parser.add_argument("session_outputs_dir")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes replaying sessions (default: one per CPU)",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    os.makedirs(arguments.session_outputs_dir, exist_ok=True)
+
+    results = run_sessions(
+        arguments.current_bank_accounts_file,
+        arguments.session_inputs_dir,
+        arguments.session_outputs_dir,
+        arguments.workers,
+    )
+    if not results:
+        print(
+            f"ERROR: No session input files found in '{arguments.session_inputs_dir}'."
+        )
+        sys.exit(1)
+
+    print(f"Replayed {len(results)} session(s).")
+    for session_input_file, logged_out, error in results:
+        if error is not None:
+            print(f"ERROR: '{os.path.basename(session_input_file)}' failed: {error}")
+        elif not logged_out:
+            print(
+                f"WARNING: '{os.path.basename(session_input_file)}' ended before "
+                "logging out."
+            )
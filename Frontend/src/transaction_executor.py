@@ -107,6 +107,9 @@ class TransactionExecutor:
 
         account_holder_name = self.get_account_holder_name(session)
         account_number = self.accounts.generate_account_number()
+        if account_number is None:
+            print("Invalid transaction: No account numbers left.")
+            return None
         initial_account_balance = self.prompt_amount(
             "Enter initial account balance: $", "CA", session
         )
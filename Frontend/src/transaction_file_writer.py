@@ -1,19 +1,82 @@
+import os
+import threading
+
+# Flushes after every record, so that each record reaches the file as it is made
+FLUSH_EVERY_RECORD = 1
+
+
 class TransactionFileWriter:
     """
     Handles writing transaction records to the output file.
+    The file stays open for the whole session. Records are flushed to it according
+    to the flush policy: every so many records, within so many seconds of being
+    written, or only when the writer is closed at logout. Flushed records can also be
+    fsynced to disk.
     """
 
-    def __init__(self, filename="frontend/bank_account_transactions.txt"):
+    def __init__(
+        self,
+        filename="frontend/bank_account_transactions.txt",
+        flush_every=FLUSH_EVERY_RECORD,
+        flush_interval=None,
+        fsync=False,
+    ):
         """
         Constructs a TransactionFileWriter object.
         :param filename: Path to the output file
+        :param flush_every: Number of records between flushes, or None
+        :param flush_interval: Maximum number of seconds a record waits to be flushed,
+                               or None
+        :param fsync: Whether to fsync the file after each flush
         """
         self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.file = None
+        self.num_pending = 0
+        # The flush timer runs on its own thread, while the session waits for input.
+        self.lock = threading.RLock()
+        self.flush_timer = None
 
     def write_transaction_record(self, transaction_record):
         """
         Appends a single formatted transaction record to the output file.
         :param transaction_record: Formatted transaction record string
         """
-        with open(self.filename, "a") as file:
-            file.write(transaction_record + "\n")
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.filename, "a")
+            self.file.write(transaction_record + "\n")
+            self.num_pending += 1
+
+            if self.flush_every is not None and self.num_pending >= self.flush_every:
+                self.flush()
+            elif self.flush_interval is not None and self.flush_timer is None:
+                self.flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+
+    def flush(self):
+        """
+        Flushes the records written so far to the output file.
+        """
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if self.file is not None:
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+            self.num_pending = 0
+
+    def close(self):
+        """
+        Flushes the remaining records and closes the output file.
+        """
+        with self.lock:
+            self.flush()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,421 @@
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if FRONTEND_SRC not in sys.path:
+    sys.path.insert(0, FRONTEND_SRC)
+CURRENT_BANK_ACCOUNTS_FILE = os.path.abspath(
+    os.path.join(CURRENT_DIR, "..", "inputs", "current_bank_accounts.txt")
+)
+
+from account_number_allocator import (
+    MAX_ACCOUNT_NUMBER,
+    SESSION_BLOCK_SIZE,
+    AccountNumberAllocator,
+    reserve_session_blocks,
+)
+from bank_accounts import BankAccounts
+from banking_system_frontend import BankingSystemFrontend
+from transaction_file_writer import TransactionFileWriter
+
+DEPOSIT_RECORD = "04 John Doe             12345 00100.00 00"
+
+
+class BankAccountsTest(unittest.TestCase):
+    """
+    Unit tests for the account lookups of BankAccounts.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'current bank accounts' file.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.current_bank_accounts_file = os.path.join(
+            self.directory.name, "current_bank_accounts.txt"
+        )
+        with open(self.current_bank_accounts_file, "w") as file:
+            file.write("12345 John Doe             A 00100.00\n")
+            file.write("54321 Jane Doe             D 00200.00\n")
+            file.write("54321 Jane Smith           A 00300.00\n")
+            file.write("00000 END OF FILE          A 00000.00\n")
+            file.write("99999 After End            A 00400.00\n")
+        self.accounts = BankAccounts()
+        self.accounts.load_accounts(self.current_bank_accounts_file)
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def test_ba01_holder_name_matches_regardless_of_case(self):
+        """
+        BA01_Holder_Name_Matches_Regardless_Of_Case
+
+        An account is found by its holder name in any case, but only with its own
+        account number.
+        """
+        self.assertTrue(self.accounts.account_exists("John Doe", "12345"))
+        self.assertTrue(self.accounts.account_exists("JOHN DOE", "12345"))
+        self.assertTrue(self.accounts.account_exists("john doe", "12345"))
+        self.assertFalse(self.accounts.account_exists("John Doe", "54321"))
+        self.assertFalse(self.accounts.account_exists("John", "12345"))
+
+    def test_ba02_duplicate_account_number_uses_first_record(self):
+        """
+        BA02_Duplicate_Account_Number_Uses_First_Record
+
+        When an account number appears twice, its status and balance come from its
+        first record, while both holder names match it.
+        """
+        self.assertFalse(self.accounts.is_account_active("54321"))
+        self.assertEqual(self.accounts.get_account_balance("54321"), "00200.00")
+        self.assertTrue(self.accounts.account_exists("Jane Doe", "54321"))
+        self.assertTrue(self.accounts.account_exists("Jane Smith", "54321"))
+
+    def test_ba03_records_after_end_of_file_ignored(self):
+        """
+        BA03_Records_After_End_Of_File_Ignored
+
+        Records after the END_OF_FILE record are not loaded, and unknown accounts are
+        neither active nor have a balance.
+        """
+        self.assertTrue(self.accounts.is_account_active("12345"))
+        self.assertEqual(self.accounts.get_account_balance("12345"), "00100.00")
+        self.assertFalse(self.accounts.is_account_active("99999"))
+        self.assertIsNone(self.accounts.get_account_balance("99999"))
+        self.assertEqual(self.accounts.generate_account_number(), "54322")
+
+    def test_ba04_missing_file_loads_no_accounts(self):
+        """
+        BA04_Missing_File_Loads_No_Accounts
+
+        A missing file leaves no accounts from an earlier load, and new account
+        numbers start from 00001.
+        """
+        self.accounts.load_accounts(os.path.join(self.directory.name, "missing.txt"))
+
+        self.assertEqual(self.accounts.accounts, {})
+        self.assertFalse(self.accounts.account_exists("John Doe", "12345"))
+        self.assertFalse(self.accounts.is_account_active("12345"))
+        self.assertIsNone(self.accounts.get_account_balance("12345"))
+        self.assertEqual(self.accounts.generate_account_number(), "00001")
+
+
+class AccountNumberAllocatorTest(unittest.TestCase):
+    """
+    Unit tests for the account number blocks of concurrent sessions.
+    """
+
+    def allocate_all(self, allocator):
+        """
+        Hands out account numbers until the allocator is used up.
+        :param allocator: AccountNumberAllocator object
+        :return: List of the account numbers handed out, as integers
+        """
+        account_numbers = []
+        account_number = allocator.allocate()
+        while account_number is not None:
+            account_numbers.append(int(account_number))
+            account_number = allocator.allocate()
+        return account_numbers
+
+    def test_ana01_whole_range_in_order(self):
+        """
+        ANA01_Whole_Range_In_Order
+
+        Without blocks, numbers are handed out in order up to the last number, then
+        None.
+        """
+        allocator = AccountNumberAllocator(99998)
+
+        self.assertEqual(allocator.allocate(), "99998")
+        self.assertEqual(allocator.allocate(), "99999")
+        self.assertIsNone(allocator.allocate())
+        self.assertIsNone(allocator.allocate())
+
+    def test_ana02_sessions_never_overlap(self):
+        """
+        ANA02_Sessions_Never_Overlap
+
+        Sessions moving through several blocks each never hand out a number another
+        session hands out, and every number above the high water mark is used.
+        """
+        high_water_mark = 54322
+        num_sessions = 4
+        account_numbers = set()
+        for session_number in range(1, num_sessions + 1):
+            allocator = reserve_session_blocks(
+                high_water_mark, session_number, num_sessions
+            )
+            session_account_numbers = [
+                int(allocator.allocate()) for _ in range(3 * SESSION_BLOCK_SIZE)
+            ]
+
+            self.assertEqual(
+                session_account_numbers[SESSION_BLOCK_SIZE],
+                session_account_numbers[0] + num_sessions * SESSION_BLOCK_SIZE,
+            )
+            self.assertTrue(account_numbers.isdisjoint(session_account_numbers))
+            account_numbers.update(session_account_numbers)
+
+        self.assertEqual(
+            account_numbers,
+            set(
+                range(
+                    high_water_mark + 1,
+                    high_water_mark + 1 + 3 * num_sessions * SESSION_BLOCK_SIZE,
+                )
+            ),
+        )
+
+    def test_ana03_block_crossing_the_last_number(self):
+        """
+        ANA03_Block_Crossing_The_Last_Number
+
+        A block that crosses 99999 is cut short there, and the session is then used
+        up.
+        """
+        allocator = reserve_session_blocks(99950, 1, 3)
+
+        self.assertEqual(
+            self.allocate_all(allocator), list(range(99951, MAX_ACCOUNT_NUMBER + 1))
+        )
+
+    def test_ana04_used_up_sessions_return_none(self):
+        """
+        ANA04_Used_Up_Sessions_Return_None
+
+        Sessions return None once their blocks run past 99999, and a session whose
+        first block starts past it gets no number at all.
+        """
+        allocators = [
+            reserve_session_blocks(99500, session_number, 3)
+            for session_number in range(1, 4)
+        ]
+        account_numbers = [self.allocate_all(allocator) for allocator in allocators]
+
+        self.assertEqual(
+            account_numbers[0], list(range(99501, 99601)) + list(range(99801, 99901))
+        )
+        self.assertEqual(
+            account_numbers[1], list(range(99601, 99701)) + list(range(99901, 100000))
+        )
+        self.assertEqual(account_numbers[2], list(range(99701, 99801)))
+        self.assertIsNone(reserve_session_blocks(99950, 2, 3).allocate())
+
+    def test_ana05_single_block_without_session_count(self):
+        """
+        ANA05_Single_Block_Without_Session_Count
+
+        Without the number of sessions, a session only gets its first block.
+        """
+        allocator = reserve_session_blocks(54322, 2)
+
+        self.assertEqual(
+            self.allocate_all(allocator),
+            list(range(54423, 54423 + SESSION_BLOCK_SIZE)),
+        )
+
+    def test_ana06_bank_accounts_reserve_session_numbers(self):
+        """
+        ANA06_Bank_Accounts_Reserve_Session_Numbers
+
+        Bank accounts hand out the numbers of a session's blocks, above the highest
+        account number loaded.
+        """
+        accounts = BankAccounts()
+        accounts.load_accounts(CURRENT_BANK_ACCOUNTS_FILE)
+        self.assertEqual(accounts.high_water_mark, 54322)
+        accounts.reserve_session_numbers(2, 3)
+
+        account_numbers = [
+            accounts.generate_account_number() for _ in range(SESSION_BLOCK_SIZE + 1)
+        ]
+
+        self.assertEqual(account_numbers[0], "54423")
+        self.assertEqual(account_numbers[SESSION_BLOCK_SIZE - 1], "54522")
+        self.assertEqual(account_numbers[SESSION_BLOCK_SIZE], "54723")
+
+
+class TransactionFileWriterTest(unittest.TestCase):
+    """
+    Unit tests for the flush policies of TransactionFileWriter.
+    """
+
+    def setUp(self):
+        """
+        Creates a temporary directory for the 'bank account transactions' file.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.transactions_file = os.path.join(
+            self.directory.name, "bank_account_transactions.txt"
+        )
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def read_flushed_records(self):
+        """
+        Reads the records that have reached the 'bank account transactions' file.
+        :return: List of transaction records
+        """
+        if not os.path.exists(self.transactions_file):
+            return []
+        with open(self.transactions_file, "r") as file:
+            return file.read().splitlines()
+
+    def test_tfw01_flush_every_record(self):
+        """
+        TFW01_Flush_Every_Record
+
+        By default, each record reaches the file as soon as it is written.
+        """
+        writer = TransactionFileWriter(self.transactions_file)
+        writer.write_transaction_record(DEPOSIT_RECORD)
+
+        self.assertEqual(self.read_flushed_records(), [DEPOSIT_RECORD])
+        writer.close()
+
+    def test_tfw02_flush_every_few_records(self):
+        """
+        TFW02_Flush_Every_Few_Records
+
+        Records reach the file in groups of the given number of records.
+        """
+        writer = TransactionFileWriter(self.transactions_file, flush_every=2)
+        writer.write_transaction_record(DEPOSIT_RECORD)
+        self.assertEqual(self.read_flushed_records(), [])
+
+        writer.write_transaction_record(DEPOSIT_RECORD)
+        self.assertEqual(self.read_flushed_records(), [DEPOSIT_RECORD] * 2)
+        writer.close()
+
+    def test_tfw03_flush_at_close(self):
+        """
+        TFW03_Flush_At_Close
+
+        Without a flush policy, records only reach the file when the writer is closed.
+        """
+        writer = TransactionFileWriter(self.transactions_file, flush_every=None)
+        for _ in range(3):
+            writer.write_transaction_record(DEPOSIT_RECORD)
+        self.assertEqual(self.read_flushed_records(), [])
+
+        writer.close()
+        self.assertEqual(self.read_flushed_records(), [DEPOSIT_RECORD] * 3)
+
+    def test_tfw04_flush_interval_without_further_records(self):
+        """
+        TFW04_Flush_Interval_Without_Further_Records
+
+        A record reaches the file within the flush interval, even if no other record
+        is written after it.
+        """
+        writer = TransactionFileWriter(
+            self.transactions_file, flush_every=None, flush_interval=0.05
+        )
+        writer.write_transaction_record(DEPOSIT_RECORD)
+
+        deadline = time.monotonic() + 5
+        while not self.read_flushed_records() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.read_flushed_records(), [DEPOSIT_RECORD])
+        writer.close()
+
+    def test_tfw05_fsync_after_flush(self):
+        """
+        TFW05_Fsync_After_Flush
+
+        Fsyncing each flush still writes every record once.
+        """
+        writer = TransactionFileWriter(self.transactions_file, fsync=True)
+        writer.write_transaction_record(DEPOSIT_RECORD)
+        writer.write_transaction_record(DEPOSIT_RECORD)
+        writer.close()
+
+        self.assertEqual(self.read_flushed_records(), [DEPOSIT_RECORD] * 2)
+
+
+class BankingSystemFrontendTest(unittest.TestCase):
+    """
+    Unit tests for the session loop of BankingSystemFrontend.
+    """
+
+    def setUp(self):
+        """
+        Creates a temporary directory for the 'bank account transactions' file.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.transactions_file = os.path.join(
+            self.directory.name, "bank_account_transactions.txt"
+        )
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def run_session(self, frontend, session_input):
+        """
+        Runs a frontend session with scripted input.
+        :param frontend: BankingSystemFrontend object
+        :param session_input: Scripted user input
+        """
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(session_input)
+        try:
+            with redirect_stdout(io.StringIO()):
+                frontend.run()
+        finally:
+            sys.stdin = stdin
+
+    def test_bsf01_records_kept_when_input_ends_before_logout(self):
+        """
+        BSF01_Records_Kept_When_Input_Ends_Before_Logout
+
+        The records made before the input ends reach the file, and the file is closed.
+        """
+        frontend = BankingSystemFrontend(
+            CURRENT_BANK_ACCOUNTS_FILE, self.transactions_file, flush_every=None
+        )
+        with self.assertRaises(EOFError):
+            self.run_session(frontend, "SU\nJohn Doe\nDP\n12345\n100\n")
+
+        self.assertIsNone(frontend.writer.file)
+        with open(self.transactions_file, "r") as file:
+            self.assertEqual(file.read().splitlines(), [DEPOSIT_RECORD])
+
+    def test_bsf02_logout_closes_the_file(self):
+        """
+        BSF02_Logout_Closes_The_File
+
+        Logging out writes the end-of-session record and closes the file.
+        """
+        frontend = BankingSystemFrontend(
+            CURRENT_BANK_ACCOUNTS_FILE, self.transactions_file, flush_every=None
+        )
+        self.run_session(frontend, "SU\nJohn Doe\nDP\n12345\n100\nLO\n")
+
+        self.assertIsNone(frontend.writer.file)
+        with open(self.transactions_file, "r") as file:
+            self.assertEqual(
+                file.read().splitlines(),
+                [DEPOSIT_RECORD, "00                      00000 00000.00 00"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
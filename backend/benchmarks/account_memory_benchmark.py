@@ -0,0 +1,88 @@
+"""
+Account Memory Benchmark
+
+Compares the memory footprint of storing accounts as dicts with string keys
+against storing them as slotted Account objects.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file: python account_memory_benchmark.py [num_accounts]
+"""
+
+import os
+import sys
+import tracemalloc
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from account import Account
+
+
+def build_dict_accounts(num_accounts):
+    """
+    Builds accounts as dicts, the layout used before the Account type.
+    :param num_accounts: Number of accounts
+    :return: Accounts keyed by account number
+    """
+    accounts = {}
+    for index in range(num_accounts):
+        accounts[f"{index:05d}"] = {
+            "holder_name": f"Holder {index}",
+            "status": "A",
+            "balance": float(index),
+            "num_transactions": index % 10000,
+            "plan": "SP",
+        }
+    return accounts
+
+
+def build_slotted_accounts(num_accounts):
+    """
+    Builds accounts as slotted Account objects.
+    :param num_accounts: Number of accounts
+    :return: Accounts keyed by account number
+    """
+    accounts = {}
+    for index in range(num_accounts):
+        accounts[f"{index:05d}"] = Account(
+            f"Holder {index}", "A", float(index), index % 10000, "SP"
+        )
+    return accounts
+
+
+def measure(build_accounts, num_accounts):
+    """
+    Measures the memory allocated while building accounts.
+    :param build_accounts: Function that builds the accounts
+    :param num_accounts: Number of accounts
+    :return: Allocated bytes
+    """
+    tracemalloc.start()
+    accounts = build_accounts(num_accounts)
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del accounts
+    return allocated_bytes
+
+
+if __name__ == "__main__":
+    num_accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    dict_bytes = measure(build_dict_accounts, num_accounts)
+    slotted_bytes = measure(build_slotted_accounts, num_accounts)
+
+    print(f"Accounts: {num_accounts}")
+    print(
+        f"dict-of-dicts: {dict_bytes / 1024 / 1024:.1f} MiB "
+        f"({dict_bytes / num_accounts:.0f} bytes/account)"
+    )
+    print(
+        f"Account slots: {slotted_bytes / 1024 / 1024:.1f} MiB "
+        f"({slotted_bytes / num_accounts:.0f} bytes/account)"
+    )
+    print(f"Reduction: {(1 - slotted_bytes / dict_bytes) * 100:.1f}%")
@@ -0,0 +1,178 @@
+"""
+Backend Scale Benchmark
+
+Generates a seeded workload with workload_generator.py and times the three phases of
+a backend run separately: loading the master file, processing the transactions and
+writing the new account files. The timings are emitted as JSON, so runs at different
+scales, or before and after a change, can be compared by scripts.
+
+Rejections go to a rejects file in the work directory, so that printing them does not
+dominate the timings.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file:
+   python backend_scale_benchmark.py [--scale 10k|1m|10m] [--accounts N]
+   [--transactions N] [--seed N] [--mix CODE=WEIGHT,...] [--transfer-ratio RATIO]
+   [--session-length N] [--repeat N] [--vectorized] [--binary-master]
+   [--work-dir DIR] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from banking_system_backend import BankingSystemBackend
+from binary_master_file import convert_text_to_binary
+from workload_generator import (
+    WorkloadGenerator,
+    add_workload_arguments,
+    get_workload_size,
+)
+
+PHASES = ["load_accounts", "process_transactions", "write_new_account_files"]
+
+
+def measure(work_dir, vectorized=False, binary_master=False):
+    """
+    Runs the backend once over the workload in a work directory.
+    :param work_dir: Work directory holding the generated files
+    :param vectorized: Whether to apply monetary transactions in NumPy batches
+    :param binary_master: Whether the master bank accounts files are binary
+    :return: Dictionary of phase names to elapsed seconds
+    """
+    master_file = "master.bin" if binary_master else "master.txt"
+    backend = BankingSystemBackend(
+        os.path.join(work_dir, master_file),
+        os.path.join(work_dir, "transactions.txt"),
+        os.path.join(work_dir, f"new_{master_file}"),
+        os.path.join(work_dir, "current.txt"),
+        vectorized=vectorized,
+        rejects_file=os.path.join(work_dir, "rejects.jsonl"),
+        binary_master=binary_master,
+    )
+    backend.open_rejection_log()
+
+    timings = {}
+    for phase in PHASES:
+        start = time.perf_counter()
+        if phase == "process_transactions":
+            try:
+                backend.process_transactions()
+            finally:
+                backend.accounts.rejections.close()
+        else:
+            getattr(backend, phase)()
+        timings[phase] = time.perf_counter() - start
+    timings["num_rejected"] = sum(backend.accounts.rejections.counts.values())
+    return timings
+
+
+def run_benchmark(arguments, work_dir):
+    """
+    Generates the workload and times the backend over it.
+    :param arguments: Parsed arguments
+    :param work_dir: Work directory for the generated and output files
+    :return: Benchmark results
+    """
+    num_accounts, num_transactions = get_workload_size(arguments)
+    generator = WorkloadGenerator(
+        num_accounts,
+        arguments.seed,
+        arguments.mix,
+        arguments.transfer_ratio,
+        arguments.session_length,
+    )
+    start = time.perf_counter()
+    generator.write_files(
+        os.path.join(work_dir, "master.txt"),
+        os.path.join(work_dir, "transactions.txt"),
+        num_transactions,
+    )
+    generate_seconds = time.perf_counter() - start
+    if arguments.binary_master:
+        convert_text_to_binary(
+            os.path.join(work_dir, "master.txt"), os.path.join(work_dir, "master.bin")
+        )
+
+    runs = [
+        measure(work_dir, arguments.vectorized, arguments.binary_master)
+        for _ in range(arguments.repeat)
+    ]
+    # The fastest run of each phase is the one least disturbed by machine noise.
+    best = {phase: min(run[phase] for run in runs) for phase in PHASES}
+    return {
+        "scale": arguments.scale,
+        "num_accounts": num_accounts,
+        "num_transactions": num_transactions,
+        "seed": arguments.seed,
+        "mix": generator.code_weights,
+        "transfer_ratio": arguments.transfer_ratio,
+        "session_length": arguments.session_length,
+        "vectorized": arguments.vectorized,
+        "binary_master": arguments.binary_master,
+        "python": platform.python_version(),
+        "generate_seconds": generate_seconds,
+        "num_rejected": runs[0]["num_rejected"],
+        "seconds": best,
+        "total_seconds": sum(best.values()),
+        "transactions_per_second": (
+            num_transactions / best["process_transactions"]
+            if best["process_transactions"]
+            else None
+        ),
+        "runs": [{phase: run[phase] for phase in PHASES} for run in runs],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Times the backend phases over a generated workload."
+    )
+    add_workload_arguments(parser)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of timed runs (default: 3)"
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="apply deposits, withdrawals and bill payments in NumPy batches",
+    )
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    parser.add_argument(
+        "--work-dir",
+        help="directory to keep the generated and output files in "
+        "(default: a temporary directory)",
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+    arguments = parser.parse_args()
+    if arguments.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    if arguments.work_dir is not None:
+        os.makedirs(arguments.work_dir, exist_ok=True)
+        results = run_benchmark(arguments, arguments.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            results = run_benchmark(arguments, work_dir)
+
+    text = json.dumps(results, indent=2)
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            file.write(text + "\n")
+    print(text)
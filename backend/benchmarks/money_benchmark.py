@@ -0,0 +1,114 @@
+"""
+Money Benchmark
+
+Compares the float/Decimal money handling used before the integer-cents
+engine against the integer-cents helpers for the whole backend pipeline:
+parse an amount, apply it, apply a fee, compare and format the balance.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file: python money_benchmark.py [num_records]
+"""
+
+from decimal import Decimal, InvalidOperation
+import os
+import sys
+import timeit
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from money import format_cents, parse_cents, STUDENT_PLAN_FEE
+
+
+def parse_float_amount(amount):
+    """
+    Parses an amount field into a float, as the old TransactionRecordParser did.
+    :param amount: Amount field
+    :return: Amount
+    """
+    amount = amount.strip()
+    return float(amount) if amount else 0.0
+
+
+def float_pipeline(amounts):
+    """
+    Runs the pipeline with float balances and Decimal formatting.
+    :param amounts: Amount fields from transaction records
+    :return: Formatted final balance
+    """
+    balance = float("00100.00")
+    for amount in amounts:
+        value = parse_float_amount(amount)
+        if balance >= value:
+            balance -= value
+        balance += value
+        if balance - 0.05 >= 0:
+            balance -= 0.05
+
+    try:
+        formatted = Decimal(balance)
+    except (InvalidOperation, TypeError):
+        formatted = Decimal("0.00")
+    return f"{formatted:08.2f}"
+
+
+def cents_pipeline(amounts):
+    """
+    Runs the pipeline with integer-cents balances.
+    :param amounts: Amount fields from transaction records
+    :return: Formatted final balance
+    """
+    balance = parse_cents("00100.00")
+    for amount in amounts:
+        value = parse_cents(amount)
+        if balance >= value:
+            balance -= value
+        balance += value
+        if balance - STUDENT_PLAN_FEE >= 0:
+            balance -= STUDENT_PLAN_FEE
+
+    return format_cents(balance)
+
+
+def format_float_balances(balances):
+    """
+    Formats float balances through Decimal, as the old AccountRecordBuilder did.
+    :param balances: Balances
+    """
+    for balance in balances:
+        f"{Decimal(balance):08.2f}"
+
+
+def format_cents_balances(balances):
+    """
+    Formats integer-cents balances.
+    :param balances: Balances
+    """
+    for balance in balances:
+        format_cents(balance)
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    amounts = [f"{(index * 37) % 100000 / 100:08.2f}" for index in range(num_records)]
+    float_balances = [index / 100 for index in range(num_records)]
+    cents_balances = list(range(num_records))
+
+    print(f"Records: {num_records}")
+    print(f"float/Decimal final balance: {float_pipeline(amounts)}")
+    print(f"integer cents final balance: {cents_pipeline(amounts)}")
+
+    results = [
+        ("parse/fee/compare (float)", lambda: float_pipeline(amounts)),
+        ("parse/fee/compare (cents)", lambda: cents_pipeline(amounts)),
+        ("format (Decimal)", lambda: format_float_balances(float_balances)),
+        ("format (cents)", lambda: format_cents_balances(cents_balances)),
+    ]
+    for name, function in results:
+        seconds = min(timeit.repeat(function, number=1, repeat=3))
+        print(f"{name}: {seconds:.3f}s ({seconds / num_records * 1e9:.0f} ns/record)")
@@ -0,0 +1,133 @@
+"""
+Pipelined Reader Benchmark
+
+Measures the time to process a merged bank account transactions file read from
+simulated slow storage, with the serial loop that reads and applies records one after
+another and with the pipelined loop that reads and decodes them on a background
+thread. Slow storage is simulated by sleeping before every block read, the way a read
+from network-mounted storage waits for the network.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file: python pipelined_reader_benchmark.py [num_records] [block_latency_ms]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from banking_system_backend import BankingSystemBackend
+from transaction_file_reader import TransactionFileReader
+from transaction_processor import TransactionProcessor
+from workload_generator import WorkloadGenerator
+
+# Number of bytes per simulated storage read
+BLOCK_BYTES = 64 * 1024
+
+
+class SlowTransactionFileReader(TransactionFileReader):
+    """
+    Reads the transactions file in blocks, waiting before each block as slow storage
+    would.
+    """
+
+    def __init__(self, merged_bank_account_transactions_file, block_latency):
+        """
+        Constructs a SlowTransactionFileReader object.
+        :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
+        :param block_latency: Number of seconds to wait before each block
+        """
+        super().__init__(merged_bank_account_transactions_file)
+        self.block_latency = block_latency
+
+    def iter_numbered_transaction_records(self):
+        """
+        Lazily yields transaction records with their line numbers, skipping blank lines.
+        :return: Generator of (line number, transaction record)
+        """
+        with open(self.merged_bank_account_transactions_file, "rb") as file:
+            pending = b""
+            line_number = 0
+            while True:
+                time.sleep(self.block_latency)
+                data = file.read(BLOCK_BYTES)
+                if not data:
+                    break
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    line_number += 1
+                    line = line.decode().rstrip("\r")
+                    if line:
+                        yield line_number, line
+
+
+def measure(backend, process, transactions_file, block_latency):
+    """
+    Processes the transactions file once over freshly loaded accounts.
+    :param backend: BankingSystemBackend object
+    :param process: Unbound processing method of BankingSystemBackend
+    :param transactions_file: Transactions file path
+    :param block_latency: Number of seconds to wait before each block
+    :return: Elapsed seconds
+    """
+    backend.accounts = type(backend.accounts)()
+    backend.load_accounts()
+    reader = SlowTransactionFileReader(transactions_file, block_latency)
+    processor = TransactionProcessor(backend.accounts)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        process(backend, reader, processor)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    block_latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        master_file = os.path.join(work_dir, "master.txt")
+        transactions_file = os.path.join(work_dir, "transactions.txt")
+        WorkloadGenerator(10000).write_files(
+            master_file, transactions_file, num_records
+        )
+        num_blocks = -(-os.path.getsize(transactions_file) // BLOCK_BYTES)
+        backend = BankingSystemBackend(
+            master_file,
+            transactions_file,
+            os.path.join(work_dir, "new_master.txt"),
+            os.path.join(work_dir, "current.txt"),
+        )
+
+        print(f"Records: {num_records}")
+        print(
+            f"Simulated read latency: {block_latency * 1000:g}ms per "
+            f"{BLOCK_BYTES // 1024}KB block, {num_blocks * block_latency:.3f}s in total"
+        )
+        loops = [
+            ("serial", BankingSystemBackend.process_serial_transactions),
+            ("pipelined", BankingSystemBackend.process_pipelined_transactions),
+        ]
+        # Runs are interleaved so that machine noise affects both loops alike.
+        timings = {name: [] for name, _ in loops}
+        for _ in range(5):
+            for name, process in loops:
+                timings[name].append(
+                    measure(backend, process, transactions_file, block_latency)
+                )
+
+        for name, seconds in timings.items():
+            seconds = min(seconds)
+            print(
+                f"{name}: {seconds:.3f}s ({seconds / num_records * 1e9:.0f} ns/record)"
+            )
@@ -0,0 +1,176 @@
+"""
+Transaction Processor Benchmark
+
+Measures the per-record overhead of TransactionProcessor with its single-pass
+record decoder and table-driven dispatch, against the previous if/elif chain
+that re-sliced the record in every parser call.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file: python transaction_processor_benchmark.py [num_records]
+"""
+
+import os
+import sys
+import time
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from account import Account
+from bank_accounts import BankAccounts
+from transaction_processor import TransactionProcessor
+
+
+class ChainedTransactionProcessor(TransactionProcessor):
+    """
+    Reproduces the previous if/elif dispatch, where each handler took the raw
+    transaction record and called the individual TransactionRecordParser methods.
+    """
+
+    def process_transaction(self, transaction_record):
+        """
+        Processes a transaction.
+        :param transaction_record: Transaction record
+        """
+        transaction_code = self.parser.parse_transaction_code(transaction_record)
+
+        if transaction_code == "04":
+            self.handle_chained_deposit(transaction_record)
+        elif transaction_code == "01":
+            self.handle_chained_withdrawal(transaction_record)
+        elif transaction_code == "02":
+            self.handle_chained_transfer(transaction_record)
+        elif transaction_code == "03":
+            self.handle_chained_pay_bill(transaction_record)
+        elif transaction_code == "08":
+            self.handle_chained_change_account_plan(transaction_record)
+
+    def handle_chained_deposit(self, transaction_record):
+        """
+        Handles a 'deposit' transaction.
+        :param transaction_record: Transaction record
+        """
+        account_number = self.parser.parse_account_number(transaction_record)
+        amount = self.parser.parse_amount(transaction_record)
+        self.executor.execute_deposit(account_number, amount)
+        self.accounts.apply_transaction_fee(account_number)
+
+    def handle_chained_withdrawal(self, transaction_record):
+        """
+        Handles a 'withdrawal' transaction.
+        :param transaction_record: Transaction record
+        """
+        account_number = self.parser.parse_account_number(transaction_record)
+        amount = self.parser.parse_amount(transaction_record)
+        self.executor.execute_withdrawal(account_number, amount)
+        self.accounts.apply_transaction_fee(account_number)
+
+    def handle_chained_transfer(self, transaction_record):
+        """
+        Handles a 'transfer' transaction.
+        :param transaction_record: Transaction record
+        """
+        from_account_number = self.parser.parse_account_number(transaction_record)
+        partial_to_account_number = self.parser.parse_misc_data(transaction_record)
+        amount = self.parser.parse_amount(transaction_record)
+        self.executor.execute_transfer(
+            from_account_number, partial_to_account_number, amount
+        )
+        self.accounts.apply_transaction_fee(from_account_number)
+
+    def handle_chained_pay_bill(self, transaction_record):
+        """
+        Handles a 'pay bill' transaction.
+        :param transaction_record: Transaction record
+        """
+        account_number = self.parser.parse_account_number(transaction_record)
+        amount = self.parser.parse_amount(transaction_record)
+        self.executor.execute_pay_bill(account_number, amount)
+        self.accounts.apply_transaction_fee(account_number)
+
+    def handle_chained_change_account_plan(self, transaction_record):
+        """
+        Handles a 'change account plan' transaction.
+        :param transaction_record: Transaction record
+        """
+        account_number = self.parser.parse_account_number(transaction_record)
+        account_plan = self.parser.parse_misc_data(transaction_record)
+        self.executor.execute_change_account_plan(account_number, account_plan)
+        self.accounts.apply_transaction_fee(account_number)
+
+
+def build_accounts(num_accounts):
+    """
+    Builds accounts whose balances cover every benchmark transaction.
+    :param num_accounts: Number of accounts
+    :return: BankAccounts object
+    """
+    accounts = BankAccounts()
+    for index in range(num_accounts):
+        accounts.add_account(
+            f"{10000 + index:05d}", Account(f"Holder {index // 2}", "A", 10**9, 0)
+        )
+    return accounts
+
+
+def build_transaction_records(num_records, num_accounts):
+    """
+    Builds a mix of deposits, withdrawals, transfers, bill payments and plan changes.
+    :param num_records: Number of transaction records
+    :param num_accounts: Number of accounts
+    :return: List of transaction records
+    """
+    codes = ["04", "04", "01", "03", "02", "08"]
+    transaction_records = []
+    for index in range(num_records):
+        code = codes[index % len(codes)]
+        account_index = index % num_accounts
+        holder_name = f"Holder {account_index // 2}"
+        misc_data = "SP" if code == "08" else "10"
+        transaction_records.append(
+            f"{code} {holder_name:<20} {10000 + account_index:05d} 00001.00 {misc_data}"
+        )
+    return transaction_records
+
+
+def measure(processor_class, transaction_records, num_accounts):
+    """
+    Measures the time to process all transaction records.
+    :param processor_class: Processor class
+    :param transaction_records: Transaction records
+    :param num_accounts: Number of accounts
+    :return: Elapsed seconds
+    """
+    processor = processor_class(build_accounts(num_accounts))
+    start = time.perf_counter()
+    for transaction_record in transaction_records:
+        processor.process_transaction(transaction_record)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    num_accounts = 1000
+    transaction_records = build_transaction_records(num_records, num_accounts)
+
+    print(f"Records: {num_records}")
+    processors = [
+        ("if/elif chain, per-field parsing", ChainedTransactionProcessor),
+        ("dispatch table, single-pass decode", TransactionProcessor),
+    ]
+    # Runs are interleaved so that machine noise affects both processors alike.
+    timings = {name: [] for name, _ in processors}
+    for _ in range(7):
+        for name, processor_class in processors:
+            timings[name].append(
+                measure(processor_class, transaction_records, num_accounts)
+            )
+
+    for name, seconds in timings.items():
+        seconds = min(seconds)
+        print(f"{name}: {seconds:.3f}s ({seconds / num_records * 1e9:.0f} ns/record)")
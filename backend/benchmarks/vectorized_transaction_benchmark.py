@@ -0,0 +1,109 @@
+"""
+Vectorized Transaction Benchmark
+
+Measures the per-record cost of deposits, withdrawals and bill payments applied by
+the serial TransactionProcessor and by the NumPy-vectorized engine. Requires NumPy.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file: python vectorized_transaction_benchmark.py [num_records]
+"""
+
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from account import Account
+from bank_accounts import BankAccounts
+from transaction_processor import TransactionProcessor
+from vectorized_transaction_processor import VectorizedTransactionProcessor
+
+
+def build_accounts(num_accounts):
+    """
+    Builds accounts with enough funds for most, but not all, withdrawals.
+    :param num_accounts: Number of accounts
+    :return: BankAccounts object
+    """
+    accounts = BankAccounts()
+    for index in range(num_accounts):
+        accounts.add_account(
+            f"{10000 + index:05d}", Account(f"Holder {index}", "A", 500000, 0)
+        )
+    return accounts
+
+
+def build_transaction_records(num_records, num_accounts):
+    """
+    Builds a day of mostly monetary transactions, with an occasional plan change
+    that ends the current batch.
+    :param num_records: Number of transaction records
+    :param num_accounts: Number of accounts
+    :return: List of transaction records
+    """
+    generator = random.Random(0)
+    transaction_records = []
+    for _ in range(num_records):
+        code = generator.choice(["01", "03", "04", "04"])
+        misc_data = "00"
+        if generator.random() < 0.001:
+            code, misc_data = "08", generator.choice(["SP", "NP"])
+
+        account_index = generator.randrange(num_accounts)
+        amount = generator.randint(0, 50000 if code == "04" else 20000)
+        transaction_records.append(
+            f"{code} {f'Holder {account_index}':<20} {10000 + account_index:05d} "
+            f"{amount // 100:05d}.{amount % 100:02d} {misc_data}"
+        )
+    return transaction_records
+
+
+def measure(processor_class, transaction_records, num_accounts):
+    """
+    Measures the time to process all transaction records.
+    :param processor_class: Processor class
+    :param transaction_records: Transaction records
+    :param num_accounts: Number of accounts
+    :return: Elapsed seconds
+    """
+    processor = processor_class(build_accounts(num_accounts))
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for transaction_record in transaction_records:
+            processor.process_transaction(transaction_record)
+        if hasattr(processor, "finish"):
+            processor.finish()
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    num_accounts = 1000
+    transaction_records = build_transaction_records(num_records, num_accounts)
+
+    print(f"Records: {num_records}")
+    processors = [
+        ("serial", TransactionProcessor),
+        ("vectorized", VectorizedTransactionProcessor),
+    ]
+    # Runs are interleaved so that machine noise affects both processors alike.
+    timings = {name: [] for name, _ in processors}
+    for _ in range(5):
+        for name, processor_class in processors:
+            timings[name].append(
+                measure(processor_class, transaction_records, num_accounts)
+            )
+
+    for name, seconds in timings.items():
+        seconds = min(seconds)
+        print(f"{name}: {seconds:.3f}s ({seconds / num_records * 1e9:.0f} ns/record)")
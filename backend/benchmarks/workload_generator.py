@@ -0,0 +1,434 @@
+"""
+Workload Generator
+
+Generates a synthetic 'master bank accounts' file and a 'merged bank account
+transactions' file in the exact fixed-width formats read by the backend. The same
+seed and options always generate the same files, so the files can be regenerated at
+any scale instead of being stored.
+
+The generator keeps track of the accounts that exist as it goes, so transactions only
+name existing accounts, new accounts get unused account numbers, and a transfer names
+another account of the same holder. Disabled accounts keep being used, so a realistic
+share of transactions is rejected.
+
+Account numbers have 5 digits, so a master file holds at most 99,999 accounts. The
+larger scales grow the number of transactions rather than the number of accounts.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/benchmarks': cd backend/benchmarks
+3. Run this file:
+   python workload_generator.py <master_bank_accounts_file>
+   <merged_bank_account_transactions_file> [--scale 10k|1m|10m] [--accounts N]
+   [--transactions N] [--seed N] [--mix CODE=WEIGHT,...] [--transfer-ratio RATIO]
+   [--session-length N]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+# Directory configuration
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if BACKEND_SRC not in sys.path:
+    sys.path.insert(0, BACKEND_SRC)
+
+from account import Account
+from account_record_builder import AccountRecordBuilder
+from binary_master_file import END_OF_FILE_RECORD
+
+# Scale presets: (number of accounts, number of transactions)
+SCALES = {
+    "10k": (1000, 10000),
+    "1m": (10000, 1000000),
+    "10m": (90000, 10000000),
+}
+MAX_ACCOUNTS = 99999
+
+# Relative weights of the transaction codes. Disabling is rare, since disabled
+# accounts stay in use and would otherwise take over the larger scales.
+DEFAULT_CODE_WEIGHTS = {
+    "01": 25,
+    "02": 15,
+    "03": 15,
+    "04": 40,
+    "05": 1,
+    "06": 0.9,
+    "07": 0.1,
+    "08": 3,
+}
+DEFAULT_SESSION_LENGTH = 1000
+# Number of records generated and written at a time
+GENERATE_RECORDS = 8192
+
+END_OF_SESSION_RECORD = "00                      00000 00000.00 00"
+
+FIRST_NAMES = ["Ava", "Ben", "Chloe", "Dan", "Ella", "Finn", "Grace", "Hugo"]
+LAST_NAMES = ["Brown", "Clark", "Doe", "Evans", "Green", "Hill", "Jones", "King"]
+
+
+class WorkloadGenerator:
+    """
+    Generates seeded master and merged transaction files.
+    """
+
+    def __init__(
+        self,
+        num_accounts,
+        seed=0,
+        code_weights=None,
+        transfer_ratio=None,
+        session_length=DEFAULT_SESSION_LENGTH,
+    ):
+        """
+        Constructs a WorkloadGenerator object.
+        :param num_accounts: Number of accounts in the master file
+        :param seed: Random seed
+        :param code_weights: Dictionary of transaction codes to relative weights, or
+                             None for the default mix
+        :param transfer_ratio: Fraction of transactions that are transfers, which
+                               overrides the weight of code '02', or None
+        :param session_length: Number of transaction records per session
+        """
+        if not 0 < num_accounts <= MAX_ACCOUNTS:
+            raise ValueError(f"The number of accounts must be 1 to {MAX_ACCOUNTS}.")
+        if session_length < 1:
+            raise ValueError("The session length must be at least 1.")
+
+        self.num_accounts = num_accounts
+        self.random = random.Random(seed)
+        self.code_weights = build_code_weights(
+            code_weights or DEFAULT_CODE_WEIGHTS, transfer_ratio
+        )
+        self.session_length = session_length
+
+        # About three accounts per holder, so that most transfers find a destination.
+        num_holders = max(1, num_accounts // 3)
+        self.holder_names = [
+            f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)} "
+            f"{index:05d}"
+            for index in range(num_holders)
+        ]
+
+        account_numbers = self.random.sample(range(1, MAX_ACCOUNTS + 1), num_accounts)
+        self.master_accounts = {
+            f"{account_number:05d}": Account(
+                self.random.choice(self.holder_names),
+                "A",
+                self.random.randint(10000, 500000),
+                0,
+            )
+            for account_number in sorted(account_numbers)
+        }
+        free_account_numbers = sorted(
+            set(range(1, MAX_ACCOUNTS + 1)) - set(account_numbers)
+        )
+        self.random.shuffle(free_account_numbers)
+        self.free_account_numbers = [
+            f"{account_number:05d}" for account_number in free_account_numbers
+        ]
+
+        # Accounts that exist, as a list for random choice with positions for removal
+        self.live_account_numbers = list(self.master_accounts)
+        self.live_positions = {
+            account_number: position
+            for position, account_number in enumerate(self.live_account_numbers)
+        }
+        self.holder_of = {
+            account_number: account.holder_name
+            for account_number, account in self.master_accounts.items()
+        }
+        self.disabled_account_numbers = set()
+        self.accounts_of = {}
+        for account_number, holder_name in self.holder_of.items():
+            self.accounts_of.setdefault(holder_name, []).append(account_number)
+
+    def iter_master_records(self):
+        """
+        Generates the records of the 'master bank accounts' file.
+        :return: Iterator of master records, ending with the END_OF_FILE record
+        """
+        builder = AccountRecordBuilder()
+        for account_number, account in self.master_accounts.items():
+            yield builder.build_account_record(
+                "new_master_bank_accounts_file", account_number, account
+            )
+        yield END_OF_FILE_RECORD
+
+    def iter_transaction_records(self, num_transactions):
+        """
+        Generates the records of the 'merged bank account transactions' file.
+        Every session ends with an end-of-session record.
+        :param num_transactions: Number of transactions, not counting the
+                                 end-of-session records
+        :return: Iterator of transaction records
+        """
+        num_in_session = 0
+        for start in range(0, num_transactions, GENERATE_RECORDS):
+            codes = self.random.choices(
+                list(self.code_weights),
+                weights=list(self.code_weights.values()),
+                k=min(GENERATE_RECORDS, num_transactions - start),
+            )
+            for code in codes:
+                yield self.generate_transaction_record(code)
+                num_in_session += 1
+                if num_in_session == self.session_length:
+                    yield END_OF_SESSION_RECORD
+                    num_in_session = 0
+
+        if num_in_session:
+            yield END_OF_SESSION_RECORD
+
+    def generate_transaction_record(self, code):
+        """
+        Generates a transaction record and updates the tracked accounts.
+        :param code: Transaction code
+        :return: Transaction record
+        """
+        if code == "05" or not self.live_account_numbers:
+            if self.free_account_numbers:
+                return self.generate_create_account()
+            code = "04"
+
+        account_number = self.random.choice(self.live_account_numbers)
+        holder_name = self.holder_of[account_number]
+        amount = 0
+        misc_data = "00"
+
+        if code == "01":
+            amount = self.random.randint(100, 30000)
+        elif code == "02":
+            amount = self.random.randint(100, 20000)
+            misc_data = self.choose_transfer_prefix(holder_name, account_number)
+        elif code == "03":
+            amount = self.random.randint(100, 25000)
+            misc_data = self.random.choice(["EC", "CQ", "FI"])
+        elif code == "04":
+            amount = self.random.randint(100, 50000)
+        elif code == "06":
+            # A disabled account cannot be deleted, so it stays in use.
+            if account_number not in self.disabled_account_numbers:
+                self.remove_account(account_number)
+        elif code == "07":
+            self.disabled_account_numbers.add(account_number)
+            misc_data = "D"
+        elif code == "08":
+            misc_data = self.random.choice(["SP", "NP"])
+
+        return format_transaction_record(
+            code, holder_name, account_number, amount, misc_data
+        )
+
+    def generate_create_account(self):
+        """
+        Generates a 'create account' record for an unused account number.
+        :return: Transaction record
+        """
+        account_number = self.free_account_numbers.pop()
+        holder_name = self.random.choice(self.holder_names)
+        self.live_positions[account_number] = len(self.live_account_numbers)
+        self.live_account_numbers.append(account_number)
+        self.holder_of[account_number] = holder_name
+        self.accounts_of.setdefault(holder_name, []).append(account_number)
+        return format_transaction_record(
+            "05", holder_name, account_number, self.random.randint(0, 100000), "00"
+        )
+
+    def choose_transfer_prefix(self, holder_name, from_account_number):
+        """
+        Chooses the partial destination account number of a transfer.
+        :param holder_name: Account holder name
+        :param from_account_number: Account number of source account
+        :return: 2-digit prefix of another account of the holder, or of the source
+                 account if the holder has no other account
+        """
+        account_numbers = self.accounts_of[holder_name]
+        to_account_number = self.random.choice(account_numbers)
+        if to_account_number == from_account_number and len(account_numbers) > 1:
+            to_account_number = self.random.choice(account_numbers)
+        return to_account_number[:2]
+
+    def remove_account(self, account_number):
+        """
+        Stops using a deleted account and frees its account number.
+        :param account_number: Account number
+        """
+        position = self.live_positions.pop(account_number)
+        last_account_number = self.live_account_numbers.pop()
+        if last_account_number != account_number:
+            self.live_account_numbers[position] = last_account_number
+            self.live_positions[last_account_number] = position
+        self.accounts_of[self.holder_of.pop(account_number)].remove(account_number)
+        self.free_account_numbers.append(account_number)
+
+    def write_files(
+        self,
+        master_bank_accounts_file,
+        merged_bank_account_transactions_file,
+        num_transactions,
+    ):
+        """
+        Writes the master file and the merged transactions file.
+        :param master_bank_accounts_file: 'Master bank accounts' file path
+        :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
+        :param num_transactions: Number of transactions
+        """
+        with open(master_bank_accounts_file, "w") as file:
+            write_lines(file, self.iter_master_records())
+        with open(merged_bank_account_transactions_file, "w") as file:
+            write_lines(file, self.iter_transaction_records(num_transactions))
+
+
+def build_code_weights(code_weights, transfer_ratio=None):
+    """
+    Resolves the relative weights of the transaction codes.
+    :param code_weights: Dictionary of transaction codes to relative weights
+    :param transfer_ratio: Fraction of transactions that are transfers, or None
+    :return: Dictionary of the transaction codes with a positive weight to their
+             weights, in code order
+    """
+    code_weights = dict(code_weights)
+    for code, weight in code_weights.items():
+        if code not in DEFAULT_CODE_WEIGHTS or weight < 0:
+            raise ValueError(f"Invalid weight {weight} for transaction code {code}.")
+
+    if transfer_ratio is not None:
+        if not 0 <= transfer_ratio <= 1:
+            raise ValueError("The transfer ratio must be between 0 and 1.")
+        code_weights.pop("02", None)
+        other_weight = sum(code_weights.values())
+        if other_weight == 0 or transfer_ratio == 1:
+            code_weights = {"02": 1}
+        else:
+            code_weights["02"] = other_weight * transfer_ratio / (1 - transfer_ratio)
+
+    code_weights = {
+        code: code_weights[code] for code in sorted(code_weights) if code_weights[code]
+    }
+    if not code_weights:
+        raise ValueError("At least one transaction code needs a positive weight.")
+    return code_weights
+
+
+def parse_code_weights(text):
+    """
+    Parses a transaction code mix.
+    :param text: Comma-separated CODE=WEIGHT pairs, such as '01=30,04=60,08=10'
+    :return: Dictionary of transaction codes to relative weights
+    """
+    code_weights = {}
+    for pair in text.split(","):
+        code, separator, weight = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid code weight {pair!r}; expected CODE=WEIGHT.")
+        code_weights[code.strip()] = float(weight)
+    return code_weights
+
+
+def format_transaction_record(code, holder_name, account_number, amount, misc_data):
+    """
+    Formats a transaction record in the fixed-width layout written by the frontend.
+    :param code: Transaction code
+    :param holder_name: Account holder name
+    :param account_number: Account number
+    :param amount: Amount in cents
+    :param misc_data: Miscellaneous data
+    :return: Transaction record
+    """
+    return (
+        f"{code} {holder_name:<20} {account_number} "
+        f"{amount // 100:05d}.{amount % 100:02d} {misc_data:<2}"
+    )
+
+
+def write_lines(file, lines):
+    """
+    Writes lines to a file in blocks.
+    :param file: Open file
+    :param lines: Iterator of lines without their line terminators
+    """
+    block = []
+    for line in lines:
+        block.append(line)
+        if len(block) == GENERATE_RECORDS:
+            file.write("\n".join(block) + "\n")
+            block = []
+    if block:
+        file.write("\n".join(block) + "\n")
+
+
+def add_workload_arguments(parser):
+    """
+    Adds the workload options to an argument parser.
+    :param parser: ArgumentParser object
+    """
+    parser.add_argument(
+        "--scale",
+        choices=sorted(SCALES),
+        default="10k",
+        help="preset number of accounts and transactions (default: 10k)",
+    )
+    parser.add_argument("--accounts", type=int, help="number of accounts")
+    parser.add_argument("--transactions", type=int, help="number of transactions")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--mix",
+        type=parse_code_weights,
+        help="transaction code weights, such as 01=30,02=10,04=60",
+    )
+    parser.add_argument(
+        "--transfer-ratio",
+        type=float,
+        help="fraction of transactions that are transfers",
+    )
+    parser.add_argument(
+        "--session-length",
+        type=int,
+        default=DEFAULT_SESSION_LENGTH,
+        help="number of transaction records per session",
+    )
+
+
+def get_workload_size(arguments):
+    """
+    Provides the workload size of parsed workload options.
+    :param arguments: Parsed arguments
+    :return: Tuple of (number of accounts, number of transactions)
+    """
+    num_accounts, num_transactions = SCALES[arguments.scale]
+    if arguments.accounts is not None:
+        num_accounts = arguments.accounts
+    if arguments.transactions is not None:
+        num_transactions = arguments.transactions
+    return num_accounts, num_transactions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generates seeded master and merged transaction files."
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("merged_bank_account_transactions_file")
+    add_workload_arguments(parser)
+    arguments = parser.parse_args()
+
+    num_accounts, num_transactions = get_workload_size(arguments)
+    try:
+        generator = WorkloadGenerator(
+            num_accounts,
+            arguments.seed,
+            arguments.mix,
+            arguments.transfer_ratio,
+            arguments.session_length,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    generator.write_files(
+        arguments.master_bank_accounts_file,
+        arguments.merged_bank_account_transactions_file,
+        num_transactions,
+    )
+    print(f"Generated {num_accounts} accounts and {num_transactions} transactions.")
@@ -0,0 +1,56 @@
+import sys
+
+ACTIVE = sys.intern("A")
+DISABLED = sys.intern("D")
+STUDENT_PLAN = sys.intern("SP")
+NON_STUDENT_PLAN = sys.intern("NP")
+
+
+class Account:
+    """
+    Stores a single bank account.
+    Uses slots instead of a per-account dict to keep the memory footprint small,
+    and interns the status and plan codes so that all accounts share them.
+    """
+
+    __slots__ = ("holder_name", "status", "balance", "num_transactions", "plan")
+
+    def __init__(
+        self, holder_name, status, balance, num_transactions, plan=STUDENT_PLAN
+    ):
+        """
+        Constructs an Account object.
+        :param holder_name: Account holder name
+        :param status: Account status code ('A' or 'D')
+        :param balance: Account balance in cents
+        :param num_transactions: Number of transactions
+        :param plan: Account plan code ('SP' or 'NP')
+        """
+        self.holder_name = holder_name
+        self.status = sys.intern(status)
+        self.balance = balance
+        self.num_transactions = num_transactions
+        self.plan = sys.intern(plan)
+
+    def __eq__(self, other):
+        """
+        Compares two accounts field by field.
+        :param other: Other account
+        :return: True if all fields are equal, False otherwise
+        """
+        if not isinstance(other, Account):
+            return NotImplemented
+
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def __repr__(self):
+        """
+        Provides a readable representation of the account.
+        :return: Account representation
+        """
+        fields = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self.__slots__
+        )
+        return f"Account({fields})"
@@ -1,9 +1,23 @@
+from account import ACTIVE
 from account_record_builder import AccountRecordBuilder
+from atomic_file_writer import atomic_output_files
+from binary_master_file import (
+    WRITE_RECORDS,
+    pack_account_record,
+    pack_binary_master_header,
+)
+from compressed_files import open_file
+
+# Width of a 'master bank accounts' record without its line terminator
+MASTER_RECORD_WIDTH = 42
+# Width of the part of a fixed-width master record that is its current accounts record
+CURRENT_RECORD_WIDTH = 37
 
 
 class AccountFileWriter:
     """
     Writes new account data to output files.
+    Output files are published atomically, so a crash never leaves a truncated file.
     """
 
     def __init__(self):
@@ -12,20 +26,164 @@ class AccountFileWriter:
         """
         self.builder = AccountRecordBuilder()
 
+    def write_new_account_files(
+        self,
+        accounts,
+        new_master_bank_accounts_file,
+        current_bank_accounts_file,
+        source_master_file=None,
+        dirty_account_numbers=None,
+    ):
+        """
+        Writes the 'new master bank accounts' and 'current bank accounts' files in a
+        single sorted pass. Each account is formatted once: its master record is its
+        current accounts record followed by the transaction count.
+        Neither file is published until both have been completely written.
+        :param accounts: BankAccounts object.
+        :param new_master_bank_accounts_file: 'New master bank accounts' file path
+        :param current_bank_accounts_file: 'Current bank accounts' file path
+        :param source_master_file: Old 'master bank accounts' file path, or None
+        :param dirty_account_numbers: Set of modified account numbers, or None
+        """
+        with atomic_output_files(
+            new_master_bank_accounts_file, current_bank_accounts_file
+        ) as (master_file, current_file):
+            for account, master_record, current_record in self.iter_account_records(
+                accounts, source_master_file, dirty_account_numbers
+            ):
+                master_file.write(master_record)
+                if account.status == ACTIVE:
+                    current_file.write(current_record)
+
+    def write_binary_account_files(
+        self, accounts, new_master_bank_accounts_file, current_bank_accounts_file
+    ):
+        """
+        Writes a binary 'new master bank accounts' file and a text 'current bank
+        accounts' file in a single sorted pass.
+        Neither file is published until both have been completely written.
+        :param accounts: BankAccounts object.
+        :param new_master_bank_accounts_file: Binary 'new master bank accounts' file path
+        :param current_bank_accounts_file: 'Current bank accounts' file path
+        """
+        account_items = sorted(accounts.items())
+        with atomic_output_files(
+            new_master_bank_accounts_file, current_bank_accounts_file, binary=True
+        ) as (master_file, current_file):
+            master_file.write(pack_binary_master_header())
+            for start in range(0, len(account_items), WRITE_RECORDS):
+                block = account_items[start : start + WRITE_RECORDS]
+                master_file.write(
+                    b"".join([pack_account_record(*item) for item in block])
+                )
+                current_records = [
+                    self.builder.build_account_record(
+                        "current_bank_accounts_file", account_number, account
+                    )
+                    + "\n"
+                    for account_number, account in block
+                    if account.status == ACTIVE
+                ]
+                current_file.write("".join(current_records).encode())
+
     def write_new_master_bank_accounts_file(
-        self, accounts, new_master_bank_accounts_file
+        self,
+        accounts,
+        new_master_bank_accounts_file,
+        source_master_file=None,
+        dirty_account_numbers=None,
     ):
         """
         Writes the 'new master bank accounts' file.
         :param accounts: BankAccounts object.
         :param new_master_bank_accounts_file: 'New master bank accounts' file path
+        :param source_master_file: Old 'master bank accounts' file path, or None
+        :param dirty_account_numbers: Set of modified account numbers, or None
         """
-        with open(new_master_bank_accounts_file, "w") as file:
-            for account_number, account_data in sorted(accounts.items()):
+        with atomic_output_files(new_master_bank_accounts_file) as (master_file,):
+            for _, master_record, _ in self.iter_account_records(
+                accounts, source_master_file, dirty_account_numbers
+            ):
+                master_file.write(master_record)
+
+    def iter_account_records(self, accounts, source_master_file, dirty_account_numbers):
+        """
+        Provides the 'new master bank accounts' and 'current bank accounts' records of
+        every account, in account number order.
+        Given the old master file and the account numbers modified since it was loaded,
+        the records of unmodified accounts are copied from it verbatim instead of being
+        rebuilt. The old master file must be in ascending account number order.
+        :param accounts: BankAccounts object.
+        :param source_master_file: Old 'master bank accounts' file path, or None
+        :param dirty_account_numbers: Set of modified account numbers, or None
+        :return: Generator of (Account, master record, current accounts record), with
+                 line terminators
+        """
+        if source_master_file is None or dirty_account_numbers is None:
+            source_records = iter(())
+        else:
+            source_records = self.read_source_records(source_master_file)
+        source_account_number, source_record = next(source_records, (None, None))
+
+        for account_number, account in sorted(accounts.items()):
+            while (
+                source_account_number is not None
+                and source_account_number < account_number
+            ):
+                source_account_number, source_record = next(
+                    source_records, (None, None)
+                )
+
+            if (
+                source_account_number == account_number
+                and account_number not in dirty_account_numbers
+            ):
+                master_record = source_record
+                current_record = source_record[:CURRENT_RECORD_WIDTH] + "\n"
+            else:
                 account_record = self.builder.build_account_record(
-                    "new_master_bank_accounts_file", account_number, account_data
+                    "current_bank_accounts_file", account_number, account
                 )
-                file.write(account_record + "\n")
+                num_transactions = self.builder.format_num_transactions(account)
+                master_record = f"{account_record} {num_transactions}\n"
+                current_record = account_record + "\n"
+
+            yield account, master_record, current_record
+
+    def read_source_records(self, source_master_file):
+        """
+        Reads the records of an old 'master bank accounts' file that can be copied
+        verbatim. Records that are not in the fixed-width layout are left out, so
+        their accounts are rebuilt. Stops reading when the END_OF_FILE record is reached.
+        :param source_master_file: Old 'master bank accounts' file path
+        :return: Generator of (account number, record with its line terminator)
+        """
+        with open_file(source_master_file, "r") as file:
+            for line in file:
+                if line[6:26].rstrip(" ") == "END OF FILE":
+                    break
+                if len(line) == MASTER_RECORD_WIDTH + 1 and line[-1] == "\n":
+                    yield line[:5], line
+
+    def write_delta_file(self, accounts, dirty_account_numbers, delta_file):
+        """
+        Writes the 'delta' file of accounts changed since the old master file.
+        Each line is 'U <new master record>' for a created or modified account, or
+        'X <account number>' for a deleted account, in account number order.
+        :param accounts: BankAccounts object.
+        :param dirty_account_numbers: Set of modified account numbers
+        :param delta_file: 'Delta' file path
+        """
+        with atomic_output_files(delta_file) as (file,):
+            for account_number in sorted(dirty_account_numbers):
+                account = accounts.get(account_number)
+                if account is None:
+                    file.write(f"X {account_number}\n")
+                else:
+                    account_record = self.builder.build_account_record(
+                        "new_master_bank_accounts_file", account_number, account
+                    )
+                    file.write(f"U {account_record}\n")
 
     def write_current_bank_accounts_file(self, accounts, current_bank_accounts_file):
         """
@@ -33,10 +191,10 @@ class AccountFileWriter:
         :param accounts: BankAccounts object.
         :param current_bank_accounts_file: 'Current bank accounts' file path
         """
-        with open(current_bank_accounts_file, "w") as file:
-            for account_number, account_data in sorted(accounts.items()):
-                if account_data["status"] == "A":
+        with atomic_output_files(current_bank_accounts_file) as (file,):
+            for account_number, account in sorted(accounts.items()):
+                if account.status == ACTIVE:
                     account_record = self.builder.build_account_record(
-                        "current_bank_accounts_file", account_number, account_data
+                        "current_bank_accounts_file", account_number, account
                     )
                     file.write(account_record + "\n")
@@ -0,0 +1,28 @@
+from money import parse_cents
+
+
+class AccountRecordParser:
+    """
+    Parses account records.
+    """
+
+    def parse_account_record(self, account_record):
+        """
+        Parses an account record from the 'master bank accounts' file.
+        :param account_record: Account record without its line terminator
+        :return: Tuple of (account number, account holder name, account status,
+                 account balance in cents, number of transactions)
+        """
+        account_number = account_record[0:5]
+        account_holder_name = account_record[6:26].rstrip(" ")
+        account_status = account_record[27]
+        account_balance = parse_cents(account_record[29:37])
+        num_transactions = int(account_record[38:])
+
+        return (
+            account_number,
+            account_holder_name,
+            account_status,
+            account_balance,
+            num_transactions,
+        )
@@ -0,0 +1,100 @@
+"""
+Atomic publishing of output files.
+
+Each output file is written to a temporary file in the same directory. Only after
+every file of the set has been completely written and fsynced are they renamed over
+their final paths. A crash therefore never leaves a truncated output file: each path
+holds either its previous contents or its complete new contents.
+
+A final path with a compressed extension, such as '.gz', is written compressed.
+"""
+
+from compressed_files import is_compressed, wrap_output_file
+from contextlib import contextmanager
+import os
+import secrets
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+class AtomicFile:
+    """
+    Output file that is written to a temporary path and published by renaming it.
+    """
+
+    def __init__(self, path, buffering=WRITE_BUFFER_BYTES, binary=False):
+        """
+        Constructs an AtomicFile object and opens its temporary file.
+        :param path: Final file path
+        :param buffering: Write buffer size in bytes
+        :param binary: Whether to open the file in binary mode
+        """
+        self.path = path
+        self.temp_path = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+        compressed = is_compressed(path)
+        self.raw_file = open(
+            self.temp_path, "xb" if binary or compressed else "x", buffering=buffering
+        )
+        self.file = self.raw_file
+        if compressed:
+            self.file = wrap_output_file(self.raw_file, path, binary)
+
+    def sync(self):
+        """
+        Flushes the temporary file to disk and closes it.
+        """
+        if self.file is not self.raw_file:
+            # Closing the compressed stream writes its end but keeps the file open.
+            self.file.close()
+        self.raw_file.flush()
+        os.fsync(self.raw_file.fileno())
+        self.raw_file.close()
+
+    def publish(self):
+        """
+        Renames the temporary file over the final path and syncs the directory entry.
+        """
+        os.replace(self.temp_path, self.path)
+        if os.name == "posix":
+            directory_fd = os.open(
+                os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY
+            )
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    def discard(self):
+        """
+        Closes and removes the temporary file, leaving the final path untouched.
+        """
+        self.file.close()
+        self.raw_file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+@contextmanager
+def atomic_output_files(*paths, binary=False):
+    """
+    Opens a set of output files that are published together when the block exits.
+    If the block raises, no file is published and the temporary files are removed.
+    :param paths: Final file paths
+    :param binary: Whether to open the files in binary mode
+    :return: List of writable file objects, in the same order as the paths
+    """
+    atomic_files = []
+    try:
+        for path in paths:
+            atomic_files.append(AtomicFile(path, binary=binary))
+
+        yield [atomic_file.file for atomic_file in atomic_files]
+
+        for atomic_file in atomic_files:
+            atomic_file.sync()
+        for atomic_file in atomic_files:
+            atomic_file.publish()
+    except BaseException:
+        for atomic_file in atomic_files:
+            atomic_file.discard()
+        raise
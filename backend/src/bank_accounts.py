@@ -1,3 +1,18 @@
+from account import Account, DISABLED, STUDENT_PLAN
+from account_record_parser import AccountRecordParser
+from binary_master_file import read_binary_master_records
+from compressed_files import is_compressed, open_file
+from money import STUDENT_PLAN_FEE, NON_STUDENT_PLAN_FEE
+from parallel_record_loader import load_master_records
+from rejection_log import (
+    RejectionLog,
+    ACCOUNT_NOT_FOUND,
+    ACCOUNT_DISABLED,
+    INSUFFICIENT_FUNDS,
+)
+from transaction_journal import TRANSACTION_FEE, UPDATE
+
+
 class BankAccounts:
     """
     Stores bank accounts in memory.
@@ -8,33 +23,167 @@ class BankAccounts:
         Constructs a BankAccounts object.
         """
         self.accounts = {}
+        self.transfer_index = {}
+        self.indexed_accounts = self.accounts
+        self.dirty_account_numbers = set()
+        self.source_master_file = None
+        self.rejections = RejectionLog()
+        self.journal = None
+
+    def rebuild_transfer_index(self):
+        """
+        Rebuilds the transfer index from the accounts.
+        The index maps (holder name, 2-digit account number prefix) to the matching
+        account numbers, kept in the same order as the accounts.
+        """
+        self.transfer_index = {}
+        for account_number, account in self.accounts.items():
+            key = (account.holder_name, account_number[:2])
+            self.transfer_index.setdefault(key, {})[account_number] = None
+        self.indexed_accounts = self.accounts
+
+    def get_transfer_index(self):
+        """
+        Provides the transfer index, rebuilding it if the accounts were replaced.
+        The accounts are a plain attribute so the per-transaction lookups stay cheap.
+        :return: Transfer index
+        """
+        if self.indexed_accounts is not self.accounts:
+            self.rebuild_transfer_index()
+        return self.transfer_index
+
+    def add_account(self, account_number, account):
+        """
+        Adds an account and registers it in the transfer index.
+        :param account_number: Account number
+        :param account: Account object
+        """
+        transfer_index = self.get_transfer_index()
+        existing_account = self.accounts.get(account_number)
+        if existing_account is not None:
+            if existing_account.holder_name == account.holder_name:
+                self.accounts[account_number] = account
+                return
+            self.remove_account(account_number)
+
+        self.accounts[account_number] = account
+        key = (account.holder_name, account_number[:2])
+        transfer_index.setdefault(key, {})[account_number] = None
+
+    def remove_account(self, account_number):
+        """
+        Removes an account and unregisters it from the transfer index.
+        :param account_number: Account number
+        """
+        transfer_index = self.get_transfer_index()
+        account = self.accounts.pop(account_number)
+        key = (account.holder_name, account_number[:2])
+        matching_account_numbers = transfer_index[key]
+        del matching_account_numbers[account_number]
+        if not matching_account_numbers:
+            del transfer_index[key]
+
+    def find_transfer_destination(
+        self, account_holder_name, partial_account_number, from_account_number
+    ):
+        """
+        Finds the first account, other than the source account, that belongs to the
+        account holder and whose account number starts with the partial account number.
+        :param account_holder_name: Account holder name
+        :param partial_account_number: Partial account number of destination account
+        :param from_account_number: Account number of source account
+        :return: Destination account number, or None if not found
+        """
+        matching_account_numbers = self.get_transfer_index().get(
+            (account_holder_name, partial_account_number), ()
+        )
+        for account_number in matching_account_numbers:
+            if account_number != from_account_number:
+                return account_number
+
+        return None
 
-    def load_accounts(self, master_bank_accounts_file):
+    def mark_dirty(self, account_number, operation=UPDATE):
+        """
+        Records that an account was modified since the accounts were loaded,
+        and journals its new state if a journal is open.
+        :param account_number: Account number
+        :param operation: Operation that modified the account
+        """
+        self.dirty_account_numbers.add(account_number)
+        if self.journal is not None:
+            self.journal.record(
+                operation,
+                account_number,
+                self.accounts.get(account_number),
+                self.rejections.line_number,
+            )
+
+    def load_accounts(self, master_bank_accounts_file, workers=1, binary=False):
         """
         Loads bank account records from the 'master bank accounts' file.
         Stops reading when the END_OF_FILE record is reached.
+        If the account numbers are in strictly ascending order, the file is kept as the
+        source of verbatim records for accounts that are not modified afterwards.
         :param master_bank_accounts_file: 'Master bank accounts' file path
+        :param workers: Number of worker processes used to parse the file, unless it
+                        is compressed
+        :param binary: Whether the file is a binary master file
         """
-        with open(master_bank_accounts_file, "r") as file:
-            for record in file:
-                record = record.rstrip("\n")
+        if binary:
+            account_records, _ = read_binary_master_records(master_bank_accounts_file)
+        elif workers > 1 and not is_compressed(master_bank_accounts_file):
+            account_records = load_master_records(master_bank_accounts_file, workers)
+        else:
+            account_records = self.read_account_records(master_bank_accounts_file)
 
-                account_number = record[0:5]
-                account_holder_name = record[6:26].rstrip(" ")
-                account_status = record[27]
-                account_balance = float(record[29:37])
-                num_transactions = int(record[38:])
+        previous_account_number = ""
+        is_ascending = True
+        for (
+            account_number,
+            account_holder_name,
+            account_status,
+            account_balance,
+            num_transactions,
+        ) in account_records:
+            if account_number <= previous_account_number:
+                is_ascending = False
+            previous_account_number = account_number
+            self.add_account(
+                account_number,
+                Account(
+                    account_holder_name,
+                    account_status,
+                    account_balance,
+                    num_transactions,
+                ),
+            )
+
+        self.dirty_account_numbers = set()
+        # Text records can only be copied verbatim from a text master file.
+        if is_ascending and not binary:
+            self.source_master_file = master_bank_accounts_file
+        else:
+            self.source_master_file = None
+
+    def read_account_records(self, master_bank_accounts_file):
+        """
+        Parses account records from the 'master bank accounts' file, one line at a time.
+        Stops reading when the END_OF_FILE record is reached.
+        :param master_bank_accounts_file: 'Master bank accounts' file path
+        :return: Generator of parsed account records
+        """
+        parser = AccountRecordParser()
+
+        # Lines end at '\n' only and lose a trailing '\r', as in parallel loading.
+        with open_file(master_bank_accounts_file, "r", newline="\n") as file:
+            for record in file:
+                account_record = parser.parse_account_record(record.rstrip("\r\n"))
 
-                if account_holder_name == "END OF FILE":
+                if account_record[1] == "END OF FILE":
                     break
 
-                self.accounts[account_number] = {
-                    "holder_name": account_holder_name,
-                    "status": account_status,
-                    "balance": account_balance,
-                    "num_transactions": num_transactions,
-                    "plan": "SP",
-                }
+                yield account_record
 
     def is_account_valid(self, account_number):
         """
@@ -43,11 +192,15 @@ class BankAccounts:
         :return: True if the account exists or is not disabled, False otherwise
         """
         if account_number not in self.accounts:
-            print(f"ERROR: Account {account_number} does not exist.")
+            self.rejections.reject(
+                ACCOUNT_NOT_FOUND, f"ERROR: Account {account_number} does not exist."
+            )
             return False
 
-        if self.accounts[account_number]["status"] == "D":
-            print(f"ERROR: Account {account_number} is disabled.")
+        if self.accounts[account_number].status == DISABLED:
+            self.rejections.reject(
+                ACCOUNT_DISABLED, f"ERROR: Account {account_number} is disabled."
+            )
             return False
 
         return True
@@ -56,12 +209,15 @@ class BankAccounts:
         """
         Checks whether an account has sufficient funds for a withdrawal.
         :param account_number: Account number
-        :param account_balance: Account balance
-        :param amount: Amount to withdraw
+        :param account_balance: Account balance in cents
+        :param amount: Amount to withdraw in cents
         :return: True if the account has sufficient funds, False otherwise
         """
         if account_balance < amount:
-            print(f"ERROR: Account {account_number} has insufficient funds.")
+            self.rejections.reject(
+                INSUFFICIENT_FUNDS,
+                f"ERROR: Account {account_number} has insufficient funds.",
+            )
             return False
 
         return True
@@ -71,15 +227,24 @@ class BankAccounts:
         Applies a transaction fee to an account based on its plan.
         :param account_number: Account number
         """
-        account_plan = self.accounts[account_number]["plan"]
+        account = self.accounts[account_number]
 
-        if account_plan == "SP":
-            transaction_fee = 0.05
+        if account.plan == STUDENT_PLAN:
+            transaction_fee = STUDENT_PLAN_FEE
         else:
-            transaction_fee = 0.10
+            transaction_fee = NON_STUDENT_PLAN_FEE
 
-        if self.accounts[account_number]["balance"] - transaction_fee >= 0:
-            self.accounts[account_number]["balance"] -= transaction_fee
+        if account.balance - transaction_fee >= 0:
+            account.balance -= transaction_fee
+            # Inlined mark_dirty, since a fee follows most transactions.
+            self.dirty_account_numbers.add(account_number)
+            if self.journal is not None:
+                self.journal.record(
+                    TRANSACTION_FEE,
+                    account_number,
+                    account,
+                    self.rejections.line_number,
+                )
 
     def get_all_accounts(self):
         """
@@ -14,19 +14,58 @@ Output files:
 - new_master_bank_accounts.txt: Contains updated bank accounts.
 - current_bank_accounts.txt: Contains all active bank accounts.
 
+Input and output files whose names end in '.gz', '.xz' or '.bz2' are read and written
+compressed, streaming, without being decompressed to disk.
+
 Instructions:
 1. Open the terminal
 2. Change the directory to 'backend/src': cd backend/src
 3. Run this file:
    python banking_system_backend.py <master_bank_accounts_file> <merged_bank_account_transactions_file>
-   <new_master_bank_accounts_file> <current_bank_accounts_file>
+   <new_master_bank_accounts_file> <current_bank_accounts_file> [options]
+
+Options:
+- --workers N: Parses the master bank accounts file in chunks across N worker
+  processes.
+- --shards N: Applies transactions across N account-sharded worker processes.
+- --vectorized: Applies deposits, withdrawals and bill payments in NumPy batches.
+- --delta-file PATH: Also writes the records of accounts changed during the day to PATH.
+- --rejects-file PATH: Writes rejected transactions to PATH as JSON lines, instead of
+  printing each of them, and prints a summary of the rejections by reason.
+- --checkpoint-every N: Takes a checkpoint of the run every N transaction records.
+- --checkpoint-interval SECONDS: Takes a checkpoint of the run every SECONDS seconds.
+- --checkpoint-file PATH: Checkpoint file path. Defaults to the 'new master bank
+  accounts' file path followed by '.checkpoint'.
+- --resume: Resumes from the checkpoint file, if it exists, instead of starting over.
+- --journal PATH: Appends every account change to a write-ahead journal at PATH, from
+  which journal_recovery.py can rebuild the accounts after a crash.
+- --journal-group-size N: Number of journal entries committed with each fsync.
+- --binary-master: Reads and writes the master bank accounts files in the binary
+  format of binary_master_file.py. The current bank accounts file stays in text.
+- --metrics: Measures the latency of every transaction and prints, per transaction
+  code, the count, acceptances, rejections, total time and a latency histogram.
+- --pipelined: Reads and decodes transaction records on a background thread, so that
+  waiting for slow storage overlaps with applying transactions.
 """
 
 from bank_accounts import BankAccounts
 from transaction_file_reader import TransactionFileReader
 from transaction_processor import TransactionProcessor
+from sharded_transaction_processor import ShardedTransactionProcessor
+from vectorized_transaction_processor import VectorizedTransactionProcessor
 from account_file_writer import AccountFileWriter
-import sys
+from rejection_log import RejectionLog
+from transaction_journal import JOURNAL_GROUP_SIZE, TransactionJournal
+from transaction_metrics import TransactionMetrics
+from pipelined_transaction_reader import PipelinedTransactionReader
+from checkpoint import (
+    Checkpointer,
+    capture_checkpoint,
+    read_checkpoint,
+    restore_checkpoint,
+)
+import argparse
+import os
 
 
 class BankingSystemBackend:
@@ -41,6 +80,20 @@ class BankingSystemBackend:
         merged_bank_account_transactions_file,
         new_master_bank_accounts_file,
         current_bank_accounts_file,
+        workers=1,
+        shards=1,
+        vectorized=False,
+        delta_file=None,
+        rejects_file=None,
+        checkpoint_file=None,
+        checkpoint_every=None,
+        checkpoint_interval=None,
+        resume=False,
+        journal_file=None,
+        journal_group_size=JOURNAL_GROUP_SIZE,
+        binary_master=False,
+        metrics=False,
+        pipelined=False,
     ):
         """
         Constructs a BankingSystemBackend object.
@@ -48,6 +101,21 @@ class BankingSystemBackend:
         :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
         :param new_master_bank_accounts_file: 'New master bank accounts' file path
         :param current_bank_accounts_file: 'Current bank accounts' file path
+        :param workers: Number of worker processes used to parse the master file
+        :param shards: Number of account-sharded worker processes used to apply transactions
+        :param vectorized: Whether to apply monetary transactions in NumPy batches
+        :param delta_file: 'Delta' file path, or None to not write one
+        :param rejects_file: Rejects file path, or None to print rejections instead
+        :param checkpoint_file: Checkpoint file path, or None for the default path
+        :param checkpoint_every: Number of records between checkpoints, or None
+        :param checkpoint_interval: Number of seconds between checkpoints, or None
+        :param resume: Whether to resume from the checkpoint file, if it exists
+        :param journal_file: Journal file path, or None to not keep a journal
+        :param journal_group_size: Number of journal entries committed with each fsync
+        :param binary_master: Whether the master bank accounts files are binary
+        :param metrics: Whether to measure and report per-transaction-code metrics
+        :param pipelined: Whether to read and decode transaction records on a
+                          background thread
         """
         self.master_bank_accounts_file = master_bank_accounts_file
         self.merged_bank_account_transactions_file = (
@@ -55,71 +123,383 @@ class BankingSystemBackend:
         )
         self.new_master_bank_accounts_file = new_master_bank_accounts_file
         self.current_bank_accounts_file = current_bank_accounts_file
+        self.workers = workers
+        self.shards = shards
+        self.vectorized = vectorized
+        self.delta_file = delta_file
+        self.rejects_file = rejects_file
+        self.checkpoint_file = checkpoint_file
+        if checkpoint_file is None:
+            self.checkpoint_file = f"{new_master_bank_accounts_file}.checkpoint"
+        self.resume = resume
+        self.checkpointer = None
+        if checkpoint_every is not None or checkpoint_interval is not None or resume:
+            self.checkpointer = Checkpointer(
+                self.checkpoint_file, checkpoint_every, checkpoint_interval
+            )
+        self.journal_file = journal_file
+        self.journal_group_size = journal_group_size
+        self.binary_master = binary_master
+        self.metrics = TransactionMetrics() if metrics else None
+        self.pipelined = pipelined
         self.accounts = BankAccounts()
 
     def run(self):
         """
         Runs backend jobs.
         """
-        self.load_accounts()
-        self.process_transactions()
+        checkpoint = None
+        if self.resume and os.path.exists(self.checkpoint_file):
+            checkpoint = read_checkpoint(self.checkpoint_file)
+
+        resume_position = None
+        if checkpoint is None:
+            self.open_rejection_log()
+            self.load_accounts()
+        else:
+            self.open_rejection_log(checkpoint[0]["rejects_offset"])
+            resume_position = restore_checkpoint(
+                self.accounts, self.merged_bank_account_transactions_file, checkpoint
+            )
+            print(f"Resuming after line {resume_position[0]}.")
+        self.open_journal(append=checkpoint is not None)
+
+        try:
+            self.process_transactions(resume_position)
+        finally:
+            self.accounts.rejections.close()
+            if self.accounts.journal is not None:
+                self.accounts.journal.close()
         self.write_new_account_files()
+        if self.checkpointer is not None:
+            self.checkpointer.remove()
+
+        self.print_summary()
+
+    def print_summary(self):
+        """
+        Prints the summary of the rejections, if they were written to a rejects file,
+        and the metrics report, if metrics were measured.
+        """
+        if self.rejects_file is not None:
+            for line in self.accounts.rejections.summary():
+                print(line)
+        if self.metrics is not None:
+            for line in self.metrics.report():
+                print(line)
+
+    def open_rejection_log(self, resume_offset=None):
+        """
+        Opens the rejects file, if any.
+        :param resume_offset: Size of the rejects file at the checkpoint being resumed
+                              from, or None to start a new rejects file
+        """
+        if self.rejects_file is not None:
+            self.accounts.rejections = RejectionLog(self.rejects_file, resume_offset)
+
+    def open_journal(self, append=False):
+        """
+        Opens the journal, if any.
+        :param append: Whether to append to the journal, e.g. when resuming
+        """
+        if self.journal_file is not None:
+            self.accounts.journal = TransactionJournal(
+                self.journal_file, self.journal_group_size, append
+            )
 
     def load_accounts(self):
         """
         Loads bank accounts.
         """
-        self.accounts.load_accounts(self.master_bank_accounts_file)
+        self.accounts.load_accounts(
+            self.master_bank_accounts_file, self.workers, self.binary_master
+        )
 
-    def process_transactions(self):
+    def process_transactions(self, resume_position=None):
         """
         Processes transactions.
+        Transaction records are streamed from the file rather than loaded up front.
+        :param resume_position: Tuple of (line number, byte offset) of the last record
+                                processed before the checkpoint, or None
         """
-        reader = TransactionFileReader(self.merged_bank_account_transactions_file)
-        processor = TransactionProcessor(self.accounts)
+        reader = self.create_transaction_reader()
+        if self.shards > 1:
+            processor = ShardedTransactionProcessor(self.accounts, self.shards)
+        elif self.vectorized:
+            processor = VectorizedTransactionProcessor(self.accounts)
+        else:
+            processor = TransactionProcessor(self.accounts)
+
+        if self.metrics is not None and self.vectorized:
+            self.metrics.instrument_batches(processor)
+        elif self.metrics is not None:
+            self.metrics.instrument(processor)
+
+        if self.checkpointer is not None:
+            self.process_transactions_with_checkpoints(
+                reader, processor, resume_position or (0, 0)
+            )
+        elif self.pipelined:
+            self.process_pipelined_transactions(reader, processor)
+        else:
+            self.process_serial_transactions(reader, processor)
 
-        transaction_records = reader.read_transaction_records()
-        for transaction_record in transaction_records:
+        if self.shards > 1 or self.vectorized:
+            processor.finish()
+
+    def create_transaction_reader(self):
+        """
+        Creates the reader of the transaction records.
+        :return: TransactionFileReader object
+        """
+        return TransactionFileReader(self.merged_bank_account_transactions_file)
+
+    def process_serial_transactions(self, reader, processor):
+        """
+        Processes transactions as they are read.
+        :param reader: TransactionFileReader object
+        :param processor: Transaction processor
+        """
+        # The rejection log traces each rejection back to its line in the file.
+        rejections = self.accounts.rejections
+        transaction_records = reader.iter_numbered_transaction_records()
+        for line_number, transaction_record in transaction_records:
+            if transaction_record.startswith("00"):
+                continue
+
+            rejections.line_number = line_number
+            rejections.record = transaction_record
+            processor.process_transaction(transaction_record)
+
+    def process_pipelined_transactions(self, reader, processor):
+        """
+        Processes transactions read and decoded on a background thread.
+        :param reader: TransactionFileReader object
+        :param processor: Transaction processor
+        """
+        rejections = self.accounts.rejections
+        # Only the serial processor takes decoded records.
+        decoded = type(processor) is TransactionProcessor
+        pipeline = PipelinedTransactionReader(reader, decode=decoded)
+        for batch in pipeline.iter_batches():
+            for line_number, transaction_record, transaction in batch:
+                rejections.line_number = line_number
+                rejections.record = transaction_record
+                if decoded:
+                    processor.process_decoded_transaction(transaction)
+                else:
+                    processor.process_transaction(transaction_record)
+
+    def process_transactions_with_checkpoints(self, reader, processor, position):
+        """
+        Processes transactions from a position in the file, taking checkpoints.
+        :param reader: TransactionFileReader object
+        :param processor: Transaction processor
+        :param position: Tuple of (line number, byte offset) to start after
+        """
+        checkpointer = self.checkpointer
+        rejections = self.accounts.rejections
+        num_records = 0
+        line_number, offset = position
+        transaction_records = reader.iter_positioned_transaction_records(
+            offset, line_number
+        )
+        for line_number, offset, transaction_record in transaction_records:
             if transaction_record.startswith("00"):
                 continue
 
+            rejections.line_number = line_number
+            rejections.record = transaction_record
             processor.process_transaction(transaction_record)
 
-    def write_new_account_files(self):
+            num_records += 1
+            if num_records >= checkpointer.next_check and checkpointer.is_due(
+                num_records
+            ):
+                # Buffered monetary records must be applied before the snapshot.
+                if self.vectorized:
+                    processor.flush()
+                checkpointer.save(
+                    num_records,
+                    capture_checkpoint(
+                        self.accounts,
+                        self.merged_bank_account_transactions_file,
+                        line_number,
+                        offset,
+                    ),
+                    rejections.file,
+                )
+
+        checkpointer.wait()
+
+    def write_new_account_files(
+        self, new_master_bank_accounts_file=None, current_bank_accounts_file=None
+    ):
         """
         Writes output files.
+        Unless the master files are binary, records of accounts that were not modified
+        are copied from the master file.
+        :param new_master_bank_accounts_file: 'New master bank accounts' file path, or
+                                              None for the backend's own
+        :param current_bank_accounts_file: 'Current bank accounts' file path, or None
+                                           for the backend's own
         """
         writer = AccountFileWriter()
         accounts = self.accounts.get_all_accounts()
+        if new_master_bank_accounts_file is None:
+            new_master_bank_accounts_file = self.new_master_bank_accounts_file
+        if current_bank_accounts_file is None:
+            current_bank_accounts_file = self.current_bank_accounts_file
 
-        writer.write_new_master_bank_accounts_file(
-            accounts, self.new_master_bank_accounts_file
-        )
-        writer.write_current_bank_accounts_file(
-            accounts, self.current_bank_accounts_file
-        )
+        if self.binary_master:
+            writer.write_binary_account_files(
+                accounts,
+                new_master_bank_accounts_file,
+                current_bank_accounts_file,
+            )
+        else:
+            writer.write_new_account_files(
+                accounts,
+                new_master_bank_accounts_file,
+                current_bank_accounts_file,
+                self.accounts.source_master_file,
+                self.accounts.dirty_account_numbers,
+            )
+        if self.delta_file is not None:
+            writer.write_delta_file(
+                accounts, self.accounts.dirty_account_numbers, self.delta_file
+            )
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 5:
-        print(
-            "Usage: python banking_system_backend.py "
-            "<master_bank_accounts_file> "
-            "<merged_bank_account_transactions_file> "
-            "<new_master_bank_accounts_file> "
-            "<current_bank_accounts_file>"
-        )
-        sys.exit(1)
+def parse_arguments():
+    """
+    Parses the command-line arguments.
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the banking system back-end.",
+        usage="python banking_system_backend.py "
+        "<master_bank_accounts_file> "
+        "<merged_bank_account_transactions_file> "
+        "<new_master_bank_accounts_file> "
+        "<current_bank_accounts_file> [options]",
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("merged_bank_account_transactions_file")
+    parser.add_argument("new_master_bank_accounts_file")
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes used to parse the master file",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="number of account-sharded worker processes used to apply transactions",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="apply deposits, withdrawals and bill payments in NumPy batches",
+    )
+    parser.add_argument(
+        "--delta-file",
+        help="file to write the records of accounts changed during the day to",
+    )
+    parser.add_argument(
+        "--rejects-file",
+        help="file to write rejected transactions to, as JSON lines",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        help="number of transaction records between checkpoints",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        help="number of seconds between checkpoints",
+    )
+    parser.add_argument(
+        "--checkpoint-file",
+        help="checkpoint file path (default: the new master file path + .checkpoint)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="resume from the checkpoint file, if it exists",
+    )
+    parser.add_argument(
+        "--journal",
+        help="file to append every account change to, as a write-ahead journal",
+    )
+    parser.add_argument(
+        "--journal-group-size",
+        type=int,
+        default=JOURNAL_GROUP_SIZE,
+        help="number of journal entries committed with each fsync",
+    )
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print per-transaction-code counts, timings and latency histograms",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="read and decode transaction records on a background thread",
+    )
+    arguments = parser.parse_args()
+    if arguments.shards > 1 and arguments.vectorized:
+        parser.error("--shards and --vectorized cannot be combined")
+    if arguments.shards > 1 and (
+        arguments.checkpoint_every is not None
+        or arguments.checkpoint_interval is not None
+        or arguments.resume
+    ):
+        parser.error("--shards cannot be combined with checkpoints")
+    if arguments.shards > 1 and arguments.journal is not None:
+        parser.error("--shards and --journal cannot be combined")
+    if arguments.shards > 1 and arguments.metrics:
+        parser.error("--shards and --metrics cannot be combined")
+    if arguments.pipelined and (
+        arguments.checkpoint_every is not None
+        or arguments.checkpoint_interval is not None
+        or arguments.resume
+    ):
+        parser.error("--pipelined cannot be combined with checkpoints")
+    return arguments
 
-    master_bank_accounts_file = sys.argv[1]
-    merged_bank_account_transactions_file = sys.argv[2]
-    new_master_bank_accounts_file = sys.argv[3]
-    current_bank_accounts_file = sys.argv[4]
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
 
     backend = BankingSystemBackend(
-        master_bank_accounts_file,
-        merged_bank_account_transactions_file,
-        new_master_bank_accounts_file,
-        current_bank_accounts_file,
+        arguments.master_bank_accounts_file,
+        arguments.merged_bank_account_transactions_file,
+        arguments.new_master_bank_accounts_file,
+        arguments.current_bank_accounts_file,
+        workers=arguments.workers,
+        shards=arguments.shards,
+        vectorized=arguments.vectorized,
+        delta_file=arguments.delta_file,
+        rejects_file=arguments.rejects_file,
+        checkpoint_file=arguments.checkpoint_file,
+        checkpoint_every=arguments.checkpoint_every,
+        checkpoint_interval=arguments.checkpoint_interval,
+        resume=arguments.resume,
+        journal_file=arguments.journal,
+        journal_group_size=arguments.journal_group_size,
+        binary_master=arguments.binary_master,
+        metrics=arguments.metrics,
+        pipelined=arguments.pipelined,
     )
     backend.run()
@@ -0,0 +1,221 @@
+"""
+Binary Master File
+
+A binary alternative to the text 'master bank accounts' file. After a short header,
+the file is a sequence of fixed-size little-endian records:
+
+  account number    unsigned 32-bit integer
+  holder name       20 bytes, UTF-8, padded with spaces
+  status            1 byte ('A' or 'D')
+  balance           signed 64-bit integer, in cents
+  transactions      unsigned 32-bit integer
+
+Records are packed and unpacked in bulk with struct, so loading and saving involve no
+text slicing or number parsing and formatting.
+
+The text to binary conversion is lossless: a text record that would not be rebuilt
+byte for byte from its binary record is refused. The header records whether the text
+file ended with an END_OF_FILE record, so converting back gives the original file.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/src': cd backend/src
+3. Run this file:
+   python binary_master_file.py to-binary <text_master_file> <binary_master_file>
+   python binary_master_file.py to-text <binary_master_file> <text_master_file>
+"""
+
+from account import Account
+from account_record_builder import AccountRecordBuilder
+from account_record_parser import AccountRecordParser
+from atomic_file_writer import atomic_output_files
+from compressed_files import open_file
+import argparse
+import struct
+
+MAGIC = b"BNKM"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<I20scqI")
+HOLDER_NAME_BYTES = 20
+# Header flag: the text file ended with an END_OF_FILE record
+HAS_END_OF_FILE_RECORD = 1
+# Number of records packed per write
+WRITE_RECORDS = 4096
+
+END_OF_FILE_RECORD = "00000 END OF FILE          A 00000.00 0000"
+
+
+def pack_account_record(account_number, account):
+    """
+    Packs an account into a binary master record.
+    :param account_number: Account number
+    :param account: Account object
+    :return: Binary master record
+    """
+    if not (
+        len(account_number) == 5
+        and account_number.isascii()
+        and account_number.isdigit()
+    ):
+        raise ValueError(f"Account number {account_number!r} cannot be stored.")
+    holder_name = account.holder_name.encode()
+    if len(holder_name) > HOLDER_NAME_BYTES:
+        raise ValueError(f"Account holder name {account.holder_name!r} is too long.")
+
+    return RECORD.pack(
+        int(account_number),
+        holder_name.ljust(HOLDER_NAME_BYTES),
+        account.status.encode(),
+        account.balance,
+        account.num_transactions,
+    )
+
+
+def read_binary_master_records(binary_master_file):
+    """
+    Reads the records of a binary master file.
+    :param binary_master_file: Binary master file path
+    :return: Tuple of (list of parsed account records, in the same format as
+             AccountRecordParser, header flags)
+    """
+    with open_file(binary_master_file, "rb") as file:
+        data = file.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError(f"{binary_master_file} is not a binary master file.")
+    magic, version, flags = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{binary_master_file} is not a binary master file.")
+    records = memoryview(data)[HEADER.size :]
+    if len(records) % RECORD.size:
+        raise ValueError(f"{binary_master_file} is truncated.")
+
+    format_account_number = "%05d".__mod__
+    account_records = [
+        (
+            format_account_number(account_number),
+            holder_name.rstrip(b" ").decode(),
+            status.decode(),
+            balance,
+            num_transactions,
+        )
+        for account_number, holder_name, status, balance, num_transactions in (
+            RECORD.iter_unpack(records)
+        )
+    ]
+    return account_records, flags
+
+
+def pack_binary_master_header(flags=0):
+    """
+    Packs the header of a binary master file.
+    :param flags: Header flags
+    :return: Binary master header
+    """
+    return HEADER.pack(MAGIC, VERSION, flags)
+
+
+def write_binary_master_file(binary_master_file, accounts, flags=0):
+    """
+    Writes accounts to a binary master file atomically, in account number order.
+    :param binary_master_file: Binary master file path
+    :param accounts: Dictionary of account numbers to Account objects
+    :param flags: Header flags
+    """
+    account_items = sorted(accounts.items())
+    with atomic_output_files(binary_master_file, binary=True) as (file,):
+        file.write(pack_binary_master_header(flags))
+        for start in range(0, len(account_items), WRITE_RECORDS):
+            block = account_items[start : start + WRITE_RECORDS]
+            file.write(b"".join([pack_account_record(*item) for item in block]))
+
+
+def convert_text_to_binary(text_master_file, binary_master_file):
+    """
+    Converts a text master file to a binary master file.
+    :param text_master_file: Text 'master bank accounts' file path
+    :param binary_master_file: Binary master file path
+    :return: Number of accounts converted
+    """
+    parser = AccountRecordParser()
+    builder = AccountRecordBuilder()
+    accounts = {}
+    flags = 0
+    previous_account_number = ""
+    with open_file(text_master_file, "r") as file:
+        for line_number, line in enumerate(file, 1):
+            record = line.rstrip("\n")
+            if record == END_OF_FILE_RECORD:
+                flags |= HAS_END_OF_FILE_RECORD
+                break
+
+            account_number, holder_name, status, balance, num_transactions = (
+                parser.parse_account_record(record)
+            )
+            account = Account(holder_name, status, balance, num_transactions)
+            if (
+                account_number <= previous_account_number
+                or builder.build_account_record(
+                    "new_master_bank_accounts_file", account_number, account
+                )
+                != record
+            ):
+                raise ValueError(
+                    f"Line {line_number} of {text_master_file} cannot be converted "
+                    f"losslessly."
+                )
+            previous_account_number = account_number
+            accounts[account_number] = account
+
+    write_binary_master_file(binary_master_file, accounts, flags)
+    return len(accounts)
+
+
+def convert_binary_to_text(binary_master_file, text_master_file):
+    """
+    Converts a binary master file to a text master file.
+    :param binary_master_file: Binary master file path
+    :param text_master_file: Text 'master bank accounts' file path
+    :return: Number of accounts converted
+    """
+    builder = AccountRecordBuilder()
+    account_records, flags = read_binary_master_records(binary_master_file)
+    with atomic_output_files(text_master_file) as (file,):
+        for (
+            account_number,
+            holder_name,
+            status,
+            balance,
+            num_transactions,
+        ) in account_records:
+            account = Account(holder_name, status, balance, num_transactions)
+            file.write(
+                builder.build_account_record(
+                    "new_master_bank_accounts_file", account_number, account
+                )
+                + "\n"
+            )
+        if flags & HAS_END_OF_FILE_RECORD:
+            file.write(END_OF_FILE_RECORD + "\n")
+    return len(account_records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Converts between text and binary master files."
+    )
+    parser.add_argument("direction", choices=["to-binary", "to-text"])
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    arguments = parser.parse_args()
+
+    if arguments.direction == "to-binary":
+        num_accounts = convert_text_to_binary(
+            arguments.input_file, arguments.output_file
+        )
+    else:
+        num_accounts = convert_binary_to_text(
+            arguments.input_file, arguments.output_file
+        )
+    print(f"Converted {num_accounts} accounts.")
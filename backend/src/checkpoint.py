@@ -0,0 +1,281 @@
+"""
+Checkpoints of a backend run.
+
+A checkpoint is a snapshot of the account state together with the position in the
+'merged bank account transactions' file of the next record to process, so that a run
+that dies partway through the file can resume from there instead of from the start.
+
+The checkpoint file holds one JSON line per entry: first a header with the position,
+the identity of the input files and the rejection state, then one line per account
+in the order the accounts were added.
+
+Taking a checkpoint only copies the account fields on the processing thread. The
+snapshot is serialized, fsynced and published atomically by a background thread.
+If the previous checkpoint is still being written when the next one is due, the next
+one is postponed rather than waited for, so the processing loop never stalls on disk.
+"""
+
+from account import Account
+from atomic_file_writer import atomic_output_files
+from collections import Counter
+from json.encoder import encode_basestring_ascii
+import json
+import os
+import threading
+import time
+
+CHECKPOINT_VERSION = 1
+# Number of records processed between checks of whether a checkpoint is due
+CHECKPOINT_CHECK_RECORDS = 1024
+# Number of accounts formatted per write to the checkpoint file
+CHECKPOINT_WRITE_ACCOUNTS = 1024
+
+
+class Checkpointer:
+    """
+    Decides when checkpoints are due and writes them in the background.
+    """
+
+    # Name of what is written, for warnings
+    description = "Checkpoint"
+
+    def __init__(self, checkpoint_file, every_records=None, every_seconds=None):
+        """
+        Constructs a Checkpointer object.
+        :param checkpoint_file: Checkpoint file path
+        :param every_records: Number of records between checkpoints, or None
+        :param every_seconds: Number of seconds between checkpoints, or None
+        """
+        self.checkpoint_file = checkpoint_file
+        self.every_records = every_records
+        self.every_seconds = every_seconds
+        self.check_records = CHECKPOINT_CHECK_RECORDS
+        if every_records is not None:
+            self.check_records = max(1, min(every_records, CHECKPOINT_CHECK_RECORDS))
+        self.next_check = self.check_records
+        self.last_records = 0
+        self.last_time = time.monotonic()
+        self.thread = None
+        self.error = None
+
+    def is_due(self, num_records):
+        """
+        Checks whether a checkpoint is due and schedules the next check.
+        The caller only needs to call this once num_records reaches next_check.
+        :param num_records: Number of records processed so far
+        :return: True if a checkpoint is due and none is being written, False otherwise
+        """
+        self.next_check = num_records + self.check_records
+        is_due = (
+            self.every_records is not None
+            and num_records - self.last_records >= self.every_records
+        ) or (
+            self.every_seconds is not None
+            and time.monotonic() - self.last_time >= self.every_seconds
+        )
+        return is_due and not self.is_writing()
+
+    def is_writing(self):
+        """
+        Checks whether a checkpoint is being written.
+        :return: True if the background thread is still writing, False otherwise
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def save(self, num_records, state, rejects_file=None):
+        """
+        Starts writing a checkpoint in the background.
+        :param num_records: Number of records processed so far
+        :param state: Checkpoint state from capture_checkpoint
+        :param rejects_file: Open rejects file to sync before publishing, or None
+        """
+        self.report_error()
+        self.last_records = num_records
+        self.last_time = time.monotonic()
+        self.thread = threading.Thread(
+            target=self.write, args=(state, rejects_file), daemon=True
+        )
+        self.thread.start()
+
+    def write(self, state, rejects_file):
+        """
+        Writes a checkpoint. Runs on the background thread.
+        :param state: Checkpoint state from capture_checkpoint
+        :param rejects_file: Open rejects file to sync before publishing, or None
+        """
+        try:
+            # The rejects written before the checkpoint must be on disk before it is.
+            if rejects_file is not None:
+                os.fsync(rejects_file.fileno())
+            write_checkpoint(self.checkpoint_file, state)
+        except (OSError, ValueError) as error:
+            self.error = error
+
+    def wait(self):
+        """
+        Waits for the checkpoint being written, if any.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.report_error()
+
+    def report_error(self):
+        """
+        Reports a checkpoint that could not be written. The run itself continues.
+        """
+        if self.error is not None:
+            print(f"WARNING: {self.description} could not be written: {self.error}")
+            self.error = None
+
+    def remove(self):
+        """
+        Waits for any checkpoint being written and removes the checkpoint file.
+        """
+        self.wait()
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+
+def get_file_identity(path):
+    """
+    Identifies the contents of a file by its size and modification time.
+    :param path: File path
+    :return: List of [size in bytes, modification time in nanoseconds]
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def capture_checkpoint(
+    accounts, merged_bank_account_transactions_file, line_number, offset
+):
+    """
+    Captures the state of a run after a transaction record.
+    :param accounts: BankAccounts object
+    :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
+    :param line_number: Line number of the last processed record
+    :param offset: Byte offset just past the last processed record
+    :return: Checkpoint state
+    """
+    rejections = accounts.rejections
+    rejects_offset = None
+    if rejections.file is not None:
+        rejections.flush()
+        rejections.file.flush()
+        rejects_offset = rejections.file.tell()
+
+    source_master_file = accounts.source_master_file
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "transactions_file": merged_bank_account_transactions_file,
+        "transactions_identity": get_file_identity(
+            merged_bank_account_transactions_file
+        ),
+        "line_number": line_number,
+        "offset": offset,
+        "source_master_file": source_master_file,
+        "source_master_identity": (
+            None
+            if source_master_file is None
+            else get_file_identity(source_master_file)
+        ),
+        "dirty_account_numbers": list(accounts.dirty_account_numbers),
+        "rejection_counts": dict(rejections.counts),
+        "rejects_offset": rejects_offset,
+    }
+    account_rows = [
+        (
+            account_number,
+            account.holder_name,
+            account.status,
+            account.balance,
+            account.num_transactions,
+            account.plan,
+        )
+        for account_number, account in accounts.accounts.items()
+    ]
+    return header, account_rows
+
+
+def write_checkpoint(checkpoint_file, state):
+    """
+    Writes a checkpoint file atomically.
+    :param checkpoint_file: Checkpoint file path
+    :param state: Checkpoint state from capture_checkpoint
+    """
+    header, account_rows = state
+    with atomic_output_files(checkpoint_file) as (file,):
+        file.write(json.dumps(header) + "\n")
+        # One block of accounts at a time, so the processing thread gets the GIL back.
+        for start in range(0, len(account_rows), CHECKPOINT_WRITE_ACCOUNTS):
+            block = account_rows[start : start + CHECKPOINT_WRITE_ACCOUNTS]
+            file.write("".join(map(format_account_row, block)))
+
+
+def format_account_row(account_row):
+    """
+    Formats an account as a JSON line. Formatted by hand, since json.dumps costs
+    several times more per account.
+    :param account_row: Tuple of account number and account fields
+    :return: JSON line
+    """
+    account_number, holder_name, status, balance, num_transactions, plan = account_row
+    return (
+        f"[{encode_basestring_ascii(account_number)},"
+        f"{encode_basestring_ascii(holder_name)},{encode_basestring_ascii(status)},"
+        f"{balance},{num_transactions},{encode_basestring_ascii(plan)}]\n"
+    )
+
+
+def read_checkpoint(checkpoint_file):
+    """
+    Reads a checkpoint file.
+    :param checkpoint_file: Checkpoint file path
+    :return: Checkpoint state
+    """
+    with open(checkpoint_file, "r") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint file: {checkpoint_file}")
+        account_rows = [json.loads(line) for line in file]
+    return header, account_rows
+
+
+def restore_checkpoint(accounts, merged_bank_account_transactions_file, state):
+    """
+    Restores the account state of a checkpoint.
+    :param accounts: BankAccounts object to restore into
+    :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
+    :param state: Checkpoint state from read_checkpoint
+    :return: Tuple of (line number, byte offset) of the last processed record
+    """
+    header, account_rows = state
+    if header["transactions_identity"] != get_file_identity(
+        merged_bank_account_transactions_file
+    ):
+        raise ValueError(
+            f"The checkpoint was taken from a different version of "
+            f"{merged_bank_account_transactions_file}."
+        )
+
+    # The transfer index is rebuilt from the restored accounts when first needed.
+    accounts.accounts = {
+        account_number: Account(holder_name, status, balance, num_transactions, plan)
+        for account_number, holder_name, status, balance, num_transactions, plan in (
+            account_rows
+        )
+    }
+    accounts.dirty_account_numbers = set(header["dirty_account_numbers"])
+    accounts.rejections.counts = Counter(header["rejection_counts"])
+
+    # Unmodified records can only be copied from a master file that is unchanged.
+    source_master_file = header["source_master_file"]
+    if source_master_file is not None and (
+        not os.path.exists(source_master_file)
+        or header["source_master_identity"] != get_file_identity(source_master_file)
+    ):
+        source_master_file = None
+    accounts.source_master_file = source_master_file
+
+    return header["line_number"], header["offset"]
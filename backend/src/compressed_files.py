@@ -0,0 +1,152 @@
+"""
+Transparent compression of input and output files.
+
+A path ending in '.gz', '.xz' or '.bz2' is read or written through gzip, LZMA or
+bzip2, streaming, so compressed master and transaction files never have to be
+decompressed to disk first. Any other path is a plain file.
+
+Compressed files are read from and written to disk in large blocks, rather than in
+the 8KB blocks the compression modules use by default, so that slow or network-mounted
+storage sees few large requests.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+
+COMPRESSED_BUFFER_BYTES = 1024 * 1024
+GZIP_COMPRESS_LEVEL = 6
+
+
+class CompressedFileReader(io.BufferedReader):
+    """
+    Buffered reader of a decompressed stream that also closes the compressed file.
+    """
+
+    def __init__(self, file, stream):
+        """
+        Constructs a CompressedFileReader object.
+        :param file: Compressed binary file object
+        :param stream: Decompressed stream read from the file
+        """
+        super().__init__(stream, buffer_size=COMPRESSED_BUFFER_BYTES)
+        self.compressed_file = file
+
+    def close(self):
+        """
+        Closes the decompressed stream and the compressed file.
+        """
+        try:
+            super().close()
+        finally:
+            self.compressed_file.close()
+
+
+def open_gzip(file, mode, name):
+    """
+    Opens a gzip stream. A written stream records no timestamp, so equal contents
+    always compress to equal files.
+    :param file: Underlying binary file object
+    :param mode: 'rb' or 'wb'
+    :param name: File name recorded in the header of a written stream, or None
+    :return: Binary gzip file object
+    """
+    return gzip.GzipFile(
+        filename=name,
+        mode=mode,
+        compresslevel=GZIP_COMPRESS_LEVEL,
+        fileobj=file,
+        mtime=0,
+    )
+
+
+def open_lzma(file, mode, name):
+    """
+    Opens an xz stream.
+    :param file: Underlying binary file object
+    :param mode: 'rb' or 'wb'
+    :param name: Unused
+    :return: Binary LZMA file object
+    """
+    return lzma.LZMAFile(file, mode)
+
+
+def open_bz2(file, mode, name):
+    """
+    Opens a bzip2 stream.
+    :param file: Underlying binary file object
+    :param mode: 'rb' or 'wb'
+    :param name: Unused
+    :return: Binary bzip2 file object
+    """
+    return bz2.BZ2File(file, mode)
+
+
+COMPRESSORS = {
+    ".gz": open_gzip,
+    ".xz": open_lzma,
+    ".bz2": open_bz2,
+}
+
+
+def get_compressor(path):
+    """
+    Provides the compressor of a file path, detected by its extension.
+    :param path: File path
+    :return: Function that opens a compressed stream, or None for a plain file
+    """
+    return COMPRESSORS.get(os.path.splitext(path)[1].lower())
+
+
+def is_compressed(path):
+    """
+    Checks whether a file path names a compressed file.
+    :param path: File path
+    :return: True if the file is compressed, False otherwise
+    """
+    return get_compressor(path) is not None
+
+
+def open_file(path, mode="r", buffering=-1, newline=None):
+    """
+    Opens a file for reading, decompressing it if its extension says it is compressed.
+    :param path: File path
+    :param mode: 'r' or 'rb'
+    :param buffering: Read buffer size in bytes of a plain file, or -1 for the default
+    :param newline: Newline mode of a text file, as for open()
+    :return: Readable file object
+    """
+    compressor = get_compressor(path)
+    if compressor is None:
+        return open(path, mode, buffering=buffering, newline=newline)
+
+    file = open(path, "rb", buffering=COMPRESSED_BUFFER_BYTES)
+    try:
+        stream = CompressedFileReader(file, compressor(file, "rb", None))
+    except BaseException:
+        file.close()
+        raise
+    if "b" in mode:
+        return stream
+    return io.TextIOWrapper(stream, newline=newline)
+
+
+def wrap_output_file(file, path, binary=False):
+    """
+    Wraps an open binary output file in the compressed stream named by the extension
+    of its final path. Closing the returned stream finishes the compressed data but
+    leaves the underlying file open, so that it can still be synced.
+    :param file: Binary file object, opened for writing
+    :param path: Final file path with a compressed extension
+    :param binary: Whether the returned stream is binary rather than text
+    :return: Writable file object
+    """
+    stream = io.BufferedWriter(
+        get_compressor(path)(file, "wb", os.path.basename(path)),
+        buffer_size=COMPRESSED_BUFFER_BYTES,
+    )
+    if binary:
+        return stream
+    return io.TextIOWrapper(stream)
@@ -0,0 +1,108 @@
+"""
+Journal Recovery
+
+Rebuilds the accounts of an interrupted backend run from the old 'master bank accounts'
+file and the write-ahead journal of that run, and writes them out as the new
+'master bank accounts' and 'current bank accounts' files.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/src': cd backend/src
+3. Run this file:
+   python journal_recovery.py <master_bank_accounts_file> <journal_file>
+   <new_master_bank_accounts_file> <current_bank_accounts_file> [--binary-master]
+
+With --binary-master, the old and new master files are in the binary format of
+binary_master_file.py, as written by a backend run with --binary-master.
+"""
+
+from account import Account
+from account_file_writer import AccountFileWriter
+from bank_accounts import BankAccounts
+from transaction_journal import DELETE_ACCOUNT
+import argparse
+import sys
+
+
+def recover_accounts(master_bank_accounts_file, journal_file, binary=False):
+    """
+    Rebuilds accounts from the old master file and the journal.
+    An incomplete last entry, left by a crash during a commit, is ignored.
+    :param master_bank_accounts_file: Old 'master bank accounts' file path
+    :param journal_file: Journal file path
+    :param binary: Whether the old master file is a binary master file
+    :return: Tuple of (BankAccounts object, line number of the last journaled
+             transaction record, number of entries replayed)
+    """
+    accounts = BankAccounts()
+    accounts.load_accounts(master_bank_accounts_file, binary=binary)
+    last_line_number = 0
+    num_entries = 0
+
+    with open(journal_file, "r") as file:
+        for entry in file:
+            if not entry.endswith("\n"):
+                break
+
+            fields = entry[:-1].split("\t", 7)
+            line_number, operation, account_number = fields[:3]
+            if operation == DELETE_ACCOUNT:
+                if account_number in accounts.accounts:
+                    accounts.remove_account(account_number)
+            else:
+                status, balance, num_transactions, plan, holder_name = fields[3:]
+                account = accounts.accounts.get(account_number)
+                if account is None or account.holder_name != holder_name:
+                    account = Account(holder_name, status, 0, 0)
+                    accounts.add_account(account_number, account)
+                account.status = sys.intern(status)
+                account.balance = int(balance)
+                account.num_transactions = int(num_transactions)
+                account.plan = sys.intern(plan)
+
+            accounts.mark_dirty(account_number)
+            last_line_number = max(last_line_number, int(line_number))
+            num_entries += 1
+
+    return accounts, last_line_number, num_entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuilds accounts from the master file and a journal."
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("journal_file")
+    parser.add_argument("new_master_bank_accounts_file")
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    arguments = parser.parse_args()
+
+    accounts, last_line_number, num_entries = recover_accounts(
+        arguments.master_bank_accounts_file,
+        arguments.journal_file,
+        arguments.binary_master,
+    )
+    writer = AccountFileWriter()
+    if arguments.binary_master:
+        writer.write_binary_account_files(
+            accounts.get_all_accounts(),
+            arguments.new_master_bank_accounts_file,
+            arguments.current_bank_accounts_file,
+        )
+    else:
+        writer.write_new_account_files(
+            accounts.get_all_accounts(),
+            arguments.new_master_bank_accounts_file,
+            arguments.current_bank_accounts_file,
+            accounts.source_master_file,
+            accounts.dirty_account_numbers,
+        )
+    print(
+        f"Replayed {num_entries} journal entries, "
+        f"up to transaction record line {last_line_number}."
+    )
@@ -0,0 +1,47 @@
+"""
+Fixed-point money helpers.
+
+Monetary amounts are represented as integer cents throughout the backend,
+so parsing, fees, comparisons and formatting never go through float or Decimal.
+"""
+
+STUDENT_PLAN_FEE = 5
+NON_STUDENT_PLAN_FEE = 10
+
+
+def parse_cents(amount):
+    """
+    Parses an amount string with up to two decimal places into integer cents.
+    :param amount: Amount string, such as '00100.00'
+    :return: Amount in cents
+    """
+    if len(amount) == 8 and amount[5] == "." and amount[7] != " ":
+        return int(amount.replace(".", ""))
+
+    amount = amount.strip()
+    if not amount:
+        return 0
+
+    sign = 1
+    if amount[0] in "+-":
+        if amount[0] == "-":
+            sign = -1
+        amount = amount[1:]
+
+    whole, _, fraction = amount.partition(".")
+    return sign * (int(whole or "0") * 100 + int((fraction + "00")[:2]))
+
+
+def format_cents(cents, width=8):
+    """
+    Formats integer cents as a zero-padded amount string with two decimal places.
+    :param cents: Amount in cents
+    :param width: Minimum width of the formatted amount
+    :return: Formatted amount, such as '00100.00'
+    """
+    if cents < 0:
+        whole, fraction = divmod(-cents, 100)
+        return f"-{whole}.{fraction:02d}".zfill(width)
+
+    whole, fraction = divmod(cents, 100)
+    return f"{whole}.{fraction:02d}".zfill(width)
@@ -0,0 +1,233 @@
+"""
+Multi-Day Banking System Backend
+
+Applies an ordered list of daily 'merged bank account transactions' files to the
+accounts of one 'master bank accounts' file, as if the backend had been run once per
+day with each day's new master file as the next day's master file. The accounts stay
+in memory between days, so the intermediate master files are never written and read
+back; they are only written for the days that are asked for.
+
+Between days, the accounts are put in the state that reading the day's new master
+file would have given: in account number order, which decides the destination of a
+transfer, and back on the default plan, which the master file does not record. The
+outputs are therefore the same as those of one backend run per day.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/src': cd backend/src
+3. Run this file:
+   python multi_day_backend.py <master_bank_accounts_file>
+   <new_master_bank_accounts_file> <current_bank_accounts_file>
+   <merged_bank_account_transactions_file> [<merged_bank_account_transactions_file> ...]
+   [options]
+
+Options:
+- --day-output-dir DIR: Also writes the new master and current bank accounts files
+  of each day to DIR, as day_<N>_new_master_bank_accounts.txt and
+  day_<N>_current_bank_accounts.txt.
+- --write-days N,N,...: Only writes the files of these days (numbered from 1) to the
+  day output directory.
+- --workers N, --vectorized, --binary-master, --metrics: As for
+  banking_system_backend.py.
+
+Checkpoints and the journal are not supported across several days.
+"""
+
+from account import STUDENT_PLAN
+from banking_system_backend import BankingSystemBackend
+import argparse
+import os
+
+
+class MultiDayBackend(BankingSystemBackend):
+    """
+    Runs the backend over several days of transactions, keeping the accounts resident.
+    """
+
+    def __init__(
+        self,
+        master_bank_accounts_file,
+        merged_bank_account_transactions_files,
+        new_master_bank_accounts_file,
+        current_bank_accounts_file,
+        day_output_dir=None,
+        write_days=None,
+        **options,
+    ):
+        """
+        Constructs a MultiDayBackend object.
+        :param master_bank_accounts_file: 'Master bank accounts' file path
+        :param merged_bank_account_transactions_files: 'Merged bank account
+                                                       transactions' file paths, in
+                                                       day order
+        :param new_master_bank_accounts_file: 'New master bank accounts' file path,
+                                              written after the last day
+        :param current_bank_accounts_file: 'Current bank accounts' file path, written
+                                           after the last day
+        :param day_output_dir: Directory to write the files of each day to, or None
+        :param write_days: Set of day numbers, counted from 1, whose files are written
+                           to the day output directory, or None for every day
+        :param options: Other BankingSystemBackend options
+        """
+        super().__init__(
+            master_bank_accounts_file,
+            merged_bank_account_transactions_files[0],
+            new_master_bank_accounts_file,
+            current_bank_accounts_file,
+            **options,
+        )
+        if self.checkpointer is not None:
+            raise ValueError("Checkpoints cannot be resumed across several days.")
+        if self.journal_file is not None:
+            raise ValueError("Journals are not kept across several days.")
+        self.merged_bank_account_transactions_files = (
+            merged_bank_account_transactions_files
+        )
+        self.day_output_dir = day_output_dir
+        self.write_days = write_days
+
+    def run(self):
+        """
+        Runs backend jobs for every day.
+        """
+        self.open_rejection_log()
+        self.load_accounts()
+
+        try:
+            for day, merged_bank_account_transactions_file in enumerate(
+                self.merged_bank_account_transactions_files, 1
+            ):
+                print(f"Day {day}: {merged_bank_account_transactions_file}")
+                if day > 1:
+                    self.start_next_day()
+                self.merged_bank_account_transactions_file = (
+                    merged_bank_account_transactions_file
+                )
+                self.process_transactions()
+                if self.is_day_written(day):
+                    self.write_new_account_files(*self.get_day_output_files(day))
+        finally:
+            self.accounts.rejections.close()
+        self.write_new_account_files()
+
+        self.print_summary()
+
+    def start_next_day(self):
+        """
+        Puts the accounts in the state that reading the new master file of the
+        previous day would have given.
+        """
+        self.accounts.accounts = dict(sorted(self.accounts.accounts.items()))
+        for account in self.accounts.accounts.values():
+            account.plan = STUDENT_PLAN
+
+    def is_day_written(self, day):
+        """
+        Checks whether the files of a day are written to the day output directory.
+        :param day: Day number, counted from 1
+        :return: True if the files of the day are written, False otherwise
+        """
+        return self.day_output_dir is not None and (
+            self.write_days is None or day in self.write_days
+        )
+
+    def get_day_output_files(self, day):
+        """
+        Provides the output file paths of a day.
+        :param day: Day number, counted from 1
+        :return: Tuple of ('new master bank accounts' file path, 'current bank
+                 accounts' file path)
+        """
+        extension = "bin" if self.binary_master else "txt"
+        return (
+            os.path.join(
+                self.day_output_dir, f"day_{day}_new_master_bank_accounts.{extension}"
+            ),
+            os.path.join(self.day_output_dir, f"day_{day}_current_bank_accounts.txt"),
+        )
+
+
+def parse_day_numbers(text):
+    """
+    Parses a list of day numbers.
+    :param text: Comma-separated day numbers, such as '1,3,7'
+    :return: Set of day numbers
+    """
+    days = {int(day) for day in text.split(",")}
+    if min(days) < 1:
+        raise ValueError("Days are numbered from 1.")
+    return days
+
+
+def parse_arguments():
+    """
+    Parses the command-line arguments.
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the banking system back-end over several days.",
+        usage="python multi_day_backend.py "
+        "<master_bank_accounts_file> "
+        "<new_master_bank_accounts_file> "
+        "<current_bank_accounts_file> "
+        "<merged_bank_account_transactions_file> "
+        "[<merged_bank_account_transactions_file> ...] [options]",
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("new_master_bank_accounts_file")
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument("merged_bank_account_transactions_files", nargs="+")
+    parser.add_argument(
+        "--day-output-dir",
+        help="directory to also write the account files of each day to",
+    )
+    parser.add_argument(
+        "--write-days",
+        type=parse_day_numbers,
+        help="comma-separated days whose account files are written (default: all)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes used to parse the master file",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="apply deposits, withdrawals and bill payments in NumPy batches",
+    )
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print per-transaction-code counts, timings and latency histograms",
+    )
+    arguments = parser.parse_args()
+    if arguments.write_days is not None and arguments.day_output_dir is None:
+        parser.error("--write-days requires --day-output-dir")
+    return arguments
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    if arguments.day_output_dir is not None:
+        os.makedirs(arguments.day_output_dir, exist_ok=True)
+
+    backend = MultiDayBackend(
+        arguments.master_bank_accounts_file,
+        arguments.merged_bank_account_transactions_files,
+        arguments.new_master_bank_accounts_file,
+        arguments.current_bank_accounts_file,
+        day_output_dir=arguments.day_output_dir,
+        write_days=arguments.write_days,
+        workers=arguments.workers,
+        vectorized=arguments.vectorized,
+        binary_master=arguments.binary_master,
+        metrics=arguments.metrics,
+    )
+    backend.run()
@@ -0,0 +1,144 @@
+"""
+Parallel loading of fixed-width record files.
+
+The 'master bank accounts' file consists of newline-terminated records. It is
+memory-mapped, split into byte ranges that end on record boundaries, and the ranges
+are parsed by a pool of worker processes. Results are always returned in file order.
+Even the largest master file only takes a few megabytes, so the ranges are sized from
+the file size, to give every worker several of them.
+
+The 'merged bank account transactions' file is always read serially. Its records are
+decoded as they are applied, and handing decoded records back from worker processes
+costs nearly as much as decoding them.
+"""
+
+from account_record_parser import AccountRecordParser
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import mmap
+import os
+
+MIN_CHUNK_BYTES = 64 * 1024
+CHUNKS_PER_WORKER = 4
+
+
+def size_chunks(file_path, workers):
+    """
+    Determines the chunk size that splits a file into several chunks per worker.
+    :param file_path: File path
+    :param workers: Number of worker processes
+    :return: Target size of each chunk in bytes
+    """
+    file_size = os.path.getsize(file_path)
+    return max(MIN_CHUNK_BYTES, file_size // (workers * CHUNKS_PER_WORKER))
+
+
+def find_chunk_boundaries(file_path, chunk_bytes):
+    """
+    Splits a file into byte ranges of roughly chunk_bytes that end on record boundaries.
+    :param file_path: File path
+    :param chunk_bytes: Target size of each range in bytes
+    :return: List of (start, end) byte offsets
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return []
+
+    boundaries = []
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            start = 0
+            while start < file_size:
+                end = mapped_file.find(b"\n", min(start + chunk_bytes, file_size) - 1)
+                end = file_size if end == -1 else end + 1
+                boundaries.append((start, end))
+                start = end
+
+    return boundaries
+
+
+def read_chunk_lines(file_path, start, end):
+    """
+    Reads the records in a byte range of a memory-mapped file.
+    :param file_path: File path
+    :param start: Start byte offset
+    :param end: End byte offset
+    :return: List of records without line terminators
+    """
+    # Lines are split on '\n' only and lose a trailing '\r', as in serial reading.
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            lines = mapped_file[start:end].split(b"\n")
+
+    if lines and not lines[-1]:
+        lines.pop()
+
+    return [line.rstrip(b"\r").decode() for line in lines]
+
+
+def parse_master_chunk(file_path, start, end):
+    """
+    Parses the account records in a byte range of the 'master bank accounts' file.
+    Parsing stops at the END_OF_FILE record.
+    :param file_path: 'Master bank accounts' file path
+    :param start: Start byte offset
+    :param end: End byte offset
+    :return: Tuple of (parsed account records, whether END_OF_FILE was reached)
+    """
+    parser = AccountRecordParser()
+    account_records = []
+    for record in read_chunk_lines(file_path, start, end):
+        account_record = parser.parse_account_record(record)
+        if account_record[1] == "END OF FILE":
+            return account_records, True
+        account_records.append(account_record)
+
+    return account_records, False
+
+
+def iter_chunk_results(parse_chunk, file_path, workers, chunk_bytes=None):
+    """
+    Parses a file in chunks across a process pool and yields the results in file order.
+    At most two chunks per worker are in flight, which bounds memory use.
+    :param parse_chunk: Module-level function that parses one byte range
+    :param file_path: File path
+    :param workers: Number of worker processes
+    :param chunk_bytes: Target size of each chunk in bytes, or None to size the chunks
+                        from the file size
+    :return: Generator of chunk results
+    """
+    if chunk_bytes is None:
+        chunk_bytes = size_chunks(file_path, workers)
+    boundaries = deque(find_chunk_boundaries(file_path, chunk_bytes))
+    if not boundaries:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            while boundaries or pending:
+                while boundaries and len(pending) < workers * 2:
+                    start, end = boundaries.popleft()
+                    pending.append(executor.submit(parse_chunk, file_path, start, end))
+
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def load_master_records(master_bank_accounts_file, workers, chunk_bytes=None):
+    """
+    Parses the 'master bank accounts' file in parallel.
+    :param master_bank_accounts_file: 'Master bank accounts' file path
+    :param workers: Number of worker processes
+    :param chunk_bytes: Target size of each chunk in bytes, or None to size the chunks
+                        from the file size
+    :return: Generator of parsed account records, in file order
+    """
+    for account_records, reached_end_of_file in iter_chunk_results(
+        parse_master_chunk, master_bank_accounts_file, workers, chunk_bytes
+    ):
+        yield from account_records
+        if reached_end_of_file:
+            return
@@ -0,0 +1,129 @@
+"""
+Pipelined reading of transaction records.
+
+A background thread reads the 'merged bank account transactions' file, decodes the
+records and hands them over in batches through a bounded queue, while the caller
+applies the previous batches. While the reader thread waits for the file, as it does
+on network-mounted storage, the GIL is released and the caller keeps applying
+transactions, so the time of a run tends to the larger of the read time and the apply
+time rather than their sum.
+
+The queue holds at most a fixed number of batches. A reader that gets ahead of the
+caller blocks on the full queue, so memory stays bounded however large the file is.
+An error in the reader thread is handed over in order, after the batches read before
+it, and raised in the caller. A caller that stops early stops the reader thread.
+"""
+
+from transaction_record_parser import TransactionRecordParser
+import queue
+import threading
+
+PIPELINE_BATCH_RECORDS = 1024
+PIPELINE_QUEUE_BATCHES = 8
+# Number of seconds between checks of whether the caller stopped, while the queue is full
+PIPELINE_PUT_TIMEOUT = 0.1
+
+
+class PipelinedTransactionReader:
+    """
+    Reads and decodes transaction records on a background thread.
+    """
+
+    def __init__(
+        self,
+        reader,
+        decode=True,
+        batch_records=PIPELINE_BATCH_RECORDS,
+        queue_batches=PIPELINE_QUEUE_BATCHES,
+    ):
+        """
+        Constructs a PipelinedTransactionReader object.
+        :param reader: TransactionFileReader object
+        :param decode: Whether to decode the records on the reader thread
+        :param batch_records: Number of records per batch
+        :param queue_batches: Maximum number of batches waiting in the queue
+        """
+        self.reader = reader
+        self.decode = decode
+        self.batch_records = batch_records
+        self.queue_batches = queue_batches
+
+    def iter_batches(self):
+        """
+        Yields batches of transaction records as the reader thread provides them.
+        End-of-session records are skipped.
+        :return: Generator of lists of (line number, transaction record, decoded
+                 transaction record, or None if records are not decoded)
+        """
+        batches = queue.Queue(self.queue_batches)
+        stopped = threading.Event()
+        thread = threading.Thread(
+            target=self.read_batches, args=(batches, stopped), daemon=True
+        )
+        thread.start()
+        try:
+            while True:
+                batch, error = batches.get()
+                if error is not None:
+                    raise error
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            stopped.set()
+            thread.join()
+
+    def read_batches(self, batches, stopped):
+        """
+        Reads and decodes batches of transaction records. Runs on the reader thread.
+        :param batches: Queue to put (batch, None), then (None, None) at the end of
+                        the file, or (None, error) if reading fails
+        :param stopped: Event set once the caller stops taking batches
+        """
+        decode_transaction_record = None
+        if self.decode:
+            decode_transaction_record = (
+                TransactionRecordParser().decode_transaction_record
+            )
+        batch = []
+        try:
+            for (
+                line_number,
+                transaction_record,
+            ) in self.reader.iter_numbered_transaction_records():
+                if transaction_record.startswith("00"):
+                    continue
+
+                transaction = None
+                if decode_transaction_record is not None:
+                    transaction = decode_transaction_record(transaction_record)
+                batch.append((line_number, transaction_record, transaction))
+                if len(batch) >= self.batch_records:
+                    if not self.put(batches, (batch, None), stopped):
+                        return
+                    batch = []
+
+            if batch and not self.put(batches, (batch, None), stopped):
+                return
+            self.put(batches, (None, None), stopped)
+        except Exception as error:
+            # The records read before the error are applied before it is raised.
+            if batch and not self.put(batches, (batch, None), stopped):
+                return
+            self.put(batches, (None, error), stopped)
+
+    def put(self, batches, item, stopped):
+        """
+        Puts an item on the queue, waiting while it is full unless the caller stopped.
+        :param batches: Queue of batches
+        :param item: Item to put
+        :param stopped: Event set once the caller stops taking batches
+        :return: True if the item was put, False if the caller stopped
+        """
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=PIPELINE_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
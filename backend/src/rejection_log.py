@@ -0,0 +1,101 @@
+"""
+Rejection log for transactions that fail validation.
+
+By default every rejection is printed to the console as soon as it happens. Given a
+rejects file, rejections are instead written to it as JSON lines in buffered batches,
+and the console only gets a summary of the per-reason counts at the end of the run.
+"""
+
+from collections import Counter
+from json.encoder import encode_basestring_ascii
+import os
+
+REJECTS_BATCH_SIZE = 4096
+
+# Reason codes
+ACCOUNT_NOT_FOUND = "ACCOUNT_NOT_FOUND"
+ACCOUNT_DISABLED = "ACCOUNT_DISABLED"
+INSUFFICIENT_FUNDS = "INSUFFICIENT_FUNDS"
+SOURCE_ACCOUNT_NOT_FOUND = "SOURCE_ACCOUNT_NOT_FOUND"
+DESTINATION_ACCOUNT_NOT_FOUND = "DESTINATION_ACCOUNT_NOT_FOUND"
+ACCOUNT_ALREADY_EXISTS = "ACCOUNT_ALREADY_EXISTS"
+
+
+class RejectionLog:
+    """
+    Records rejected transactions and counts them by reason.
+    The caller sets line_number and record to the transaction record being processed,
+    so that each rejection can be traced back to the input file.
+    """
+
+    def __init__(self, rejects_file=None, resume_offset=None):
+        """
+        Constructs a RejectionLog object.
+        :param rejects_file: Rejects file path, or None to print rejections instead
+        :param resume_offset: Size of the rejects file at the checkpoint being resumed
+                              from, or None to start a new rejects file
+        """
+        self.rejects_file = rejects_file
+        self.line_number = None
+        self.record = None
+        self.counts = Counter()
+        self.num_rejected = 0
+        self.pending_entries = []
+        self.file = None
+        if rejects_file is not None and resume_offset is not None:
+            # Rejections logged after the checkpoint are logged again when resuming.
+            os.truncate(rejects_file, resume_offset)
+            self.file = open(rejects_file, "a")
+        elif rejects_file is not None:
+            self.file = open(rejects_file, "w")
+
+    def reject(self, reason, message):
+        """
+        Records a rejection of the current transaction record.
+        :param reason: Reason code
+        :param message: Human-readable error message
+        """
+        self.counts[reason] += 1
+        self.num_rejected += 1
+        if self.file is None:
+            print(message)
+            return
+
+        # Formatted by hand: json.dumps of a dict costs several times more per entry.
+        line_number = "null" if self.line_number is None else self.line_number
+        record = "null" if self.record is None else encode_basestring_ascii(self.record)
+        self.pending_entries.append(
+            f'{{"line": {line_number}, "record": {record}, "reason": "{reason}", '
+            f'"message": {encode_basestring_ascii(message)}}}'
+        )
+        if len(self.pending_entries) >= REJECTS_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending rejections to the rejects file in one batch.
+        """
+        if self.pending_entries:
+            self.file.write("\n".join(self.pending_entries) + "\n")
+            self.pending_entries = []
+
+    def close(self):
+        """
+        Writes any pending rejections and closes the rejects file.
+        """
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def summary(self):
+        """
+        Summarizes the rejections by reason.
+        :return: Summary lines
+        """
+        lines = [f"{sum(self.counts.values())} transaction(s) rejected."]
+        for reason, count in sorted(self.counts.items()):
+            lines.append(f"  {reason}: {count}")
+        if self.rejects_file is not None:
+            lines.append(f"Rejected transactions written to {self.rejects_file}.")
+        return lines
@@ -0,0 +1,136 @@
+"""
+Merging of session transaction files.
+
+Each frontend session writes its own 'bank account transactions' file, numbered in the
+order the sessions ran and ending in an end-of-session record. The merger reads the
+session files one after another, in session order, as a single stream of transaction
+records, so that the backend can apply them without a merged file being written and
+read back first.
+
+Session files are ordered by the numbers in their names rather than lexically, so
+session_10.txt comes after session_2.txt. The end-of-session records, which the
+backend skips anyway, are dropped, except for the last one, which still ends the
+merged stream. The merged stream can also be written to a file for audit. That file
+is published atomically once the last session file has been read.
+"""
+
+from atomic_file_writer import atomic_output_files
+from compressed_files import open_file
+from transaction_file_reader import DEFAULT_READ_AHEAD_BYTES
+import glob
+import os
+import re
+
+SESSION_FILE_PATTERN = "session_*.txt"
+END_OF_SESSION_CODE = "00"
+
+
+def natural_sort_key(path):
+    """
+    Provides a sort key that orders file names by the numbers in them, so that
+    session_2.txt comes before session_10.txt.
+    :param path: File path
+    :return: Sort key
+    """
+    # Splitting on digit runs puts the numbers at the odd indices.
+    parts = re.split(r"(\d+)", os.path.basename(path))
+    return [int(part) if index % 2 else part for index, part in enumerate(parts)], path
+
+
+def find_session_files(paths, pattern=SESSION_FILE_PATTERN):
+    """
+    Finds session files and puts them in session order.
+    :param paths: Session file paths, or directories whose files matching the pattern
+                  are session files
+    :param pattern: File name pattern of the session files in a directory
+    :return: List of session file paths, in session order
+    """
+    session_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            session_files.extend(glob.glob(os.path.join(path, pattern)))
+        else:
+            session_files.append(path)
+    return sorted(session_files, key=natural_sort_key)
+
+
+class SessionFileMerger:
+    """
+    Reads the transaction records of several session files as one merged stream.
+    """
+
+    def __init__(
+        self,
+        session_files,
+        merged_file=None,
+        read_ahead_bytes=DEFAULT_READ_AHEAD_BYTES,
+    ):
+        """
+        Constructs a SessionFileMerger object.
+        :param session_files: Session file paths, in session order
+        :param merged_file: 'Merged bank account transactions' file path to also
+                            write the merged stream to, or None
+        :param read_ahead_bytes: Maximum number of bytes buffered ahead of the
+                                 current record of each session file
+        """
+        self.session_files = session_files
+        self.merged_file = merged_file
+        self.read_ahead_bytes = read_ahead_bytes
+
+    def iter_transaction_records(self):
+        """
+        Lazily yields the merged transaction records.
+        :return: Generator of transaction records
+        """
+        for _, transaction_record in self.iter_numbered_transaction_records():
+            yield transaction_record
+
+    def iter_numbered_transaction_records(self):
+        """
+        Lazily yields the merged transaction records with their line numbers in the
+        merged stream. If the merged stream is also written to a file, the file is
+        only published once every record has been yielded.
+        :return: Generator of (line number, transaction record)
+        """
+        if self.merged_file is None:
+            yield from self.iter_merged_records(None)
+            return
+
+        with atomic_output_files(self.merged_file) as (file,):
+            yield from self.iter_merged_records(file)
+
+    def iter_merged_records(self, merged_file):
+        """
+        Yields the records of the session files in order, dropping blank lines and
+        all end-of-session records but the last.
+        :param merged_file: Writable file object to copy the records to, or None
+        :return: Generator of (line number, transaction record)
+        """
+        line_number = 0
+        end_of_session_record = None
+        for session_file in self.session_files:
+            with open_file(session_file, "r", buffering=self.read_ahead_bytes) as file:
+                for line in file:
+                    line = line.rstrip("\n")
+                    if not line:
+                        continue
+                    if line.startswith(END_OF_SESSION_CODE):
+                        end_of_session_record = line
+                        continue
+
+                    line_number += 1
+                    if merged_file is not None:
+                        merged_file.write(line + "\n")
+                    yield line_number, line
+
+        if end_of_session_record is not None:
+            if merged_file is not None:
+                merged_file.write(end_of_session_record + "\n")
+            yield line_number + 1, end_of_session_record
+
+    def read_transaction_records(self):
+        """
+        Reads all merged transaction records.
+        :return: List of all transaction records
+        """
+        return list(self.iter_transaction_records())
@@ -0,0 +1,152 @@
+"""
+Session Merge Banking System Backend
+
+Runs the backend directly over the 'bank account transactions' files of the day's
+frontend sessions. The session files are merged as they are read, in session order,
+instead of being concatenated into a 'merged bank account transactions' file first.
+The merged file can still be written for audit, alongside the run.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/src': cd backend/src
+3. Run this file:
+   python session_merge_backend.py <master_bank_accounts_file>
+   <new_master_bank_accounts_file> <current_bank_accounts_file>
+   <session_file_or_directory> [<session_file_or_directory> ...] [options]
+
+A directory stands for its session_*.txt files. Session files are applied in the order
+of the numbers in their names, so session_10.txt comes after session_2.txt.
+
+Options:
+- --merged-file PATH: Also writes the merged transaction records to PATH.
+- --workers N, --vectorized, --rejects-file PATH, --binary-master, --metrics,
+  --pipelined: As for banking_system_backend.py.
+"""
+
+from banking_system_backend import BankingSystemBackend
+from session_file_merger import SessionFileMerger, find_session_files
+import argparse
+
+
+class SessionMergeBackend(BankingSystemBackend):
+    """
+    Runs the backend over session files merged on the fly.
+    """
+
+    def __init__(
+        self,
+        master_bank_accounts_file,
+        session_files,
+        new_master_bank_accounts_file,
+        current_bank_accounts_file,
+        merged_file=None,
+        **options,
+    ):
+        """
+        Constructs a SessionMergeBackend object.
+        :param master_bank_accounts_file: 'Master bank accounts' file path
+        :param session_files: Session 'bank account transactions' file paths, in
+                              session order
+        :param new_master_bank_accounts_file: 'New master bank accounts' file path
+        :param current_bank_accounts_file: 'Current bank accounts' file path
+        :param merged_file: 'Merged bank account transactions' file path to also
+                            write the merged records to, or None
+        :param options: Other BankingSystemBackend options
+        """
+        super().__init__(
+            master_bank_accounts_file,
+            merged_file,
+            new_master_bank_accounts_file,
+            current_bank_accounts_file,
+            **options,
+        )
+        if self.checkpointer is not None:
+            raise ValueError("Checkpoints need a merged transactions file to resume.")
+        self.session_files = session_files
+
+    def create_transaction_reader(self):
+        """
+        Creates the reader of the merged session records.
+        :return: SessionFileMerger object
+        """
+        return SessionFileMerger(
+            self.session_files, self.merged_bank_account_transactions_file
+        )
+
+
+def parse_arguments():
+    """
+    Parses the command-line arguments.
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the banking system back-end over the day's session files.",
+        usage="python session_merge_backend.py "
+        "<master_bank_accounts_file> "
+        "<new_master_bank_accounts_file> "
+        "<current_bank_accounts_file> "
+        "<session_file_or_directory> "
+        "[<session_file_or_directory> ...] [options]",
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("new_master_bank_accounts_file")
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument("session_paths", nargs="+")
+    parser.add_argument(
+        "--merged-file",
+        help="file to also write the merged transaction records to",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes used to parse the master file",
+    )
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="apply deposits, withdrawals and bill payments in NumPy batches",
+    )
+    parser.add_argument(
+        "--rejects-file",
+        help="file to write rejected transactions to, as JSON lines",
+    )
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print per-transaction-code counts, timings and latency histograms",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="read and decode transaction records on a background thread",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    session_files = find_session_files(arguments.session_paths)
+    if not session_files:
+        raise SystemExit("ERROR: No session files found.")
+    print(f"Merging {len(session_files)} session file(s).")
+
+    backend = SessionMergeBackend(
+        arguments.master_bank_accounts_file,
+        session_files,
+        arguments.new_master_bank_accounts_file,
+        arguments.current_bank_accounts_file,
+        merged_file=arguments.merged_file,
+        workers=arguments.workers,
+        vectorized=arguments.vectorized,
+        rejects_file=arguments.rejects_file,
+        binary_master=arguments.binary_master,
+        metrics=arguments.metrics,
+        pipelined=arguments.pipelined,
+    )
+    backend.run()
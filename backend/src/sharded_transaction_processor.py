@@ -0,0 +1,457 @@
+"""
+Account-sharded parallel transaction processing.
+
+Accounts are hash-partitioned across worker processes (shards). The coordinator
+reads transaction records in file order and routes each record to the shard that
+owns its account, so every shard applies its records in the same relative order as
+a serial replay.
+
+The coordinator keeps a directory of every account (holder name, status and the
+transfer index), but not balances. That is enough to replay creates, deletes and
+disables, and to resolve and validate transfer destinations, exactly as the serial
+TransactionExecutor would. Transfers between two shards use this protocol:
+1. The source shard receives a debit op. It checks funds, debits the source, and
+   posts the outcome to the destination shard's outcome queue.
+2. The destination shard receives a credit op. When it reaches it, it waits for the
+   outcome and credits the destination only if the debit succeeded.
+Every shard applies its ops in global record order, and a credit only ever waits for
+an earlier debit. No cycle of waits can form, and the final accounts are identical to
+a serial replay.
+
+Every op carries the position of its record in the input. The shards collect their
+rejections instead of logging them, and return them with their accounts. The
+coordinator then logs every rejection, its own included, in record order, so the
+console output and the rejects file match a serial run.
+"""
+
+from account import Account, DISABLED
+from bank_accounts import BankAccounts
+from transaction_processor import TransactionProcessor
+from transaction_record_parser import TransactionRecordParser
+from rejection_log import (
+    ACCOUNT_DISABLED,
+    DESTINATION_ACCOUNT_NOT_FOUND,
+    RejectionLog,
+)
+import multiprocessing
+import queue
+import zlib
+
+BATCH_SIZE = 512
+MAX_QUEUED_BATCHES = 64
+LIVENESS_CHECK_SECONDS = 1
+
+# Worker operations
+RECORD = "R"
+LOCAL_TRANSFER = "T"
+TRANSFER_DEBIT = "D"
+TRANSFER_CREDIT = "C"
+TRANSACTION_FEE = "F"
+
+
+def shard_of(account_number, num_shards):
+    """
+    Determines the shard that owns an account.
+    :param account_number: Account number
+    :param num_shards: Number of shards
+    :return: Shard index
+    """
+    return zlib.crc32(account_number.encode()) % num_shards
+
+
+class ShardRejectionLog(RejectionLog):
+    """
+    Collects the rejections of a shard, for the coordinator to log in record order.
+    The shard sets position to the position of the record being processed.
+    """
+
+    def __init__(self):
+        """
+        Constructs a ShardRejectionLog object.
+        """
+        super().__init__()
+        self.position = None
+        self.entries = []
+
+    def reject(self, reason, message):
+        """
+        Collects a rejection of the current transaction record.
+        :param reason: Reason code
+        :param message: Human-readable error message
+        """
+        self.entries.append(self.position + (reason, message))
+
+
+def run_shard(shard_index, shard_accounts, inbox, outcome_queues, result_queue):
+    """
+    Applies the operations routed to one shard.
+    Runs in a worker process until it receives the end-of-input sentinel.
+    :param shard_index: Shard index
+    :param shard_accounts: List of (account number, Account) owned by the shard
+    :param inbox: Queue of operation batches from the coordinator
+    :param outcome_queues: Outcome queue of every shard, for cross-shard transfers
+    :param result_queue: Queue for the final and modified accounts, the rejections and
+                         the error of the shard
+    """
+    accounts = BankAccounts()
+    for account_number, account in shard_accounts:
+        accounts.add_account(account_number, account)
+    rejections = ShardRejectionLog()
+    accounts.rejections = rejections
+
+    processor = TransactionProcessor(accounts)
+    executor = processor.executor
+    outcomes = {}
+    error = None
+    error_sequence = None
+
+    def wait_for_outcome(transfer_id):
+        """
+        Waits for the outcome of a cross-shard transfer debit.
+        :param transfer_id: Transfer identifier
+        :return: True if the source account was debited, False otherwise
+        """
+        while transfer_id not in outcomes:
+            posted_transfer_id, debited = outcome_queues[shard_index].get()
+            outcomes[posted_transfer_id] = debited
+        return outcomes.pop(transfer_id)
+
+    while True:
+        operations = inbox.get()
+        if operations is None:
+            break
+
+        for operation in operations:
+            if error is not None:
+                # Keep cross-shard transfers moving so that other shards never block.
+                if operation[0] == TRANSFER_DEBIT:
+                    outcome_queues[operation[5]].put((operation[4], False))
+                elif operation[0] == TRANSFER_CREDIT:
+                    wait_for_outcome(operation[4])
+                continue
+
+            rejections.position = operation[1]
+            try:
+                if operation[0] == RECORD:
+                    processor.process_decoded_transaction(operation[2])
+                elif operation[0] == LOCAL_TRANSFER:
+                    _, _, from_account_number, to_account_number, amount = operation
+                    if executor.execute_transfer_debit(from_account_number, amount):
+                        executor.execute_transfer_credit(to_account_number, amount)
+                    accounts.apply_transaction_fee(from_account_number)
+                elif operation[0] == TRANSFER_DEBIT:
+                    (
+                        _,
+                        _,
+                        from_account_number,
+                        amount,
+                        transfer_id,
+                        to_shard,
+                    ) = operation
+                    debited = False
+                    try:
+                        debited = executor.execute_transfer_debit(
+                            from_account_number, amount
+                        )
+                    finally:
+                        outcome_queues[to_shard].put((transfer_id, debited))
+                    accounts.apply_transaction_fee(from_account_number)
+                elif operation[0] == TRANSFER_CREDIT:
+                    _, _, to_account_number, amount, transfer_id = operation
+                    if wait_for_outcome(transfer_id):
+                        executor.execute_transfer_credit(to_account_number, amount)
+                elif operation[0] == TRANSACTION_FEE:
+                    accounts.apply_transaction_fee(operation[2])
+            except Exception as exception:
+                error = exception
+                error_sequence = operation[1][0]
+
+    result_queue.put(
+        (
+            shard_index,
+            list(accounts.accounts.items()),
+            accounts.dirty_account_numbers,
+            rejections.entries,
+            error,
+            error_sequence,
+        )
+    )
+
+
+class ShardedTransactionProcessor:
+    """
+    Processes transactions across a pool of account-sharded worker processes.
+    Produces the same accounts as TransactionProcessor applied serially.
+    """
+
+    def __init__(self, accounts, num_shards):
+        """
+        Constructs a ShardedTransactionProcessor object and starts its worker processes.
+        :param accounts: BankAccounts object
+        :param num_shards: Number of shards (worker processes)
+        """
+        self.accounts = accounts
+        self.num_shards = num_shards
+        self.parser = TransactionRecordParser()
+        self.next_transfer_id = 0
+        self.pending_operations = [[] for _ in range(num_shards)]
+        self.num_records = 0
+        self.position = None
+        self.rejection_entries = []
+
+        shard_accounts = [[] for _ in range(num_shards)]
+        for account_number, account in accounts.accounts.items():
+            shard_accounts[shard_of(account_number, num_shards)].append(
+                (account_number, account)
+            )
+
+        context = multiprocessing.get_context()
+        self.inboxes = [context.Queue(MAX_QUEUED_BATCHES) for _ in range(num_shards)]
+        self.outcome_queues = [context.Queue() for _ in range(num_shards)]
+        self.result_queue = context.Queue()
+        self.workers = [
+            context.Process(
+                target=run_shard,
+                args=(
+                    shard_index,
+                    shard_accounts[shard_index],
+                    self.inboxes[shard_index],
+                    self.outcome_queues,
+                    self.result_queue,
+                ),
+                daemon=True,
+            )
+            for shard_index in range(num_shards)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def process_transaction(self, transaction_record):
+        """
+        Routes a transaction to the shard that owns its account.
+        :param transaction_record: Transaction record from 'merged bank account transactions' file
+        """
+        transaction = self.parser.decode_transaction_record(transaction_record)
+        transaction_code, account_holder_name, account_number, _, _ = transaction
+        # The sequence number orders the rejections, whatever the line numbers are.
+        # Only a rejects file traces them back to their records, which are otherwise
+        # left out to keep the operations small.
+        rejections = self.accounts.rejections
+        if rejections.file is not None:
+            self.position = (
+                self.num_records,
+                rejections.line_number,
+                rejections.record,
+            )
+        else:
+            self.position = (self.num_records, None, None)
+        self.num_records += 1
+
+        if transaction_code == "02":
+            self.route_transfer(transaction)
+            return
+
+        if transaction_code == "05":
+            if account_number not in self.accounts.accounts:
+                self.accounts.add_account(
+                    account_number, Account(account_holder_name, "A", 0, 0)
+                )
+        elif transaction_code == "06":
+            if self.is_account_valid(account_number):
+                self.accounts.remove_account(account_number)
+        elif transaction_code == "07":
+            if self.is_account_valid(account_number):
+                self.accounts.accounts[account_number].status = DISABLED
+
+        self.send(
+            shard_of(account_number, self.num_shards),
+            (RECORD, self.position, transaction),
+        )
+
+    def route_transfer(self, transaction):
+        """
+        Resolves and validates a 'transfer' transaction, then routes it to its shards.
+        :param transaction: Decoded transaction record
+        """
+        _, _, from_account_number, amount, partial_to_account_number = transaction
+        from_shard = shard_of(from_account_number, self.num_shards)
+
+        if not self.is_account_valid(from_account_number):
+            # The source shard reports the invalid source account and applies the fee.
+            self.send(from_shard, (RECORD, self.position, transaction))
+            return
+
+        to_account_number = self.accounts.find_transfer_destination(
+            self.accounts.accounts[from_account_number].holder_name,
+            partial_to_account_number,
+            from_account_number,
+        )
+        if not to_account_number:
+            self.reject(
+                DESTINATION_ACCOUNT_NOT_FOUND, "ERROR: Destination account not found."
+            )
+            self.send(from_shard, (TRANSACTION_FEE, self.position, from_account_number))
+            return
+        if self.accounts.accounts[to_account_number].status == DISABLED:
+            self.reject(
+                ACCOUNT_DISABLED, f"ERROR: Account {to_account_number} is disabled."
+            )
+            self.send(from_shard, (TRANSACTION_FEE, self.position, from_account_number))
+            return
+
+        to_shard = shard_of(to_account_number, self.num_shards)
+        if from_shard == to_shard:
+            self.send(
+                from_shard,
+                (
+                    LOCAL_TRANSFER,
+                    self.position,
+                    from_account_number,
+                    to_account_number,
+                    amount,
+                ),
+            )
+            return
+
+        transfer_id = self.next_transfer_id
+        self.next_transfer_id += 1
+        self.send(
+            from_shard,
+            (
+                TRANSFER_DEBIT,
+                self.position,
+                from_account_number,
+                amount,
+                transfer_id,
+                to_shard,
+            ),
+        )
+        # The debit must be on its way before the destination shard can wait for it.
+        self.flush(from_shard)
+        self.send(
+            to_shard,
+            (TRANSFER_CREDIT, self.position, to_account_number, amount, transfer_id),
+        )
+
+    def reject(self, reason, message):
+        """
+        Collects a rejection of the current transaction, to be logged in record order
+        with the rejections of the shards.
+        :param reason: Reason code
+        :param message: Human-readable error message
+        """
+        self.rejection_entries.append(self.position + (reason, message))
+
+    def is_account_valid(self, account_number):
+        """
+        Checks whether an account exists and is not disabled, without reporting errors.
+        :param account_number: Account number
+        :return: True if the account exists and is not disabled, False otherwise
+        """
+        account = self.accounts.accounts.get(account_number)
+        return account is not None and account.status != DISABLED
+
+    def send(self, shard_index, operation):
+        """
+        Queues an operation for a shard, flushing the shard's batch when it is full.
+        :param shard_index: Shard index
+        :param operation: Operation tuple
+        """
+        pending_operations = self.pending_operations[shard_index]
+        pending_operations.append(operation)
+        if len(pending_operations) >= BATCH_SIZE:
+            self.flush(shard_index)
+
+    def flush(self, shard_index):
+        """
+        Sends the pending batch of operations to a shard.
+        :param shard_index: Shard index
+        """
+        if self.pending_operations[shard_index]:
+            self.put(shard_index, self.pending_operations[shard_index])
+            self.pending_operations[shard_index] = []
+
+    def put(self, shard_index, operations):
+        """
+        Puts a batch of operations in a shard's inbox, waiting while the inbox is full.
+        :param shard_index: Shard index
+        :param operations: Batch of operations, or None to signal the end of input
+        """
+        while True:
+            try:
+                self.inboxes[shard_index].put(
+                    operations, timeout=LIVENESS_CHECK_SECONDS
+                )
+                return
+            except queue.Full:
+                self.check_workers_alive()
+
+    def check_workers_alive(self):
+        """
+        Checks that no worker process has exited unexpectedly.
+        """
+        for worker in self.workers:
+            if worker.exitcode is not None and worker.exitcode != 0:
+                raise RuntimeError(
+                    f"Shard worker exited unexpectedly with code {worker.exitcode}."
+                )
+
+    def finish(self):
+        """
+        Waits for all shards to apply their operations, logs the rejections in record
+        order and merges the accounts of the shards back into the BankAccounts object.
+        """
+        for shard_index in range(self.num_shards):
+            self.flush(shard_index)
+            self.put(shard_index, None)
+
+        shard_results = []
+        while len(shard_results) < self.num_shards:
+            try:
+                shard_results.append(
+                    self.result_queue.get(timeout=LIVENESS_CHECK_SECONDS)
+                )
+            except queue.Empty:
+                self.check_workers_alive()
+
+        for worker in self.workers:
+            worker.join()
+
+        shard_results.sort(key=lambda result: result[0])
+        # Sorting is stable, so the coordinator's rejections of a record come first,
+        # as they do in a serial run.
+        rejection_entries = self.rejection_entries
+        for _, _, _, entries, _, _ in shard_results:
+            rejection_entries.extend(entries)
+        rejection_entries.sort(key=lambda entry: entry[0])
+
+        # A serial run stops at the first failing record, after logging its rejections.
+        errors = [
+            (error_sequence, error)
+            for _, _, _, _, error, error_sequence in shard_results
+            if error is not None
+        ]
+        error_sequence, error = min(
+            errors, key=lambda item: item[0], default=(None, None)
+        )
+
+        rejections = self.accounts.rejections
+        for sequence, line_number, record, reason, message in rejection_entries:
+            if error_sequence is not None and sequence > error_sequence:
+                break
+            rejections.line_number = line_number
+            rejections.record = record
+            rejections.reject(reason, message)
+        self.rejection_entries = []
+        if error is not None:
+            raise error
+
+        shard_accounts = {}
+        for _, accounts, dirty_account_numbers, _, _, _ in shard_results:
+            shard_accounts.update(accounts)
+            self.accounts.dirty_account_numbers.update(dirty_account_numbers)
+        if shard_accounts.keys() != self.accounts.accounts.keys():
+            raise RuntimeError("Shard accounts do not match the account directory.")
+
+        for account_number in self.accounts.accounts:
+            self.accounts.accounts[account_number] = shard_accounts[account_number]
@@ -0,0 +1,335 @@
+"""
+Streaming Banking System Backend
+
+A long-running backend that follows a 'merged bank account transactions' file as it
+is written, either a regular file that keeps growing or a FIFO, and applies each
+transaction record as soon as it arrives. Snapshots of the accounts are written as the
+new master and current bank accounts files every so many records or seconds, so the
+balances in those files are never older than the snapshot interval.
+
+Taking a snapshot only copies the account fields on the processing thread. The files
+are formatted and published atomically by a background thread. If the previous
+snapshot is still being written when the next one is due, the next one is postponed,
+so ingestion never waits for disk.
+
+The backend stops when a FIFO's last writer closes it, when no record has arrived for
+the idle timeout, or on SIGINT or SIGTERM, after the record being applied. It then
+writes a final snapshot.
+
+Instructions:
+1. Open the terminal
+2. Change the directory to 'backend/src': cd backend/src
+3. Run this file:
+   python streaming_backend.py <master_bank_accounts_file>
+   <merged_bank_account_transactions_file> <new_master_bank_accounts_file>
+   <current_bank_accounts_file> [options]
+
+Options:
+- --snapshot-every N: Writes a snapshot every N transaction records.
+- --snapshot-interval SECONDS: Writes a snapshot every SECONDS seconds, if any record
+  was applied since the last one.
+- --poll-interval SECONDS: Number of seconds to wait for more records before checking
+  the timers again.
+- --idle-timeout SECONDS: Stops once no record has arrived for SECONDS seconds.
+- --rejects-file PATH, --binary-master, --metrics: As for banking_system_backend.py.
+
+Records are applied serially, without checkpoints or a journal.
+"""
+
+from account import Account
+from account_file_writer import AccountFileWriter
+from banking_system_backend import BankingSystemBackend
+from checkpoint import Checkpointer
+from transaction_file_reader import DEFAULT_POLL_INTERVAL, TransactionFileReader
+from transaction_processor import TransactionProcessor
+import argparse
+import signal
+import time
+
+
+class SnapshotWriter(Checkpointer):
+    """
+    Decides when snapshots are due and writes them in the background.
+    """
+
+    description = "Snapshot"
+
+    def __init__(self, backend, every_records=None, every_seconds=None):
+        """
+        Constructs a SnapshotWriter object.
+        :param backend: StreamingBackend object whose output files are written
+        :param every_records: Number of records between snapshots, or None
+        :param every_seconds: Number of seconds between snapshots, or None
+        """
+        super().__init__(None, every_records, every_seconds)
+        self.backend = backend
+
+    def write(self, state, rejects_file):
+        """
+        Writes a snapshot. Runs on the background thread.
+        :param state: Snapshot state from capture_snapshot
+        :param rejects_file: Unused; rejects are flushed when the snapshot is taken
+        """
+        account_rows, source_master_file, dirty_account_numbers = state
+        accounts = {
+            account_number: Account(holder_name, status, balance, num_transactions)
+            for account_number, holder_name, status, balance, num_transactions in (
+                account_rows
+            )
+        }
+        backend = self.backend
+        writer = AccountFileWriter()
+        try:
+            if backend.binary_master:
+                writer.write_binary_account_files(
+                    accounts,
+                    backend.new_master_bank_accounts_file,
+                    backend.current_bank_accounts_file,
+                )
+            else:
+                writer.write_new_account_files(
+                    accounts,
+                    backend.new_master_bank_accounts_file,
+                    backend.current_bank_accounts_file,
+                    source_master_file,
+                    dirty_account_numbers,
+                )
+        except (OSError, ValueError) as error:
+            self.error = error
+
+
+def capture_snapshot(accounts):
+    """
+    Captures the account fields that the output files record.
+    :param accounts: BankAccounts object
+    :return: Snapshot state
+    """
+    account_rows = [
+        (
+            account_number,
+            account.holder_name,
+            account.status,
+            account.balance,
+            account.num_transactions,
+        )
+        for account_number, account in accounts.accounts.items()
+    ]
+    return (
+        account_rows,
+        accounts.source_master_file,
+        set(accounts.dirty_account_numbers),
+    )
+
+
+class StreamingBackend(BankingSystemBackend):
+    """
+    Applies transaction records as they arrive and writes periodic snapshots.
+    """
+
+    def __init__(
+        self,
+        master_bank_accounts_file,
+        merged_bank_account_transactions_file,
+        new_master_bank_accounts_file,
+        current_bank_accounts_file,
+        snapshot_every=None,
+        snapshot_interval=None,
+        poll_interval=DEFAULT_POLL_INTERVAL,
+        idle_timeout=None,
+        **options,
+    ):
+        """
+        Constructs a StreamingBackend object.
+        :param master_bank_accounts_file: 'Master bank accounts' file path
+        :param merged_bank_account_transactions_file: Growing file or FIFO of
+                                                      transaction records
+        :param new_master_bank_accounts_file: 'New master bank accounts' file path
+        :param current_bank_accounts_file: 'Current bank accounts' file path
+        :param snapshot_every: Number of records between snapshots, or None
+        :param snapshot_interval: Number of seconds between snapshots, or None
+        :param poll_interval: Number of seconds to wait for more records
+        :param idle_timeout: Number of seconds without records after which to stop,
+                             or None to keep following the file
+        :param options: Other BankingSystemBackend options
+        """
+        super().__init__(
+            master_bank_accounts_file,
+            merged_bank_account_transactions_file,
+            new_master_bank_accounts_file,
+            current_bank_accounts_file,
+            **options,
+        )
+        if self.shards > 1 or self.vectorized or self.pipelined:
+            raise ValueError("Streamed transactions are applied one by one, serially.")
+        if self.checkpointer is not None:
+            raise ValueError("Streaming takes snapshots instead of checkpoints.")
+        if self.journal_file is not None:
+            raise ValueError("Streamed transactions are not journaled.")
+        self.snapshots = SnapshotWriter(self, snapshot_every, snapshot_interval)
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.num_snapshots = 0
+        self.stopping = False
+
+    def run(self):
+        """
+        Runs backend jobs until the stream ends or the backend is stopped.
+        """
+        self.open_rejection_log()
+        self.load_accounts()
+
+        previous_handlers = {
+            signal_number: signal.signal(signal_number, self.stop)
+            for signal_number in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.stream_transactions()
+        finally:
+            for signal_number, handler in previous_handlers.items():
+                signal.signal(signal_number, handler)
+            self.accounts.rejections.close()
+            self.snapshots.wait()
+        self.write_new_account_files()
+
+        print(f"Wrote {self.num_snapshots} snapshot(s) and the final account files.")
+        self.print_summary()
+
+    def stop(self, signal_number=None, frame=None):
+        """
+        Asks the backend to stop after the record being applied.
+        :param signal_number: Number of the signal that stops the backend, if any
+        :param frame: Interrupted stack frame, if any
+        """
+        self.stopping = True
+
+    def stream_transactions(self):
+        """
+        Applies transaction records as they arrive, taking snapshots when due.
+        """
+        reader = TransactionFileReader(self.merged_bank_account_transactions_file)
+        processor = TransactionProcessor(self.accounts)
+        if self.metrics is not None:
+            self.metrics.instrument(processor)
+
+        snapshots = self.snapshots
+        rejections = self.accounts.rejections
+        num_records = 0
+        num_snapshot_records = 0
+        last_arrival = time.monotonic()
+        for numbered_record in reader.follow_numbered_transaction_records(
+            self.poll_interval
+        ):
+            if numbered_record is None:
+                if self.stopping or (
+                    self.idle_timeout is not None
+                    and time.monotonic() - last_arrival >= self.idle_timeout
+                ):
+                    break
+                # Timed snapshots are only worth taking if something changed.
+                if num_records > num_snapshot_records and snapshots.is_due(num_records):
+                    self.take_snapshot(num_records)
+                    num_snapshot_records = num_records
+                continue
+
+            last_arrival = time.monotonic()
+            line_number, transaction_record = numbered_record
+            if transaction_record.startswith("00"):
+                continue
+
+            rejections.line_number = line_number
+            rejections.record = transaction_record
+            processor.process_transaction(transaction_record)
+
+            num_records += 1
+            if num_records >= snapshots.next_check:
+                if self.stopping:
+                    break
+                if snapshots.is_due(num_records):
+                    self.take_snapshot(num_records)
+                    num_snapshot_records = num_records
+
+    def take_snapshot(self, num_records):
+        """
+        Starts writing a snapshot of the accounts in the background.
+        :param num_records: Number of records applied so far
+        """
+        rejections = self.accounts.rejections
+        if rejections.file is not None:
+            rejections.flush()
+            rejections.file.flush()
+        self.snapshots.save(num_records, capture_snapshot(self.accounts))
+        self.num_snapshots += 1
+
+
+def parse_arguments():
+    """
+    Parses the command-line arguments.
+    :return: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs the banking system back-end over a stream of transactions.",
+        usage="python streaming_backend.py "
+        "<master_bank_accounts_file> "
+        "<merged_bank_account_transactions_file> "
+        "<new_master_bank_accounts_file> "
+        "<current_bank_accounts_file> [options]",
+    )
+    parser.add_argument("master_bank_accounts_file")
+    parser.add_argument("merged_bank_account_transactions_file")
+    parser.add_argument("new_master_bank_accounts_file")
+    parser.add_argument("current_bank_accounts_file")
+    parser.add_argument(
+        "--snapshot-every",
+        type=int,
+        help="number of transaction records between snapshots",
+    )
+    parser.add_argument(
+        "--snapshot-interval",
+        type=float,
+        help="number of seconds between snapshots",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="number of seconds to wait for more records",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        help="stop once no record has arrived for this many seconds",
+    )
+    parser.add_argument(
+        "--rejects-file",
+        help="file to write rejected transactions to, as JSON lines",
+    )
+    parser.add_argument(
+        "--binary-master",
+        action="store_true",
+        help="read and write the master bank accounts files in binary",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print per-transaction-code counts, timings and latency histograms",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    backend = StreamingBackend(
+        arguments.master_bank_accounts_file,
+        arguments.merged_bank_account_transactions_file,
+        arguments.new_master_bank_accounts_file,
+        arguments.current_bank_accounts_file,
+        snapshot_every=arguments.snapshot_every,
+        snapshot_interval=arguments.snapshot_interval,
+        poll_interval=arguments.poll_interval,
+        idle_timeout=arguments.idle_timeout,
+        rejects_file=arguments.rejects_file,
+        binary_master=arguments.binary_master,
+        metrics=arguments.metrics,
+    )
+    backend.run()
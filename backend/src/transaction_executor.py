@@ -1,3 +1,24 @@
+from account import Account, DISABLED
+from rejection_log import (
+    ACCOUNT_DISABLED,
+    SOURCE_ACCOUNT_NOT_FOUND,
+    DESTINATION_ACCOUNT_NOT_FOUND,
+    ACCOUNT_ALREADY_EXISTS,
+)
+from transaction_journal import (
+    DEPOSIT,
+    WITHDRAWAL,
+    PAY_BILL,
+    TRANSFER_DEBIT,
+    TRANSFER_CREDIT,
+    CREATE_ACCOUNT,
+    DELETE_ACCOUNT,
+    DISABLE_ACCOUNT,
+    CHANGE_ACCOUNT_PLAN,
+)
+import sys
+
+
 class TransactionExecutor:
     """
     Executes transactions.
@@ -14,76 +35,111 @@ class TransactionExecutor:
         """
         Executes a 'deposit' transaction.
         :param account_number: Account number
-        :param amount: Amount to deposit
+        :param amount: Amount to deposit in cents
         """
         if not self.accounts.is_account_valid(account_number):
             return
 
-        self.accounts.accounts[account_number]["balance"] += amount
-        self.accounts.accounts[account_number]["num_transactions"] += 1
+        account = self.accounts.accounts[account_number]
+        account.balance += amount
+        account.num_transactions += 1
+        self.accounts.mark_dirty(account_number, DEPOSIT)
 
-    def execute_withdrawal(self, account_number, amount):
+    def execute_withdrawal(self, account_number, amount, operation=WITHDRAWAL):
         """
         Executes a 'withdrawal' transaction.
         :param account_number: Account number
-        :param amount: Amount to withdraw
+        :param amount: Amount to withdraw in cents
+        :param operation: Operation recorded in the journal
         """
         if not self.accounts.is_account_valid(account_number):
             return
+        account = self.accounts.accounts[account_number]
         if not self.accounts.are_funds_sufficient(
-            account_number, self.accounts.accounts[account_number]["balance"], amount
+            account_number, account.balance, amount
         ):
             return
 
-        self.accounts.accounts[account_number]["balance"] -= amount
-        self.accounts.accounts[account_number]["num_transactions"] += 1
+        account.balance -= amount
+        account.num_transactions += 1
+        self.accounts.mark_dirty(account_number, operation)
 
     def execute_transfer(self, from_account_number, partial_to_account_number, amount):
         """
         Executes a 'transfer' transaction.
         :param from_account_number: Account number of source account
         :param partial_to_account_number: Partial account number of destination account
-        :param amount: Amount to transfer
-        """
-        if not self.accounts.is_account_valid(from_account_number):
-            print(f"ERROR: Source account {from_account_number} not found.")
+        :param amount: Amount to transfer in cents
+        """
+        # An invalid source is one rejection, though its message has two lines.
+        from_account = self.accounts.accounts.get(from_account_number)
+        if from_account is None:
+            self.accounts.rejections.reject(
+                SOURCE_ACCOUNT_NOT_FOUND,
+                f"ERROR: Account {from_account_number} does not exist.\n"
+                f"ERROR: Source account {from_account_number} not found.",
+            )
+            return
+        if from_account.status == DISABLED:
+            self.accounts.rejections.reject(
+                ACCOUNT_DISABLED,
+                f"ERROR: Account {from_account_number} is disabled.\n"
+                f"ERROR: Source account {from_account_number} not found.",
+            )
             return
 
-        from_account = self.accounts.accounts[from_account_number]
-        account_holder_name = from_account["holder_name"]
+        account_holder_name = from_account.holder_name
 
         # Find destination account
-        to_account_number = None
-        for account_number, account_data in self.accounts.accounts.items():
-            if (
-                account_data["holder_name"] == account_holder_name
-                and account_number[:2] == partial_to_account_number
-                and account_number != from_account_number
-            ):
-                to_account_number = account_number
-                break
+        to_account_number = self.accounts.find_transfer_destination(
+            account_holder_name, partial_to_account_number, from_account_number
+        )
 
         if not to_account_number:
-            print("ERROR: Destination account not found.")
+            self.accounts.rejections.reject(
+                DESTINATION_ACCOUNT_NOT_FOUND, "ERROR: Destination account not found."
+            )
             return
         if not self.accounts.is_account_valid(to_account_number):
             return
+
+        if self.execute_transfer_debit(from_account_number, amount):
+            self.execute_transfer_credit(to_account_number, amount)
+
+    def execute_transfer_debit(self, from_account_number, amount):
+        """
+        Executes the source side of a 'transfer' transaction whose accounts are valid.
+        :param from_account_number: Account number of source account
+        :param amount: Amount to transfer in cents
+        :return: True if the source account was debited, False otherwise
+        """
+        from_account = self.accounts.accounts[from_account_number]
         if not self.accounts.are_funds_sufficient(
-            from_account_number, from_account["balance"], amount
+            from_account_number, from_account.balance, amount
         ):
-            return
+            return False
 
-        self.accounts.accounts[from_account_number]["balance"] -= amount
-        self.accounts.accounts[to_account_number]["balance"] += amount
-        self.accounts.accounts[from_account_number]["num_transactions"] += 1
+        from_account.balance -= amount
+        from_account.num_transactions += 1
+        self.accounts.mark_dirty(from_account_number, TRANSFER_DEBIT)
+        return True
+
+    def execute_transfer_credit(self, to_account_number, amount):
+        """
+        Executes the destination side of a 'transfer' transaction.
+        :param to_account_number: Account number of destination account
+        :param amount: Amount to transfer in cents
+        """
+        self.accounts.accounts[to_account_number].balance += amount
+        self.accounts.mark_dirty(to_account_number, TRANSFER_CREDIT)
 
     def execute_pay_bill(self, account_number, amount):
         """
         Executes a 'pay bill' transaction.
         :param account_number: Account number
-        :param amount: Amount to withdraw
+        :param amount: Amount to withdraw in cents
         """
-        self.execute_withdrawal(account_number, amount)
+        self.execute_withdrawal(account_number, amount, PAY_BILL)
 
     def execute_create_account(
         self, account_holder_name, account_number, initial_balance
@@ -92,19 +148,20 @@ class TransactionExecutor:
         Executes a 'create account' transaction.
         :param account_holder_name: Account holder name
         :param account_number: Account number
-        :param initial_balance: Initial account balance
+        :param initial_balance: Initial account balance in cents
         """
         if account_number in self.accounts.accounts:
-            print(f"ERROR: Account {account_number} already exists.")
+            self.accounts.rejections.reject(
+                ACCOUNT_ALREADY_EXISTS,
+                f"ERROR: Account {account_number} already exists.",
+            )
             return
 
-        self.accounts.accounts[account_number] = {
-            "holder_name": account_holder_name,
-            "status": "A",
-            "balance": initial_balance,
-            "num_transactions": 0,
-            "plan": "SP",
-        }
+        self.accounts.add_account(
+            account_number,
+            Account(account_holder_name, "A", initial_balance, 0),
+        )
+        self.accounts.mark_dirty(account_number, CREATE_ACCOUNT)
 
     def execute_delete_account(self, account_number):
         """
@@ -114,7 +171,8 @@ class TransactionExecutor:
         if not self.accounts.is_account_valid(account_number):
             return
 
-        del self.accounts.accounts[account_number]
+        self.accounts.remove_account(account_number)
+        self.accounts.mark_dirty(account_number, DELETE_ACCOUNT)
 
     def execute_disable_account(self, account_number):
         """
@@ -124,7 +182,8 @@ class TransactionExecutor:
         if not self.accounts.is_account_valid(account_number):
             return
 
-        self.accounts.accounts[account_number]["status"] = "D"
+        self.accounts.accounts[account_number].status = DISABLED
+        self.accounts.mark_dirty(account_number, DISABLE_ACCOUNT)
 
     def execute_change_account_plan(self, account_number, new_account_plan):
         """
@@ -135,5 +194,7 @@ class TransactionExecutor:
         if not self.accounts.is_account_valid(account_number):
             return
 
-        self.accounts.accounts[account_number]["plan"] = new_account_plan
-        self.accounts.accounts[account_number]["num_transactions"] += 1
+        account = self.accounts.accounts[account_number]
+        account.plan = sys.intern(new_account_plan)
+        account.num_transactions += 1
+        self.accounts.mark_dirty(account_number, CHANGE_ACCOUNT_PLAN)
@@ -1,29 +1,131 @@
+from compressed_files import open_file
+import os
+import select
+import stat
+import time
+
+DEFAULT_READ_AHEAD_BYTES = 1024 * 1024
+DEFAULT_POLL_INTERVAL = 0.1
+
+
 class TransactionFileReader:
     """
     Handles reading transaction records from the
     'merged bank account transactions' file.
     """
 
-    def __init__(self, merged_bank_account_transactions_file):
+    def __init__(
+        self,
+        merged_bank_account_transactions_file,
+        read_ahead_bytes=DEFAULT_READ_AHEAD_BYTES,
+    ):
         """
         Constructs a TransactionFileReader object.
         :param merged_bank_account_transactions_file: 'Merged bank account transactions' file path
+        :param read_ahead_bytes: Maximum number of bytes buffered ahead of the current record
         """
         self.merged_bank_account_transactions_file = (
             merged_bank_account_transactions_file
         )
+        self.read_ahead_bytes = read_ahead_bytes
 
-    def read_transaction_records(self):
+    def iter_transaction_records(self):
         """
-        Reads all transaction records from the 'merged bank account transactions' file.
-        :return: List of all transaction records
+        Lazily yields transaction records from the 'merged bank account transactions' file.
+        Only a bounded read-ahead buffer is held in memory, regardless of the file size.
+        :return: Generator of transaction records
         """
-        transaction_records = []
+        for _, transaction_record in self.iter_numbered_transaction_records():
+            yield transaction_record
 
-        with open(self.merged_bank_account_transactions_file, "r") as file:
-            for line in file:
-                line = line.rstrip("\n")
+    def iter_numbered_transaction_records(self):
+        """
+        Lazily yields transaction records with their line numbers, skipping blank lines.
+        Lines end at '\n' only, and a trailing '\r' is dropped, as in the other modes.
+        :return: Generator of (line number, transaction record)
+        """
+        with open_file(
+            self.merged_bank_account_transactions_file,
+            "r",
+            buffering=self.read_ahead_bytes,
+            newline="\n",
+        ) as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line_number, line
+
+    def iter_positioned_transaction_records(self, start_offset=0, start_line_number=0):
+        """
+        Lazily yields transaction records with their line numbers and the byte offset
+        just past each of them, skipping blank lines. Reading can start at the offset
+        of any line, so that a run can resume from a checkpoint.
+        The file is always read serially, since the offsets must be exact.
+        :param start_offset: Byte offset of the first line to read
+        :param start_line_number: Number of lines before the first line to read
+        :return: Generator of (line number, byte offset after the record, transaction record)
+        """
+        with open_file(
+            self.merged_bank_account_transactions_file,
+            "rb",
+            buffering=self.read_ahead_bytes,
+        ) as file:
+            file.seek(start_offset)
+            offset = start_offset
+            for line_number, line in enumerate(file, start_line_number + 1):
+                offset += len(line)
+                line = line.decode().rstrip("\r\n")
                 if line:
-                    transaction_records.append(line)
+                    yield line_number, offset, line
+
+    def follow_numbered_transaction_records(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        """
+        Yields transaction records with their line numbers as they are written to the
+        file, like 'tail -f', skipping blank lines. The file may be a regular file that
+        keeps growing or a FIFO. A record is only yielded once its line is complete.
+        Whenever no complete record is available, None is yielded before waiting up to
+        poll_interval seconds, so that the caller can do timed work or stop reading.
+        A regular file is followed until the caller stops; a FIFO ends once its last
+        writer closes it.
+        :param poll_interval: Number of seconds to wait for more data
+        :return: Generator of (line number, transaction record), or None when idle
+        """
+        path = self.merged_bank_account_transactions_file
+        is_fifo = stat.S_ISFIFO(os.stat(path).st_mode)
+        # Opening a FIFO waits for its first writer.
+        with open(path, "rb", buffering=0) as file:
+            if is_fifo:
+                os.set_blocking(file.fileno(), False)
+            pending = b""
+            line_number = 0
+            while True:
+                data = file.read(self.read_ahead_bytes)
+                if data:
+                    lines = (pending + data).split(b"\n")
+                    pending = lines.pop()
+                    for line in lines:
+                        line_number += 1
+                        line = line.decode().rstrip("\r")
+                        if line:
+                            yield line_number, line
+                    continue
+
+                # A FIFO reads as empty once its writers are gone, and as None before.
+                if is_fifo and data is not None:
+                    break
+                yield None
+                if is_fifo:
+                    select.select([file], [], [], poll_interval)
+                else:
+                    time.sleep(poll_interval)
+
+            line = pending.decode().rstrip("\r")
+            if line:
+                yield line_number + 1, line
 
-        return transaction_records
+    def read_transaction_records(self):
+        """
+        Reads all transaction records from the 'merged bank account transactions' file.
+        :return: List of all transaction records
+        """
+        return list(self.iter_transaction_records())
@@ -0,0 +1,181 @@
+"""
+Per-transaction-code metrics.
+
+When enabled, every handler of a TransactionProcessor is wrapped so that each call
+records its latency and whether the transaction was accepted or rejected. Latencies
+are kept in histograms with power-of-two nanosecond buckets: bucket b counts the
+calls that took fewer than 2**b nanoseconds and at least half as long.
+
+Nothing is wrapped unless metrics are enabled, so a run without them pays nothing.
+"""
+
+import time
+
+NUM_BUCKETS = 64
+
+
+class CodeMetrics:
+    """
+    Stores the metrics of one transaction code.
+    """
+
+    __slots__ = (
+        "name",
+        "count",
+        "rejected",
+        "total_ns",
+        "histogram",
+        "tracks_rejections",
+    )
+
+    def __init__(self, name, tracks_rejections=True):
+        """
+        Constructs a CodeMetrics object.
+        :param name: Transaction name
+        :param tracks_rejections: Whether calls are told apart as accepted or rejected
+        """
+        self.name = name
+        self.count = 0
+        self.rejected = 0
+        self.total_ns = 0
+        self.histogram = [0] * NUM_BUCKETS
+        self.tracks_rejections = tracks_rejections
+
+    def record(self, elapsed_ns, rejected=False):
+        """
+        Records a call.
+        :param elapsed_ns: Latency of the call in nanoseconds
+        :param rejected: Whether the transaction was rejected
+        """
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.histogram[elapsed_ns.bit_length()] += 1
+        if rejected:
+            self.rejected += 1
+
+    def percentile_ns(self, fraction):
+        """
+        Estimates a latency percentile as the upper bound of its histogram bucket.
+        :param fraction: Percentile as a fraction, such as 0.99
+        :return: Latency in nanoseconds
+        """
+        threshold = fraction * self.count
+        num_calls = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            num_calls += bucket_count
+            if bucket_count and num_calls >= threshold:
+                return 2**bucket
+        return 0
+
+
+class TransactionMetrics:
+    """
+    Records count, total time, latency histogram, acceptances and rejections per
+    transaction code.
+    """
+
+    def __init__(self):
+        """
+        Constructs a TransactionMetrics object.
+        """
+        self.codes = {}
+
+    def instrument(self, processor):
+        """
+        Wraps every handler of a processor so that its calls are measured.
+        :param processor: TransactionProcessor object
+        """
+        for transaction_code, handler in processor.handlers.items():
+            name = handler.__name__.removeprefix("handle_").removesuffix("_transaction")
+            metrics = self.codes.setdefault(transaction_code, CodeMetrics(name))
+            processor.handlers[transaction_code] = self.measure(
+                handler, metrics, processor.accounts
+            )
+
+    def instrument_batches(self, processor):
+        """
+        Wraps the batch method of a VectorizedTransactionProcessor so that each batch
+        of monetary transactions is measured as one call. The records replayed from a
+        batch are also measured by the handlers of its scalar processor.
+        :param processor: VectorizedTransactionProcessor object
+        """
+        self.instrument(processor.processor)
+        metrics = self.codes.setdefault(
+            "batch", CodeMetrics("monetary_batch", tracks_rejections=False)
+        )
+        apply_batch = processor.apply_batch
+        perf_counter_ns = time.perf_counter_ns
+
+        def measured_apply_batch(batch, batch_line_numbers):
+            start = perf_counter_ns()
+            apply_batch(batch, batch_line_numbers)
+            metrics.record(perf_counter_ns() - start)
+
+        processor.apply_batch = measured_apply_batch
+
+    def measure(self, handler, metrics, accounts):
+        """
+        Wraps a handler so that its calls are measured.
+        :param handler: Handler method
+        :param metrics: CodeMetrics object of the handler's transaction code
+        :param accounts: BankAccounts object, whose rejection log tells rejections apart
+        :return: Measured handler
+        """
+        perf_counter_ns = time.perf_counter_ns
+
+        def measured_handler(transaction):
+            rejections = accounts.rejections
+            num_rejected = rejections.num_rejected
+            start = perf_counter_ns()
+            handler(transaction)
+            metrics.record(
+                perf_counter_ns() - start, rejections.num_rejected != num_rejected
+            )
+
+        return measured_handler
+
+    def report(self):
+        """
+        Reports the metrics of every transaction code that was processed.
+        :return: Report lines
+        """
+        lines = [
+            "Transaction metrics:",
+            f"{'code':<6}{'name':<22}{'count':>9}{'accepted':>10}{'rejected':>10}"
+            f"{'total ms':>10}{'mean us':>9}{'p50 us':>9}{'p99 us':>9}",
+        ]
+        for transaction_code, metrics in sorted(self.codes.items()):
+            if not metrics.count:
+                continue
+
+            accepted, rejected = "-", "-"
+            if metrics.tracks_rejections:
+                accepted, rejected = metrics.count - metrics.rejected, metrics.rejected
+            lines.append(
+                f"{transaction_code:<6}{metrics.name:<22}{metrics.count:>9}"
+                f"{accepted:>10}{rejected:>10}"
+                f"{metrics.total_ns / 1e6:>10.1f}"
+                f"{metrics.total_ns / metrics.count / 1e3:>9.2f}"
+                f"{metrics.percentile_ns(0.5) / 1e3:>9.2f}"
+                f"{metrics.percentile_ns(0.99) / 1e3:>9.2f}"
+            )
+            buckets = [
+                f"<{format_nanoseconds(2**bucket)}: {bucket_count}"
+                for bucket, bucket_count in enumerate(metrics.histogram)
+                if bucket_count
+            ]
+            lines.append(f"      latency {', '.join(buckets)}")
+        return lines
+
+
+def format_nanoseconds(nanoseconds):
+    """
+    Formats a duration with a readable unit.
+    :param nanoseconds: Duration in nanoseconds
+    :return: Formatted duration, such as '512ns', '2us' or '1ms'
+    """
+    if nanoseconds < 1000:
+        return f"{nanoseconds}ns"
+    if nanoseconds < 1000000:
+        return f"{nanoseconds // 1000}us"
+    return f"{nanoseconds // 1000000}ms"
@@ -15,108 +15,105 @@ class TransactionProcessor:
         self.accounts = accounts
         self.executor = TransactionExecutor(self.accounts)
         self.parser = TransactionRecordParser()
+        self.handlers = {
+            "04": self.handle_deposit_transaction,
+            "01": self.handle_withdrawal_transaction,
+            "02": self.handle_transfer_transaction,
+            "03": self.handle_pay_bill_transaction,
+            "05": self.handle_create_account_transaction,
+            "06": self.handle_delete_account_transaction,
+            "07": self.handle_disable_account_transaction,
+            "08": self.handle_change_account_plan_transaction,
+        }
 
     def process_transaction(self, transaction_record):
         """
         Processes a transaction.
+        The record is decoded once and dispatched to the handler for its transaction code.
         :param transaction_record: Transaction record from 'merged bank account transactions' file
         """
-        transaction_code = self.parser.parse_transaction_code(transaction_record)
+        transaction = self.parser.decode_transaction_record(transaction_record)
+        handler = self.handlers.get(transaction[0])
+        if handler is not None:
+            handler(transaction)
 
-        if transaction_code == "04":
-            self.handle_deposit_transaction(transaction_record)
-        elif transaction_code == "01":
-            self.handle_withdrawal_transaction(transaction_record)
-        elif transaction_code == "02":
-            self.handle_transfer_transaction(transaction_record)
-        elif transaction_code == "03":
-            self.handle_pay_bill_transaction(transaction_record)
-        elif transaction_code == "05":
-            self.handle_create_account_transaction(transaction_record)
-        elif transaction_code == "06":
-            self.handle_delete_account_transaction(transaction_record)
-        elif transaction_code == "07":
-            self.handle_disable_account_transaction(transaction_record)
-        elif transaction_code == "08":
-            self.handle_change_account_plan_transaction(transaction_record)
+    def process_decoded_transaction(self, transaction):
+        """
+        Processes a transaction that has already been decoded.
+        Transactions with an unknown transaction code are ignored.
+        :param transaction: Decoded transaction record
+        """
+        handler = self.handlers.get(transaction[0])
+        if handler is not None:
+            handler(transaction)
 
-    def handle_deposit_transaction(self, transaction_record):
+    def handle_deposit_transaction(self, transaction):
         """
         Handles a 'deposit' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        amount = self.parser.parse_amount(transaction_record)
+        _, _, account_number, amount, _ = transaction
         self.executor.execute_deposit(account_number, amount)
         self.accounts.apply_transaction_fee(account_number)
 
-    def handle_withdrawal_transaction(self, transaction_record):
+    def handle_withdrawal_transaction(self, transaction):
         """
         Handles a 'withdrawal' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        amount = self.parser.parse_amount(transaction_record)
+        _, _, account_number, amount, _ = transaction
         self.executor.execute_withdrawal(account_number, amount)
         self.accounts.apply_transaction_fee(account_number)
 
-    def handle_transfer_transaction(self, transaction_record):
+    def handle_transfer_transaction(self, transaction):
         """
         Handles a 'transfer' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        from_account_number = self.parser.parse_account_number(transaction_record)
-        partial_to_account_number = self.parser.parse_misc_data(transaction_record)
-        amount = self.parser.parse_amount(transaction_record)
+        _, _, from_account_number, amount, partial_to_account_number = transaction
         self.executor.execute_transfer(
             from_account_number, partial_to_account_number, amount
         )
         self.accounts.apply_transaction_fee(from_account_number)
 
-    def handle_pay_bill_transaction(self, transaction_record):
+    def handle_pay_bill_transaction(self, transaction):
         """
         Handles a 'pay bill' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        amount = self.parser.parse_amount(transaction_record)
+        _, _, account_number, amount, _ = transaction
         self.executor.execute_pay_bill(account_number, amount)
         self.accounts.apply_transaction_fee(account_number)
 
-    def handle_create_account_transaction(self, transaction_record):
+    def handle_create_account_transaction(self, transaction):
         """
         Handles a 'create account' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_holder_name = self.parser.parse_account_holder_name(transaction_record)
-        account_number = self.parser.parse_account_number(transaction_record)
-        amount = self.parser.parse_amount(transaction_record)
+        _, account_holder_name, account_number, initial_balance, _ = transaction
         self.executor.execute_create_account(
-            account_holder_name, account_number, amount
+            account_holder_name, account_number, initial_balance
         )
 
-    def handle_delete_account_transaction(self, transaction_record):
+    def handle_delete_account_transaction(self, transaction):
         """
         Handles a 'delete' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        self.executor.execute_delete_account(account_number)
+        self.executor.execute_delete_account(transaction[2])
 
-    def handle_disable_account_transaction(self, transaction_record):
+    def handle_disable_account_transaction(self, transaction):
         """
         Handles a 'disable' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        self.executor.execute_disable_account(account_number)
+        self.executor.execute_disable_account(transaction[2])
 
-    def handle_change_account_plan_transaction(self, transaction_record):
+    def handle_change_account_plan_transaction(self, transaction):
         """
         Handles a 'change account plan' transaction.
-        :param transaction_record: Transaction record
+        :param transaction: Decoded transaction record
         """
-        account_number = self.parser.parse_account_number(transaction_record)
-        account_plan = self.parser.parse_misc_data(transaction_record)
+        _, _, account_number, _, account_plan = transaction
         self.executor.execute_change_account_plan(account_number, account_plan)
         self.accounts.apply_transaction_fee(account_number)
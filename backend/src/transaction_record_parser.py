@@ -1,8 +1,33 @@
+from money import parse_cents
+
+
 class TransactionRecordParser:
     """
     Parses transaction records.
     """
 
+    def decode_transaction_record(self, transaction_record):
+        """
+        Decodes all fields of a transaction record in a single pass.
+        :param transaction_record: Transaction record
+        :return: Tuple of (transaction code, account holder name, account number,
+                 amount in cents, miscellaneous data)
+        """
+        amount = transaction_record[30:38]
+        if len(amount) == 8 and amount[5] == "." and amount[7] != " ":
+            # Inlined fast path of parse_cents for the canonical '00000.00' layout.
+            amount = int(amount.replace(".", ""))
+        else:
+            amount = parse_cents(amount)
+
+        return (
+            transaction_record[0:2],
+            transaction_record[3:23].strip(),
+            transaction_record[24:29].strip(),
+            amount,
+            transaction_record[39:41].strip(),
+        )
+
     def parse_transaction_code(self, transaction_record):
         """
         Parses the transaction code from a transaction record.
@@ -31,10 +56,9 @@ class TransactionRecordParser:
         """
         Parses the amount from a transaction record.
         :param transaction_record: Transaction record
-        :return: Amount
+        :return: Amount in cents
         """
-        amount = transaction_record[30:38].strip()
-        return float(amount) if amount else 0.0
+        return parse_cents(transaction_record[30:38])
 
     def parse_misc_data(self, transaction_record):
         """
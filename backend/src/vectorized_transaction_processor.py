@@ -0,0 +1,285 @@
+"""
+NumPy-vectorized processing of monetary transactions.
+
+Deposits (04), withdrawals (01) and bill payments (03) only ever touch their own
+account, so a run of consecutive monetary records can be applied per account rather
+than per record. Every other transaction code ends the run and is processed by the
+scalar TransactionProcessor, which keeps creates, deletes, disables, plan changes and
+transfers in their original order.
+
+A run is applied as follows:
+1. The records are parsed together: they are viewed as a 2-D array of characters
+   and the account numbers and amounts are read from their digit columns. A run
+   that contains any record not in the canonical fixed-width layout is decoded one
+   record at a time instead.
+   Runs shorter than the minimum batch size are processed serially instead,
+   since setting up the arrays would cost more than it saves.
+2. Each record becomes a signed delta: the amount (negated for withdrawals and bill
+   payments) minus the transaction fee of the account's plan.
+3. The records are ordered by account (stable, so file order is kept per account),
+   and a segmented prefix sum gives the running balance of each account after each
+   of its records, assuming every record succeeds and every fee is charged.
+4. If an account's running balance never drops below zero, that assumption holds:
+   every withdrawal had sufficient funds and every fee was affordable, so the final
+   balance and transaction count are exactly those of a serial replay.
+5. Records of any other account (one that does not exist, is disabled, or whose
+   running balance goes negative) are replayed one at a time, in file order, by the
+   scalar processor. Rejected records therefore print the same error messages in the
+   same order as a serial run.
+
+NumPy is an optional dependency, only needed when this engine is used.
+"""
+
+from account import DISABLED, STUDENT_PLAN
+from money import STUDENT_PLAN_FEE, NON_STUDENT_PLAN_FEE
+from transaction_processor import TransactionProcessor
+from transaction_journal import MONETARY_BATCH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_BATCH_SIZE = 65536
+# Runs shorter than this are cheaper to process serially than to set up in NumPy.
+MIN_VECTORIZED_BATCH_SIZE = 64
+RECORD_WIDTH = 41
+
+# Sign applied to the amount of each monetary transaction code
+AMOUNT_SIGNS = {"01": -1, "03": -1, "04": 1}
+
+
+class VectorizedTransactionProcessor:
+    """
+    Processes transactions, applying runs of deposits, withdrawals and bill payments
+    in NumPy batches. Produces the same accounts as TransactionProcessor.
+    """
+
+    def __init__(
+        self,
+        accounts,
+        batch_size=DEFAULT_BATCH_SIZE,
+        min_batch_size=MIN_VECTORIZED_BATCH_SIZE,
+    ):
+        """
+        Constructs a VectorizedTransactionProcessor object.
+        :param accounts: BankAccounts object
+        :param batch_size: Maximum number of monetary records applied per batch
+        :param min_batch_size: Minimum number of monetary records applied as a batch
+        """
+        if np is None:
+            raise ImportError("The vectorized transaction engine requires NumPy.")
+
+        self.accounts = accounts
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.processor = TransactionProcessor(accounts)
+        self.parser = self.processor.parser
+        self.batch = []
+        self.batch_line_numbers = []
+
+    def process_transaction(self, transaction_record):
+        """
+        Processes a transaction.
+        Monetary transactions are buffered until the run of them ends.
+        :param transaction_record: Transaction record from 'merged bank account transactions' file
+        """
+        if transaction_record[0:2] in AMOUNT_SIGNS:
+            self.batch.append(transaction_record)
+            self.batch_line_numbers.append(self.accounts.rejections.line_number)
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+            return
+
+        self.flush()
+        self.processor.process_transaction(transaction_record)
+
+    def finish(self):
+        """
+        Applies any buffered monetary transactions.
+        """
+        self.flush()
+
+    def flush(self):
+        """
+        Applies the buffered batch of monetary transactions.
+        """
+        if self.batch:
+            batch = self.batch
+            batch_line_numbers = self.batch_line_numbers
+            self.batch = []
+            self.batch_line_numbers = []
+            self.apply_batch(batch, batch_line_numbers)
+
+    def apply_batch(self, batch, batch_line_numbers):
+        """
+        Applies a batch of deposits, withdrawals and bill payments.
+        :param batch: List of monetary transaction records, in file order
+        :param batch_line_numbers: Line number of each record, for the rejection log
+        """
+        if len(batch) < self.min_batch_size:
+            self.replay_records(batch, batch_line_numbers)
+            return
+
+        indexed_batch = self.index_fixed_width_batch(batch)
+        if indexed_batch is None:
+            indexed_batch = self.index_decoded_batch(batch)
+        batch_account_numbers, record_accounts, record_amounts = indexed_batch
+        accounts = self.accounts.accounts
+        batch_accounts = [
+            accounts.get(account_number) for account_number in batch_account_numbers
+        ]
+
+        # Accounts that do not exist or are disabled are always replayed serially.
+        replay = np.array(
+            [
+                account is None or account.status == DISABLED
+                for account in batch_accounts
+            ],
+            dtype=bool,
+        )
+        balances = np.array(
+            [0 if account is None else account.balance for account in batch_accounts],
+            dtype=np.int64,
+        )
+        fees = np.array(
+            [
+                (
+                    STUDENT_PLAN_FEE
+                    if account is None or account.plan == STUDENT_PLAN
+                    else NON_STUDENT_PLAN_FEE
+                )
+                for account in batch_accounts
+            ],
+            dtype=np.int64,
+        )
+        record_deltas = record_amounts - fees[record_accounts]
+
+        # Running balance of each account after each of its records
+        order = np.argsort(record_accounts, kind="stable")
+        sorted_accounts = record_accounts[order]
+        running_totals = np.cumsum(record_deltas[order])
+        segment_starts = np.flatnonzero(np.diff(sorted_accounts, prepend=-1))
+        segment_lengths = np.diff(np.append(segment_starts, len(sorted_accounts)))
+        segment_offsets = np.zeros(len(segment_starts), dtype=np.int64)
+        segment_offsets[1:] = running_totals[segment_starts[1:] - 1]
+        running_balances = (
+            running_totals
+            - np.repeat(segment_offsets, segment_lengths)
+            + balances[sorted_accounts]
+        )
+        replay[sorted_accounts[running_balances < 0]] = True
+        replay = replay.tolist()
+
+        dirty_account_numbers = self.accounts.dirty_account_numbers
+        journal = self.accounts.journal
+        segment_accounts = sorted_accounts[segment_starts]
+        final_balances = running_balances[segment_starts + segment_lengths - 1]
+        for account_index, final_balance, num_records in zip(
+            segment_accounts.tolist(), final_balances.tolist(), segment_lengths.tolist()
+        ):
+            if not replay[account_index]:
+                account = batch_accounts[account_index]
+                account.balance = final_balance
+                account.num_transactions += num_records
+                dirty_account_numbers.add(batch_account_numbers[account_index])
+                if journal is not None:
+                    journal.record(
+                        MONETARY_BATCH,
+                        batch_account_numbers[account_index],
+                        account,
+                        batch_line_numbers[-1],
+                    )
+
+        if any(replay):
+            replayed = [
+                (transaction_record, record_line_number)
+                for transaction_record, record_line_number, account_index in zip(
+                    batch, batch_line_numbers, record_accounts.tolist()
+                )
+                if replay[account_index]
+            ]
+            self.replay_records(*zip(*replayed))
+
+    def replay_records(self, transaction_records, line_numbers):
+        """
+        Processes monetary transaction records one at a time with the scalar processor.
+        :param transaction_records: Transaction records, in file order
+        :param line_numbers: Line number of each record, for the rejection log
+        """
+        rejections = self.accounts.rejections
+        line_number, record = rejections.line_number, rejections.record
+        for transaction_record, record_line_number in zip(
+            transaction_records, line_numbers
+        ):
+            rejections.line_number = record_line_number
+            rejections.record = transaction_record
+            self.processor.process_transaction(transaction_record)
+        rejections.line_number, rejections.record = line_number, record
+
+    def index_fixed_width_batch(self, batch):
+        """
+        Parses a batch of monetary transaction records as one array of characters.
+        :param batch: List of monetary transaction records
+        :return: Tuple of (account numbers of the batch, account index of each record,
+                 signed amount of each record in cents), or None if any record is not
+                 in the canonical fixed-width layout
+        """
+        # One extra column exposes records that are longer than the layout.
+        characters = (
+            np.array(batch, dtype=f"U{RECORD_WIDTH + 1}")
+            .view(np.uint32)
+            .reshape(len(batch), RECORD_WIDTH + 1)
+        )
+        digits = characters.astype(np.int64) - ord("0")
+        account_digits = digits[:, 24:29]
+        amount_digits = digits[:, np.r_[30:35, 36:38]]
+        if (
+            characters[:, RECORD_WIDTH].any()
+            or not characters[:, RECORD_WIDTH - 1].all()
+            or (characters[:, 35] != ord(".")).any()
+            or ((account_digits < 0) | (account_digits > 9)).any()
+            or ((amount_digits < 0) | (amount_digits > 9)).any()
+        ):
+            return None
+
+        account_keys = account_digits @ (10 ** np.arange(4, -1, -1))
+        unique_account_keys, record_accounts = np.unique(
+            account_keys, return_inverse=True
+        )
+        batch_account_numbers = [
+            f"{account_key:05d}" for account_key in unique_account_keys.tolist()
+        ]
+
+        amounts = amount_digits @ (10 ** np.arange(6, -1, -1))
+        signs = np.where(characters[:, 1] == ord("4"), 1, -1)
+        return batch_account_numbers, record_accounts.reshape(-1), signs * amounts
+
+    def index_decoded_batch(self, batch):
+        """
+        Parses a batch of monetary transaction records one record at a time.
+        :param batch: List of monetary transaction records
+        :return: Tuple of (account numbers of the batch, account index of each record,
+                 signed amount of each record in cents)
+        """
+        account_indices = {}
+        batch_account_numbers = []
+        record_accounts = []
+        record_amounts = []
+        for transaction_record in batch:
+            transaction_code, _, account_number, amount, _ = (
+                self.parser.decode_transaction_record(transaction_record)
+            )
+            account_index = account_indices.get(account_number)
+            if account_index is None:
+                account_index = len(batch_account_numbers)
+                account_indices[account_number] = account_index
+                batch_account_numbers.append(account_number)
+            record_accounts.append(account_index)
+            record_amounts.append(AMOUNT_SIGNS[transaction_code] * amount)
+
+        return (
+            batch_account_numbers,
+            np.array(record_accounts, dtype=np.intp),
+            np.array(record_amounts, dtype=np.int64),
+        )
@@ -1,6 +1,13 @@
+import importlib.util
 import io
+import json
 import os
+import random
 import sys
+import tempfile
+import threading
+import time
+import types
 import unittest
 from contextlib import redirect_stdout
 
@@ -10,8 +17,98 @@ BACKEND_SRC = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
 if BACKEND_SRC not in sys.path:
     sys.path.insert(0, BACKEND_SRC)
 
+from account import Account
+from account_file_writer import AccountFileWriter
+from account_record_builder import AccountRecordBuilder
+from atomic_file_writer import atomic_output_files
 from bank_accounts import BankAccounts
+from banking_system_backend import BankingSystemBackend
+from binary_master_file import convert_binary_to_text, convert_text_to_binary
+from checkpoint import (
+    capture_checkpoint,
+    read_checkpoint,
+    restore_checkpoint,
+    write_checkpoint,
+)
+from compressed_files import open_file
+from journal_recovery import recover_accounts
+from money import format_cents, parse_cents
+from multi_day_backend import MultiDayBackend
+from parallel_record_loader import (
+    find_chunk_boundaries,
+    iter_chunk_results,
+    load_master_records,
+    parse_master_chunk,
+)
+from pipelined_transaction_reader import PipelinedTransactionReader
+from rejection_log import ACCOUNT_DISABLED, INSUFFICIENT_FUNDS, RejectionLog
+from session_file_merger import SessionFileMerger, find_session_files
+from session_merge_backend import SessionMergeBackend
+from sharded_transaction_processor import ShardedTransactionProcessor
+from streaming_backend import StreamingBackend
 from transaction_executor import TransactionExecutor
+from transaction_file_reader import TransactionFileReader
+from transaction_journal import DEPOSIT, TRANSACTION_FEE, TransactionJournal
+from transaction_metrics import TransactionMetrics
+from transaction_processor import TransactionProcessor
+from transaction_record_parser import TransactionRecordParser
+from vectorized_transaction_processor import (
+    MIN_VECTORIZED_BATCH_SIZE,
+    VectorizedTransactionProcessor,
+)
+
+
+def write_master_file(path, account_pairs):
+    """
+    Writes a 'master bank accounts' file, compressed if its extension calls for it.
+    :param path: File path
+    :param account_pairs: List of (account number, Account) pairs
+    """
+    builder = AccountRecordBuilder()
+    with atomic_output_files(path) as (file,):
+        for account_number, account in account_pairs:
+            file.write(
+                builder.build_account_record(
+                    "new_master_bank_accounts_file", account_number, account
+                )
+                + "\n"
+            )
+        file.write("00000 END OF FILE          A 00000.00 0000\n")
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """
+    Base class of the tests that work on files in a temporary directory.
+    """
+
+    def setUp(self):
+        """
+        Creates the temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Removes the temporary directory and its files.
+        """
+        self.directory.cleanup()
+
+    def path(self, file_name):
+        """
+        Provides the path of a file in the temporary directory.
+        :param file_name: File name
+        :return: File path
+        """
+        return os.path.join(self.directory.name, file_name)
+
+    def read(self, file_name):
+        """
+        Reads a file in the temporary directory.
+        :param file_name: File name
+        :return: File contents
+        """
+        with open(self.path(file_name), "r") as file:
+            return file.read()
 
 
 class AreFundsSufficientStatementCoverageTest(unittest.TestCase):
@@ -34,7 +131,7 @@ class AreFundsSufficientStatementCoverageTest(unittest.TestCase):
         """
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            result = self.accounts.are_funds_sufficient("12345", 100.00, 150.00)
+            result = self.accounts.are_funds_sufficient("12345", 10000, 15000)
 
         self.assertFalse(result)
         self.assertIn(
@@ -50,7 +147,7 @@ class AreFundsSufficientStatementCoverageTest(unittest.TestCase):
         """
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            result = self.accounts.are_funds_sufficient("12345", 100.00, 50.00)
+            result = self.accounts.are_funds_sufficient("12345", 10000, 5000)
 
         self.assertTrue(result)
         self.assertEqual(captured_output.getvalue(), "")
@@ -77,7 +174,7 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         """
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            self.executor.execute_transfer("00000", "54", 50.00)
+            self.executor.execute_transfer("00000", "54", 5000)
 
         self.assertIn(
             "ERROR: Account 00000 does not exist.", captured_output.getvalue()
@@ -91,25 +188,17 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         Only the source account exists.
         The loop executes once and no destination account is found.
         """
-        self.accounts.accounts = {
-            "12345": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            }
-        }
+        self.accounts.accounts = {"12345": Account("John Doe", "A", 10000, 0)}
 
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            self.executor.execute_transfer("12345", "54", 50.00)
+            self.executor.execute_transfer("12345", "54", 5000)
 
         self.assertIn(
             "ERROR: Destination account not found.", captured_output.getvalue()
         )
-        self.assertEqual(self.accounts.accounts["12345"]["balance"], 100.00)
-        self.assertEqual(self.accounts.accounts["12345"]["num_transactions"], 0)
+        self.assertEqual(self.accounts.accounts["12345"].balance, 10000)
+        self.assertEqual(self.accounts.accounts["12345"].num_transactions, 0)
 
     def test_dlc03_two_loop_iterations_match(self):
         """
@@ -118,27 +207,15 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         The destination account is found on the second iteration.
         """
         self.accounts.accounts = {
-            "12345": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "54321": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
+            "12345": Account("John Doe", "A", 10000, 0),
+            "54321": Account("John Doe", "A", 10000, 0),
         }
 
-        self.executor.execute_transfer("12345", "54", 50.00)
+        self.executor.execute_transfer("12345", "54", 5000)
 
-        self.assertEqual(self.accounts.accounts["12345"]["balance"], 50.00)
-        self.assertEqual(self.accounts.accounts["54321"]["balance"], 150.00)
-        self.assertEqual(self.accounts.accounts["12345"]["num_transactions"], 1)
+        self.assertEqual(self.accounts.accounts["12345"].balance, 5000)
+        self.assertEqual(self.accounts.accounts["54321"].balance, 15000)
+        self.assertEqual(self.accounts.accounts["12345"].num_transactions, 1)
 
     def test_dlc04_disabled_destination_account(self):
         """
@@ -147,30 +224,18 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         The destination account is found, but disabled.
         """
         self.accounts.accounts = {
-            "12345": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "54321": {
-                "holder_name": "John Doe",
-                "status": "D",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
+            "12345": Account("John Doe", "A", 10000, 0),
+            "54321": Account("John Doe", "D", 10000, 0),
         }
 
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            self.executor.execute_transfer("12345", "54", 50.00)
+            self.executor.execute_transfer("12345", "54", 5000)
 
         self.assertIn("ERROR: Account 54321 is disabled.", captured_output.getvalue())
-        self.assertEqual(self.accounts.accounts["12345"]["balance"], 100.00)
-        self.assertEqual(self.accounts.accounts["54321"]["balance"], 100.00)
-        self.assertEqual(self.accounts.accounts["12345"]["num_transactions"], 0)
+        self.assertEqual(self.accounts.accounts["12345"].balance, 10000)
+        self.assertEqual(self.accounts.accounts["54321"].balance, 10000)
+        self.assertEqual(self.accounts.accounts["12345"].num_transactions, 0)
 
     def test_dlc05_insufficient_funds(self):
         """
@@ -179,32 +244,20 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         The destination account is found, but the source account has insufficient funds.
         """
         self.accounts.accounts = {
-            "12345": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 25.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "54321": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
+            "12345": Account("John Doe", "A", 2500, 0),
+            "54321": Account("John Doe", "A", 10000, 0),
         }
 
         captured_output = io.StringIO()
         with redirect_stdout(captured_output):
-            self.executor.execute_transfer("12345", "54", 50.00)
+            self.executor.execute_transfer("12345", "54", 5000)
 
         self.assertIn(
             "ERROR: Account 12345 has insufficient funds.", captured_output.getvalue()
         )
-        self.assertEqual(self.accounts.accounts["12345"]["balance"], 25.00)
-        self.assertEqual(self.accounts.accounts["54321"]["balance"], 100.00)
-        self.assertEqual(self.accounts.accounts["12345"]["num_transactions"], 0)
+        self.assertEqual(self.accounts.accounts["12345"].balance, 2500)
+        self.assertEqual(self.accounts.accounts["54321"].balance, 10000)
+        self.assertEqual(self.accounts.accounts["12345"].num_transactions, 0)
 
     def test_dlc06_multiple_loop_iterations(self):
         """
@@ -213,43 +266,1791 @@ class ExecuteTransferDecisionAndLoopCoverageTest(unittest.TestCase):
         Multiple accounts appear before the destination account is found.
         """
         self.accounts.accounts = {
-            "12345": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "11111": {
-                "holder_name": "Jane Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "22222": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
-            "54321": {
-                "holder_name": "John Doe",
-                "status": "A",
-                "balance": 100.00,
-                "num_transactions": 0,
-                "plan": "SP",
-            },
+            "12345": Account("John Doe", "A", 10000, 0),
+            "11111": Account("Jane Doe", "A", 10000, 0),
+            "22222": Account("John Doe", "A", 10000, 0),
+            "54321": Account("John Doe", "A", 10000, 0),
+        }
+
+        self.executor.execute_transfer("12345", "54", 5000)
+
+        self.assertEqual(self.accounts.accounts["12345"].balance, 5000)
+        self.assertEqual(self.accounts.accounts["54321"].balance, 15000)
+        self.assertEqual(self.accounts.accounts["12345"].num_transactions, 1)
+        self.assertEqual(self.accounts.accounts["11111"].balance, 10000)
+        self.assertEqual(self.accounts.accounts["22222"].balance, 10000)
+
+
+class TransactionFileReaderStreamingTest(unittest.TestCase):
+    """
+    Unit tests for the streaming and list modes of TransactionFileReader.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'merged bank account transactions' file.
+        """
+        file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+        file.write("04 John Doe             12345 00100.00 00\n")
+        file.write("\n")
+        file.write("00                      00000 00000.00 00\n")
+        file.close()
+        self.transactions_file = file.name
+        self.reader = TransactionFileReader(self.transactions_file, read_ahead_bytes=16)
+
+    def tearDown(self):
+        """
+        Removes the temporary file.
+        """
+        os.remove(self.transactions_file)
+
+    def test_tfr01_streaming_mode_is_lazy(self):
+        """
+        TFR01_Streaming_Mode_Is_Lazy
+
+        The streaming mode returns a generator instead of a list.
+        """
+        records = self.reader.iter_transaction_records()
+
+        self.assertIsInstance(records, types.GeneratorType)
+        self.assertEqual(next(records), "04 John Doe             12345 00100.00 00")
+
+    def test_tfr02_list_mode_matches_streaming_mode(self):
+        """
+        TFR02_List_Mode_Matches_Streaming_Mode
+
+        Both modes skip blank lines and return the same records in order.
+        """
+        self.assertEqual(
+            self.reader.read_transaction_records(),
+            list(self.reader.iter_transaction_records()),
+        )
+        self.assertEqual(len(self.reader.read_transaction_records()), 2)
+
+
+class TransferIndexTest(unittest.TestCase):
+    """
+    Unit tests for the transfer destination index in BankAccounts.
+    """
+
+    def setUp(self):
+        """
+        Constructs BankAccounts and TransactionExecutor objects with two accounts.
+        """
+        self.accounts = BankAccounts()
+        self.executor = TransactionExecutor(self.accounts)
+        self.executor.execute_create_account("John Doe", "12345", 10000)
+        self.executor.execute_create_account("John Doe", "54321", 10000)
+
+    def test_ti01_first_match_other_than_source(self):
+        """
+        TI01_First_Match_Other_Than_Source
+
+        The first matching account that is not the source account is returned.
+        """
+        self.executor.execute_create_account("John Doe", "54322", 10000)
+
+        self.assertEqual(
+            self.accounts.find_transfer_destination("John Doe", "54", "12345"), "54321"
+        )
+        self.assertEqual(
+            self.accounts.find_transfer_destination("John Doe", "54", "54321"), "54322"
+        )
+        self.assertIsNone(
+            self.accounts.find_transfer_destination("Jane Doe", "54", "12345")
+        )
+
+    def test_ti02_deleted_account_is_unindexed(self):
+        """
+        TI02_Deleted_Account_Is_Unindexed
+
+        A deleted account can no longer be found as a transfer destination.
+        """
+        self.executor.execute_delete_account("54321")
+
+        self.assertIsNone(
+            self.accounts.find_transfer_destination("John Doe", "54", "12345")
+        )
+        self.assertEqual(
+            self.accounts.transfer_index, {("John Doe", "12"): {"12345": None}}
+        )
+
+    def test_ti03_disabled_account_stays_indexed(self):
+        """
+        TI03_Disabled_Account_Stays_Indexed
+
+        A disabled account is still found, so the transfer is rejected as disabled.
+        """
+        self.executor.execute_disable_account("54321")
+        self.executor.execute_change_account_plan("54321", "NP")
+
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            self.executor.execute_transfer("12345", "54", 5000)
+
+        self.assertIn("ERROR: Account 54321 is disabled.", captured_output.getvalue())
+        self.assertEqual(self.accounts.accounts["12345"].balance, 10000)
+
+    def test_ti04_replaced_accounts_are_reindexed(self):
+        """
+        TI04_Replaced_Accounts_Are_Reindexed
+
+        Assigning the accounts directly rebuilds the index on its next use.
+        """
+        self.accounts.accounts = {}
+
+        self.assertEqual(self.accounts.get_transfer_index(), {})
+
+
+class MoneyTest(unittest.TestCase):
+    """
+    Unit tests for the integer-cents money helpers.
+    """
+
+    def test_mo01_parse_fixed_width_amount(self):
+        """
+        MO01_Parse_Fixed_Width_Amount
+
+        Fixed-width and free-form amounts are parsed into integer cents.
+        """
+        self.assertEqual(parse_cents("00100.00"), 10000)
+        self.assertEqual(parse_cents("00000.05"), 5)
+        self.assertEqual(parse_cents(" 12.5 "), 1250)
+        self.assertEqual(parse_cents(""), 0)
+
+    def test_mo02_format_amount(self):
+        """
+        MO02_Format_Amount
+
+        Integer cents are formatted to 8 characters with two decimal places.
+        """
+        self.assertEqual(format_cents(14990), "00149.90")
+        self.assertEqual(format_cents(9999999), "99999.99")
+        self.assertEqual(format_cents(-5), "-0000.05")
+
+    def test_mo03_fees_do_not_drift(self):
+        """
+        MO03_Fees_Do_Not_Drift
+
+        Repeated fees are exact, where float balances would drift.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("12345", Account("John Doe", "A", 10000, 0))
+        for _ in range(1000):
+            accounts.apply_transaction_fee("12345")
+
+        self.assertEqual(accounts.accounts["12345"].balance, 5000)
+        self.assertEqual(format_cents(accounts.accounts["12345"].balance), "00050.00")
+
+
+class TransactionRecordDecoderTest(unittest.TestCase):
+    """
+    Unit tests for the single-pass transaction record decoder and dispatch table.
+    """
+
+    def test_trd01_decode_matches_field_parsers(self):
+        """
+        TRD01_Decode_Matches_Field_Parsers
+
+        The single-pass decoder yields the same fields as the individual parsers.
+        """
+        parser = TransactionRecordParser()
+        for transaction_record in [
+            "02 John Doe             12345 00050.00 54",
+            "05 Jane Doe             54321 00012.5     ",
+            "00                      00000 00000.00   ",
+        ]:
+            self.assertEqual(
+                parser.decode_transaction_record(transaction_record),
+                (
+                    parser.parse_transaction_code(transaction_record),
+                    parser.parse_account_holder_name(transaction_record),
+                    parser.parse_account_number(transaction_record),
+                    parser.parse_amount(transaction_record),
+                    parser.parse_misc_data(transaction_record),
+                ),
+            )
+
+    def test_trd02_unknown_transaction_code_is_ignored(self):
+        """
+        TRD02_Unknown_Transaction_Code_Is_Ignored
+
+        Records whose code has no handler leave the accounts untouched.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("12345", Account("John Doe", "A", 10000, 0))
+        processor = TransactionProcessor(accounts)
+
+        processor.process_transaction("99 John Doe             12345 00050.00   ")
+        processor.process_transaction("04 John Doe             12345 00050.00   ")
+
+        self.assertEqual(accounts.accounts["12345"].balance, 14995)
+        self.assertEqual(accounts.accounts["12345"].num_transactions, 1)
+
+
+class IncrementalMasterWriterTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for dirty tracking and the verbatim passthrough of unmodified records.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and loads it.
+        """
+        super().setUp()
+        self.master_file = self.path("master.txt")
+        with open(self.master_file, "w") as file:
+            file.write(
+                "12345 John Doe             A 00100.00 0000\n"
+                "54321 John Doe             A 00100.00 0000\n"
+                "54322 Jane Doe             A 00100.00 0000\n"
+                "00000 END OF FILE          A 00000.00 0000\n"
+            )
+
+        self.accounts = BankAccounts()
+        self.accounts.load_accounts(self.master_file)
+        self.executor = TransactionExecutor(self.accounts)
+        self.writer = AccountFileWriter()
+
+    def test_imw01_only_modified_accounts_are_rebuilt(self):
+        """
+        IMW01_Only_Modified_Accounts_Are_Rebuilt
+
+        Modified accounts are rebuilt and unmodified records are copied verbatim.
+        """
+        self.executor.execute_deposit("12345", 5000)
+        self.executor.execute_create_account("Jim Beam", "54323", 2000)
+        # Not marked dirty, so the record is still copied from the master file.
+        self.accounts.accounts["54322"].balance = 0
+
+        self.assertEqual(self.accounts.dirty_account_numbers, {"12345", "54323"})
+        self.writer.write_new_master_bank_accounts_file(
+            self.accounts.accounts,
+            self.path("new_master.txt"),
+            self.accounts.source_master_file,
+            self.accounts.dirty_account_numbers,
+        )
+        self.assertEqual(
+            self.read("new_master.txt"),
+            "12345 John Doe             A 00150.00 0001\n"
+            "54321 John Doe             A 00100.00 0000\n"
+            "54322 Jane Doe             A 00100.00 0000\n"
+            "54323 Jim Beam             A 00020.00 0000\n",
+        )
+
+    def test_imw02_delta_file(self):
+        """
+        IMW02_Delta_File
+
+        The delta file lists updated and deleted accounts in account number order.
+        """
+        self.executor.execute_delete_account("54321")
+        self.executor.execute_disable_account("12345")
+
+        self.writer.write_delta_file(
+            self.accounts.accounts,
+            self.accounts.dirty_account_numbers,
+            self.path("delta.txt"),
+        )
+        self.assertEqual(
+            self.read("delta.txt"),
+            "U 12345 John Doe             D 00100.00 0000\nX 54321\n",
+        )
+
+    def test_imw03_unordered_master_is_not_copied(self):
+        """
+        IMW03_Unordered_Master_Is_Not_Copied
+
+        A master file that is not in account number order is never copied from.
+        """
+        with open(self.master_file, "w") as file:
+            file.write(
+                "54321 John Doe             A 00100.00 0000\n"
+                "12345 John Doe             A 00100.00 0000\n"
+            )
+        accounts = BankAccounts()
+        accounts.load_accounts(self.master_file)
+
+        self.assertIsNone(accounts.source_master_file)
+        self.assertEqual(accounts.dirty_account_numbers, set())
+
+
+class AtomicAccountFileWriterTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for the single-pass, atomically published account file writer.
+    """
+
+    def setUp(self):
+        """
+        Creates a temporary output directory and accounts to write.
+        """
+        super().setUp()
+        self.new_master_file = self.path("new_master.txt")
+        self.current_file = self.path("current.txt")
+        self.accounts = {
+            "54321": Account("Jane Doe", "D", 12345678, 12345),
+            "12345": Account("John Doe", "A", 10000, 2),
         }
+        self.writer = AccountFileWriter()
+
+    def test_awt01_single_pass_matches_separate_writers(self):
+        """
+        AWT01_Single_Pass_Matches_Separate_Writers
+
+        Both files written in one pass match the files written one at a time,
+        including records wider than the fixed-width layout.
+        """
+        self.writer.write_new_account_files(
+            self.accounts, self.new_master_file, self.current_file
+        )
+        with open(self.new_master_file, "r") as file:
+            new_master_contents = file.read()
+        with open(self.current_file, "r") as file:
+            current_contents = file.read()
+
+        self.writer.write_new_master_bank_accounts_file(
+            self.accounts, self.new_master_file
+        )
+        self.writer.write_current_bank_accounts_file(self.accounts, self.current_file)
+        with open(self.new_master_file, "r") as file:
+            self.assertEqual(file.read(), new_master_contents)
+        with open(self.current_file, "r") as file:
+            self.assertEqual(file.read(), current_contents)
+        self.assertEqual(current_contents, "12345 John Doe             A 00100.00\n")
+
+    def test_awt02_failed_write_leaves_files_untouched(self):
+        """
+        AWT02_Failed_Write_Leaves_Files_Untouched
+
+        A failure while writing publishes neither file and removes the temporary files.
+        """
+        for path in (self.new_master_file, self.current_file):
+            with open(path, "w") as file:
+                file.write("previous contents\n")
+
+        self.accounts["99999"] = None
+        with self.assertRaises(AttributeError):
+            self.writer.write_new_account_files(
+                self.accounts, self.new_master_file, self.current_file
+            )
+
+        for path in (self.new_master_file, self.current_file):
+            with open(path, "r") as file:
+                self.assertEqual(file.read(), "previous contents\n")
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)), ["current.txt", "new_master.txt"]
+        )
+
+
+class CompressedFilesTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for reading and writing compressed account and transaction files.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and a day of transactions, both
+        plain and compressed.
+        """
+        super().setUp()
+        account_pairs, transaction_records = build_random_workload(4, 2000)
+        for extension in ("", ".gz", ".xz", ".bz2"):
+            write_master_file(self.path("master.txt" + extension), account_pairs)
+            transactions_file = self.path("transactions.txt" + extension)
+            with atomic_output_files(transactions_file) as (file,):
+                file.write("\n".join(transaction_records) + "\n")
+
+    def run_backend(self, extension, **options):
+        """
+        Runs the backend with compressed inputs and outputs.
+        :param extension: Compressed file extension, or '' for plain files
+        :param options: Additional BankingSystemBackend options
+        :return: Tuple of (new master contents, current accounts contents)
+        """
+        output_files = [
+            self.path(f"{extension}_{file_name}{extension}")
+            for file_name in ("new_master.txt", "current.txt")
+        ]
+        with redirect_stdout(io.StringIO()):
+            BankingSystemBackend(
+                self.path("master.txt" + extension),
+                self.path("transactions.txt" + extension),
+                *output_files,
+                **options,
+            ).run()
+
+        contents = []
+        for output_file in output_files:
+            with open_file(output_file, "r") as file:
+                contents.append(file.read())
+        return tuple(contents)
+
+    def test_cf01_compressed_run_matches_plain_run(self):
+        """
+        CF01_Compressed_Run_Matches_Plain_Run
+
+        A run on gzip, xz and bzip2 inputs, with parallel parsing asked for, writes
+        compressed outputs that decompress to the outputs of a plain run.
+        """
+        plain_outputs = self.run_backend("")
+        for extension in (".gz", ".xz", ".bz2"):
+            self.assertEqual(self.run_backend(extension, workers=2), plain_outputs)
+
+    def test_cf02_compressed_output_is_atomic_and_reproducible(self):
+        """
+        CF02_Compressed_Output_Is_Atomic_And_Reproducible
+
+        Writing the same contents twice gives the same gzip file, and a failed write
+        publishes nothing.
+        """
+        compressed_contents = []
+        for _ in range(2):
+            with atomic_output_files(self.path("output.txt.gz")) as (file,):
+                file.write("00000 END OF FILE          A 00000.00 0000\n")
+            with open(self.path("output.txt.gz"), "rb") as file:
+                compressed_contents.append(file.read())
+        self.assertEqual(compressed_contents[0], compressed_contents[1])
+
+        file_names = sorted(os.listdir(self.directory.name))
+        with self.assertRaises(ValueError):
+            with atomic_output_files(self.path("failed.txt.xz")) as (file,):
+                file.write("partial contents\n")
+                raise ValueError("Write failed")
+        self.assertEqual(sorted(os.listdir(self.directory.name)), file_names)
+
+
+class SessionFileMergerTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for merging session transaction files as they are read.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and a day of transactions split
+        into twelve session files, each ending in an end-of-session record.
+        """
+        super().setUp()
+        account_pairs, self.transaction_records = build_random_workload(5, 1200)
+        self.master_file = self.path("master.txt")
+        write_master_file(self.master_file, account_pairs)
+
+        self.end_of_session_record = "00" + " " * 22 + "00000 00000.00 00"
+        os.mkdir(self.path("sessions"))
+        for session in range(12):
+            session_records = self.transaction_records[
+                session * 100 : session * 100 + 100
+            ]
+            with open(self.path(f"sessions/session_{session + 1}.txt"), "w") as file:
+                for transaction_record in session_records + [
+                    self.end_of_session_record
+                ]:
+                    file.write(transaction_record + "\n")
+
+    def test_sm01_sessions_merge_in_session_order(self):
+        """
+        SM01_Sessions_Merge_In_Session_Order
+
+        Session files are merged by session number rather than lexically, with a
+        single end-of-session record at the end, into the stream and the audit file.
+        """
+        session_files = find_session_files([self.path("sessions")])
+        self.assertEqual(
+            [os.path.basename(session_file) for session_file in session_files],
+            [f"session_{session}.txt" for session in range(1, 13)],
+        )
+
+        merger = SessionFileMerger(session_files, self.path("merged.txt"))
+        merged_records = self.transaction_records + [self.end_of_session_record]
+        self.assertEqual(
+            list(merger.iter_numbered_transaction_records()),
+            list(enumerate(merged_records, 1)),
+        )
+        with open(self.path("merged.txt")) as file:
+            self.assertEqual(file.read().splitlines(), merged_records)
+
+    def test_sm02_merged_run_matches_concatenated_run(self):
+        """
+        SM02_Merged_Run_Matches_Concatenated_Run
+
+        A run over the session files writes the same account files as a run over the
+        merged file, and a run stopped by an error publishes no merged file.
+        """
+        with open(self.path("transactions.txt"), "w") as file:
+            file.write("\n".join(self.transaction_records) + "\n")
+        output_files = {}
+        for name in ("concatenated", "merged"):
+            output_files[name] = [
+                self.path(f"{name}_new_master.txt"),
+                self.path(f"{name}_current.txt"),
+            ]
+        with redirect_stdout(io.StringIO()):
+            BankingSystemBackend(
+                self.master_file,
+                self.path("transactions.txt"),
+                *output_files["concatenated"],
+            ).run()
+            SessionMergeBackend(
+                self.master_file,
+                find_session_files([self.path("sessions")]),
+                *output_files["merged"],
+                pipelined=True,
+            ).run()
+
+        for concatenated_file, merged_file in zip(
+            output_files["concatenated"], output_files["merged"]
+        ):
+            with open(concatenated_file) as file:
+                expected_contents = file.read()
+            with open(merged_file) as file:
+                self.assertEqual(file.read(), expected_contents)
+
+        session_files = find_session_files([self.path("sessions")])
+        merger = SessionFileMerger(
+            session_files + [self.path("missing.txt")], self.path("failed.txt")
+        )
+        with self.assertRaises(FileNotFoundError):
+            merger.read_transaction_records()
+        self.assertFalse(os.path.exists(self.path("failed.txt")))
+
+
+class CheckpointTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for checkpointing and resuming backend runs.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and a day of transactions.
+        """
+        super().setUp()
+        account_pairs, self.transaction_records = build_random_workload(0, 600)
+        self.master_file = self.path("master.txt")
+        write_master_file(self.master_file, account_pairs)
+        self.transactions_file = self.path("transactions.txt")
+        with open(self.transactions_file, "w") as file:
+            file.write("\n".join(self.transaction_records) + "\n")
+
+    def run_backend(self, output_name, **options):
+        """
+        Runs the backend and provides its output files and console output.
+        :param output_name: Prefix of the output file names
+        :param options: Additional BankingSystemBackend options
+        :return: Tuple of (new master contents, current accounts contents, console output)
+        """
+        backend = BankingSystemBackend(
+            self.master_file,
+            self.transactions_file,
+            self.path(f"{output_name}_new_master.txt"),
+            self.path(f"{output_name}_current.txt"),
+            **options,
+        )
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            backend.run()
+
+        contents = []
+        for file_name in ("new_master.txt", "current.txt"):
+            with open(self.path(f"{output_name}_{file_name}"), "r") as file:
+                contents.append(file.read())
+        return contents[0], contents[1], captured_output.getvalue()
+
+    def test_cp01_checkpoint_round_trip(self):
+        """
+        CP01_Checkpoint_Round_Trip
+
+        A restored checkpoint has the same accounts, in the same order, and the same
+        modified account numbers and rejection counts.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("54321", Account('Jane "JD" Doe', "D", 12345678, 7, "NP"))
+        accounts.add_account("12345", Account("John Doe", "A", 10000, 2))
+        accounts.mark_dirty("54321")
+        accounts.rejections.counts["ACCOUNT_DISABLED"] = 3
+        checkpoint_file = self.path("checkpoint")
+
+        write_checkpoint(
+            checkpoint_file,
+            capture_checkpoint(accounts, self.transactions_file, 10, 420),
+        )
+        restored_accounts = BankAccounts()
+        position = restore_checkpoint(
+            restored_accounts, self.transactions_file, read_checkpoint(checkpoint_file)
+        )
+
+        self.assertEqual(position, (10, 420))
+        self.assertEqual(
+            list(restored_accounts.accounts.items()), list(accounts.accounts.items())
+        )
+        self.assertEqual(restored_accounts.dirty_account_numbers, {"54321"})
+        self.assertEqual(
+            restored_accounts.rejections.counts, accounts.rejections.counts
+        )
+        self.assertEqual(
+            restored_accounts.find_transfer_destination("John Doe", "12", "00000"),
+            "12345",
+        )
+
+    def test_cp02_resumed_run_matches_uninterrupted_run(self):
+        """
+        CP02_Resumed_Run_Matches_Uninterrupted_Run
+
+        A run resumed from a checkpoint taken partway through the file writes the same
+        files, and logs the rejections after the checkpoint, as an uninterrupted run.
+        The checkpoint file is removed once the run completes.
+        """
+        new_master, current, output = self.run_backend(
+            "uninterrupted", checkpoint_every=100
+        )
+
+        # Simulates a run that died after the checkpoint at line 300.
+        accounts = BankAccounts()
+        accounts.load_accounts(self.master_file)
+        processor = TransactionProcessor(accounts)
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            for line_number, offset, transaction_record in TransactionFileReader(
+                self.transactions_file
+            ).iter_positioned_transaction_records():
+                processor.process_transaction(transaction_record)
+                if line_number == 300:
+                    break
+        checkpoint_file = self.path("resumed_new_master.txt.checkpoint")
+        write_checkpoint(
+            checkpoint_file,
+            capture_checkpoint(accounts, self.transactions_file, line_number, offset),
+        )
 
-        self.executor.execute_transfer("12345", "54", 50.00)
+        resumed_new_master, resumed_current, resumed_output = self.run_backend(
+            "resumed", resume=True
+        )
+
+        self.assertEqual(resumed_new_master, new_master)
+        self.assertEqual(resumed_current, current)
+        resume_message = "Resuming after line 300.\n"
+        self.assertTrue(resumed_output.startswith(resume_message))
+        self.assertEqual(
+            captured_output.getvalue() + resumed_output[len(resume_message) :], output
+        )
+        self.assertFalse(os.path.exists(checkpoint_file))
+        self.assertFalse(
+            os.path.exists(self.path("uninterrupted_new_master.txt.checkpoint"))
+        )
+
+
+class TransactionJournalTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for the write-ahead journal and recovery from it.
+    """
 
-        self.assertEqual(self.accounts.accounts["12345"]["balance"], 50)
-        self.assertEqual(self.accounts.accounts["54321"]["balance"], 150.00)
-        self.assertEqual(self.accounts.accounts["12345"]["num_transactions"], 1)
-        self.assertEqual(self.accounts.accounts["11111"]["balance"], 100.00)
-        self.assertEqual(self.accounts.accounts["22222"]["balance"], 100.00)
+    def setUp(self):
+        """
+        Creates a temporary directory.
+        """
+        super().setUp()
+        self.journal_file = self.path("journal.txt")
+
+    def test_jn01_recovery_matches_final_accounts(self):
+        """
+        JN01_Recovery_Matches_Final_Accounts
+
+        Replaying the journal over the old master file rebuilds the accounts of the
+        run, in the same order, with one fsync per group of entries.
+        """
+        account_pairs, transaction_records = build_random_workload(1, 600)
+        master_file = self.path("master.txt")
+        write_master_file(master_file, account_pairs)
+
+        accounts = BankAccounts()
+        accounts.load_accounts(master_file)
+        accounts.journal = TransactionJournal(self.journal_file, group_size=50)
+        processor = TransactionProcessor(accounts)
+        with redirect_stdout(io.StringIO()):
+            for line_number, transaction_record in enumerate(transaction_records, 1):
+                accounts.rejections.line_number = line_number
+                processor.process_transaction(transaction_record)
+        accounts.journal.close()
+
+        recovered_accounts, last_line_number, num_entries = recover_accounts(
+            master_file, self.journal_file
+        )
+
+        self.assertEqual(
+            list(recovered_accounts.accounts.items()), list(accounts.accounts.items())
+        )
+        self.assertEqual(
+            recovered_accounts.dirty_account_numbers, accounts.dirty_account_numbers
+        )
+        self.assertLessEqual(last_line_number, 600)
+        self.assertLessEqual(accounts.journal.num_commits, num_entries // 50 + 1)
+
+    def test_jn02_groups_end_between_transactions(self):
+        """
+        JN02_Groups_End_Between_Transactions
+
+        A full group is only committed once the next transaction record starts, and
+        an incomplete last entry is ignored by recovery.
+        """
+        account = Account("John Doe", "A", 10000, 1)
+        journal = TransactionJournal(self.journal_file, group_size=1)
+
+        journal.record(DEPOSIT, "12345", account, 1)
+        journal.record(TRANSACTION_FEE, "12345", account, 1)
+        self.assertEqual(journal.num_commits, 0)
+        journal.record(DEPOSIT, "12345", account, 2)
+        self.assertEqual(journal.num_commits, 1)
+        with open(self.journal_file, "r") as file:
+            self.assertEqual(len(file.readlines()), 2)
+        journal.close()
+
+        with open(self.journal_file, "a") as file:
+            file.write("3\tDELETE_ACCOUNT\t123")
+        master_file = self.path("master.txt")
+        with open(master_file, "w") as file:
+            file.write("12345 John Doe             A 00010.00 0000\n")
+        recovered_accounts, last_line_number, num_entries = recover_accounts(
+            master_file, self.journal_file
+        )
+        self.assertEqual(recovered_accounts.accounts, {"12345": account})
+        self.assertEqual((last_line_number, num_entries), (2, 3))
+
+    def test_jn03_recovery_reads_binary_master(self):
+        """
+        JN03_Recovery_Reads_Binary_Master
+
+        The journal of a run over a binary master file rebuilds the accounts from
+        the binary master file, and they write out the same files as the run.
+        """
+        account_pairs, transaction_records = build_random_workload(2, 600)
+        text_master_file = self.path("master.txt")
+        write_master_file(text_master_file, account_pairs)
+        master_file = self.path("master.bin")
+        convert_text_to_binary(text_master_file, master_file)
+        transactions_file = self.path("transactions.txt")
+        with open(transactions_file, "w") as file:
+            file.write("\n".join(transaction_records) + "\n")
+
+        output_files = {
+            name: [
+                self.path(f"{name}_new_master.bin"),
+                self.path(f"{name}_current.txt"),
+            ]
+            for name in ("run", "recovered")
+        }
+        with redirect_stdout(io.StringIO()):
+            BankingSystemBackend(
+                master_file,
+                transactions_file,
+                *output_files["run"],
+                journal_file=self.journal_file,
+                binary_master=True,
+            ).run()
+
+        recovered_accounts, _, _ = recover_accounts(
+            master_file, self.journal_file, binary=True
+        )
+        AccountFileWriter().write_binary_account_files(
+            recovered_accounts.get_all_accounts(), *output_files["recovered"]
+        )
+        for run_file, recovered_file in zip(
+            output_files["run"], output_files["recovered"]
+        ):
+            with open(run_file, "rb") as file:
+                run_contents = file.read()
+            with open(recovered_file, "rb") as file:
+                self.assertEqual(file.read(), run_contents)
+
+
+class BinaryMasterFileTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for the binary master file format and its converter.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary text 'master bank accounts' file.
+        """
+        super().setUp()
+        self.master_records = [
+            "00001 John Doe             A 00100.00 0000",
+            "12345 Jane Q Public-Smith  D 12345.67 0042",
+            "54321 John Doe             A 99999.99 9999",
+            "00000 END OF FILE          A 00000.00 0000",
+        ]
+        self.text_master_file = self.path("master.txt")
+        with open(self.text_master_file, "w") as file:
+            file.write("\n".join(self.master_records) + "\n")
+
+    def test_bm01_conversion_is_lossless(self):
+        """
+        BM01_Conversion_Is_Lossless
+
+        Converting a text master file to binary and back gives the original file,
+        loads the same accounts, and a record that would change is refused.
+        """
+        binary_master_file = self.path("master.bin")
+        text_master_file = self.path("converted.txt")
+
+        self.assertEqual(
+            convert_text_to_binary(self.text_master_file, binary_master_file), 3
+        )
+        convert_binary_to_text(binary_master_file, text_master_file)
+
+        with open(text_master_file, "r") as file:
+            self.assertEqual(file.read().split("\n")[:-1], self.master_records)
+        text_accounts = BankAccounts()
+        text_accounts.load_accounts(self.text_master_file)
+        binary_accounts = BankAccounts()
+        binary_accounts.load_accounts(binary_master_file, binary=True)
+        self.assertEqual(
+            list(binary_accounts.accounts.items()),
+            list(text_accounts.accounts.items()),
+        )
+
+        with open(self.text_master_file, "w") as file:
+            file.write("99999 John Doe             A 100.0 0000\n")
+        with self.assertRaises(ValueError):
+            convert_text_to_binary(self.text_master_file, binary_master_file)
+
+    def test_bm02_binary_run_matches_text_run(self):
+        """
+        BM02_Binary_Run_Matches_Text_Run
+
+        A backend run on a binary master file writes the same accounts as a run on
+        the text master file.
+        """
+        transactions_file = self.path("transactions.txt")
+        with open(transactions_file, "w") as file:
+            file.write(
+                "04 John Doe             00001 00010.00 00\n"
+                "05 John Doe             54321 00001.00 00\n"
+                "01 Jane Q Public-Smith  12345 00001.00 00\n"
+                "00                                       00\n"
+            )
+        binary_master_file = self.path("master.bin")
+        convert_text_to_binary(self.text_master_file, binary_master_file)
+
+        with redirect_stdout(io.StringIO()):
+            BankingSystemBackend(
+                self.text_master_file,
+                transactions_file,
+                self.path("text_new_master.txt"),
+                self.path("text_current.txt"),
+            ).run()
+            BankingSystemBackend(
+                binary_master_file,
+                transactions_file,
+                self.path("binary_new_master.bin"),
+                self.path("binary_current.txt"),
+                binary_master=True,
+            ).run()
+        convert_binary_to_text(
+            self.path("binary_new_master.bin"), self.path("binary_new_master.txt")
+        )
+
+        for text_file, binary_file in (
+            ("text_new_master.txt", "binary_new_master.txt"),
+            ("text_current.txt", "binary_current.txt"),
+        ):
+            with open(self.path(text_file), "r") as file:
+                text_contents = file.read()
+            with open(self.path(binary_file), "r") as file:
+                self.assertEqual(file.read(), text_contents)
+
+
+class TransactionMetricsTest(unittest.TestCase):
+    """
+    Unit tests for the per-transaction-code metrics.
+    """
+
+    def test_tm01_counts_acceptances_and_rejections(self):
+        """
+        TM01_Counts_Acceptances_And_Rejections
+
+        Each handler call is counted under its transaction code as accepted or
+        rejected, and lands in exactly one latency bucket.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("12345", Account("John Doe", "A", 1000, 0))
+        accounts.add_account("54321", Account("Jane Doe", "D", 1000, 0))
+        processor = TransactionProcessor(accounts)
+        metrics = TransactionMetrics()
+        metrics.instrument(processor)
+
+        with redirect_stdout(io.StringIO()):
+            for transaction_record in [
+                "04 John Doe             12345 00001.00 00",
+                "01 John Doe             12345 00100.00 00",
+                "01 John Doe             12345 00001.00 00",
+                "04 Jane Doe             54321 00001.00 00",
+                "99 John Doe             12345 00001.00 00",
+            ]:
+                processor.process_transaction(transaction_record)
+
+        deposits, withdrawals = metrics.codes["04"], metrics.codes["01"]
+        self.assertEqual(
+            (deposits.name, deposits.count, deposits.rejected), ("deposit", 2, 1)
+        )
+        self.assertEqual(
+            (withdrawals.name, withdrawals.count, withdrawals.rejected),
+            ("withdrawal", 2, 1),
+        )
+        self.assertEqual(sum(withdrawals.histogram), 2)
+        self.assertEqual(metrics.codes["02"].count, 0)
+        self.assertNotIn("99", metrics.codes)
+
+    def test_tm02_report(self):
+        """
+        TM02_Report
+
+        The report has a line and a histogram line per processed transaction code,
+        and skips codes that were never processed.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("12345", Account("John Doe", "A", 1000, 0))
+        processor = TransactionProcessor(accounts)
+        metrics = TransactionMetrics()
+        metrics.instrument(processor)
+        processor.process_transaction("08 John Doe             12345 00000.00 NP")
+
+        report = metrics.report()
+
+        self.assertEqual(len(report), 4)
+        self.assertTrue(report[2].startswith("08    change_account_plan"))
+        self.assertTrue(report[3].strip().startswith("latency <"))
+        self.assertGreater(metrics.codes["08"].percentile_ns(0.99), 0)
+
+
+class MultiDayBackendTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for running the backend over several days with resident accounts.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and three days of transactions.
+        """
+        super().setUp()
+        account_pairs, transaction_records = build_random_workload(1, 1500)
+        self.master_file = self.path("master.txt")
+        write_master_file(self.master_file, account_pairs)
+        self.day_files = []
+        for day in range(3):
+            self.day_files.append(self.path(f"day_{day + 1}_transactions.txt"))
+            with open(self.day_files[-1], "w") as file:
+                day_records = transaction_records[day * 500 : (day + 1) * 500]
+                file.write("\n".join(day_records) + "\n")
+
+    def test_md01_matches_one_run_per_day(self):
+        """
+        MD01_Matches_One_Run_Per_Day
+
+        The multi-day backend writes the same files as running the backend once per
+        day on the previous day's new master file, including after plan changes and
+        transfers between accounts of the same holder.
+        """
+        with redirect_stdout(io.StringIO()):
+            master_file = self.master_file
+            for day, day_file in enumerate(self.day_files, 1):
+                BankingSystemBackend(
+                    master_file,
+                    day_file,
+                    self.path(f"daily_{day}_new_master.txt"),
+                    self.path(f"daily_{day}_current.txt"),
+                ).run()
+                master_file = self.path(f"daily_{day}_new_master.txt")
+
+            MultiDayBackend(
+                self.master_file,
+                self.day_files,
+                self.path("new_master.txt"),
+                self.path("current.txt"),
+                day_output_dir=self.directory.name,
+            ).run()
+
+        self.assertEqual(
+            self.read("new_master.txt"), self.read("daily_3_new_master.txt")
+        )
+        self.assertEqual(self.read("current.txt"), self.read("daily_3_current.txt"))
+        for day in (1, 2):
+            self.assertEqual(
+                self.read(f"day_{day}_new_master_bank_accounts.txt"),
+                self.read(f"daily_{day}_new_master.txt"),
+            )
+            self.assertEqual(
+                self.read(f"day_{day}_current_bank_accounts.txt"),
+                self.read(f"daily_{day}_current.txt"),
+            )
+
+    def test_md02_only_requested_days_are_written(self):
+        """
+        MD02_Only_Requested_Days_Are_Written
+
+        Only the requested days get account files in the day output directory.
+        """
+        day_output_dir = self.path("days")
+        os.mkdir(day_output_dir)
+        with redirect_stdout(io.StringIO()):
+            MultiDayBackend(
+                self.master_file,
+                self.day_files,
+                self.path("new_master.txt"),
+                self.path("current.txt"),
+                day_output_dir=day_output_dir,
+                write_days={2},
+            ).run()
+
+        self.assertEqual(
+            sorted(os.listdir(day_output_dir)),
+            ["day_2_current_bank_accounts.txt", "day_2_new_master_bank_accounts.txt"],
+        )
+        self.assertTrue(os.path.exists(self.path("new_master.txt")))
+
+    def test_md03_unsupported_options_rejected(self):
+        """
+        MD03_Unsupported_Options_Rejected
+
+        Checkpoint and journal options are rejected instead of being ignored.
+        """
+        for options in (
+            {"checkpoint_every": 100},
+            {"resume": True},
+            {"journal_file": self.path("journal.txt")},
+        ):
+            with self.assertRaises(ValueError):
+                MultiDayBackend(
+                    self.master_file,
+                    self.day_files,
+                    self.path("new_master.txt"),
+                    self.path("current.txt"),
+                    **options,
+                )
+
+
+class StreamingBackendTest(TemporaryDirectoryTestCase):
+    """
+    Unit tests for the streaming backend.
+    """
+
+    def setUp(self):
+        """
+        Writes a temporary 'master bank accounts' file and the expected outputs of a
+        batch run over a day of transactions.
+        """
+        super().setUp()
+        account_pairs, transaction_records = build_random_workload(2, 1000)
+        self.master_file = self.path("master.txt")
+        write_master_file(self.master_file, account_pairs)
+        self.lines = [record + "\n" for record in transaction_records]
+        with open(self.path("batch_transactions.txt"), "w") as file:
+            file.writelines(self.lines)
+        with redirect_stdout(io.StringIO()):
+            BankingSystemBackend(
+                self.master_file,
+                self.path("batch_transactions.txt"),
+                self.path("batch_new_master.txt"),
+                self.path("batch_current.txt"),
+            ).run()
+
+    def run_streaming_backend(self, transactions_file, **options):
+        """
+        Runs the streaming backend and provides its console output.
+        :param transactions_file: Transactions file path
+        :param options: Additional StreamingBackend options
+        :return: Console output
+        """
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            StreamingBackend(
+                self.master_file,
+                transactions_file,
+                self.path("new_master.txt"),
+                self.path("current.txt"),
+                poll_interval=0.01,
+                **options,
+            ).run()
+        return captured_output.getvalue()
+
+    def test_ss01_growing_file_matches_batch_run(self):
+        """
+        SS01_Growing_File_Matches_Batch_Run
+
+        Records appended to a growing file, including a record split across two
+        writes, are applied as they arrive, and the final files match a batch run.
+        """
+        transactions_file = self.path("transactions.txt")
+        with open(transactions_file, "w") as file:
+            file.writelines(self.lines[:400])
+            file.write(self.lines[400][:10])
+
+        def append_remaining_records():
+            time.sleep(0.1)
+            with open(transactions_file, "a") as file:
+                file.write(self.lines[400][10:])
+                file.writelines(self.lines[401:])
+
+        writer = threading.Thread(target=append_remaining_records)
+        writer.start()
+        output = self.run_streaming_backend(
+            transactions_file, snapshot_every=100, idle_timeout=0.5
+        )
+        writer.join()
+
+        self.assertNotIn("Wrote 0 snapshot(s)", output)
+        self.assertEqual(self.read("new_master.txt"), self.read("batch_new_master.txt"))
+        self.assertEqual(self.read("current.txt"), self.read("batch_current.txt"))
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "FIFOs are not supported")
+    def test_ss02_fifo_snapshots_while_streaming(self):
+        """
+        SS02_FIFO_Snapshots_While_Streaming
+
+        A timed snapshot is published while the writer of a FIFO is still connected,
+        and the backend stops with the final files once the writer closes the FIFO.
+        """
+        fifo = self.path("transactions.fifo")
+        os.mkfifo(fifo)
+        snapshot_seen = []
+
+        def write_records():
+            with open(fifo, "w") as file:
+                file.writelines(self.lines[:500])
+                file.flush()
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    if os.path.exists(self.path("new_master.txt")):
+                        snapshot_seen.append(True)
+                        break
+                    time.sleep(0.01)
+                file.writelines(self.lines[500:])
+
+        writer = threading.Thread(target=write_records)
+        writer.start()
+        self.run_streaming_backend(fifo, snapshot_interval=0.05)
+        writer.join()
+
+        self.assertEqual(snapshot_seen, [True])
+        self.assertEqual(self.read("new_master.txt"), self.read("batch_new_master.txt"))
+        self.assertEqual(self.read("current.txt"), self.read("batch_current.txt"))
+
+    def test_ss03_unsupported_options_rejected(self):
+        """
+        SS03_Unsupported_Options_Rejected
+
+        Options for batched, sharded, pipelined, checkpointed or journaled processing
+        are rejected instead of being ignored.
+        """
+        for options in (
+            {"vectorized": True},
+            {"shards": 2},
+            {"pipelined": True},
+            {"checkpoint_every": 100},
+            {"journal_file": self.path("journal.txt")},
+        ):
+            with self.assertRaises(ValueError):
+                StreamingBackend(
+                    self.master_file,
+                    self.path("transactions.txt"),
+                    self.path("new_master.txt"),
+                    self.path("current.txt"),
+                    **options,
+                )
+
+
+class ParallelRecordLoaderTest(unittest.TestCase):
+    """
+    Unit tests for the memory-mapped, multi-process record loader.
+    """
+
+    def setUp(self):
+        """
+        Writes temporary 'master bank accounts' and 'merged bank account transactions' files.
+        """
+        master_records = [
+            f"{number:05d} John Doe             A 00100.00 0000"
+            for number in range(1, 41)
+        ]
+        master_records.insert(30, "00000 END OF FILE          A 00000.00 0000")
+        self.master_file = self.write_file(master_records)
+
+        self.transaction_records = [
+            f"04 John Doe             {number:05d} 00010.00 00"
+            for number in range(1, 41)
+        ]
+        self.transactions_file = self.write_file(self.transaction_records)
+
+    def tearDown(self):
+        """
+        Removes the temporary files.
+        """
+        os.remove(self.master_file)
+        os.remove(self.transactions_file)
+
+    def write_file(self, records):
+        """
+        Writes records to a temporary file.
+        :param records: Records
+        :return: File path
+        """
+        file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+        file.write("\n".join(records) + "\n")
+        file.close()
+        return file.name
+
+    def test_prl01_chunks_end_on_record_boundaries(self):
+        """
+        PRL01_Chunks_End_On_Record_Boundaries
+
+        Every chunk ends on a newline and the chunks cover the whole file.
+        """
+        boundaries = find_chunk_boundaries(self.transactions_file, chunk_bytes=100)
+
+        self.assertGreater(len(boundaries), 1)
+        self.assertEqual(boundaries[0][0], 0)
+        self.assertEqual(boundaries[-1][1], os.path.getsize(self.transactions_file))
+        with open(self.transactions_file, "rb") as file:
+            data = file.read()
+        for start, end in boundaries:
+            self.assertEqual(data[end - 1 : end], b"\n")
+
+    def test_prl02_master_records_stop_at_end_of_file(self):
+        """
+        PRL02_Master_Records_Stop_At_End_Of_File
+
+        The parallel loader matches the serial loader, including the END_OF_FILE stop.
+        """
+        serial_records = list(BankAccounts().read_account_records(self.master_file))
+        parallel_records = list(
+            load_master_records(self.master_file, workers=2, chunk_bytes=100)
+        )
+
+        self.assertEqual(parallel_records, serial_records)
+        self.assertEqual(len(parallel_records), 30)
+
+    def test_prl03_crlf_records_read_alike(self):
+        """
+        PRL03_CRLF_Records_Read_Alike
+
+        Records of a file with CRLF line endings are read without the '\\r', the same
+        way by the serial readers and the parallel loader.
+        """
+        with open(self.master_file, "r") as file:
+            master_contents = file.read()
+        serial_records = list(BankAccounts().read_account_records(self.master_file))
+        with open(self.master_file, "w", newline="") as file:
+            file.write(master_contents.replace("\n", "\r\n"))
+        with open(self.transactions_file, "w", newline="") as file:
+            file.write("\r\n".join(self.transaction_records) + "\r\n")
+
+        self.assertEqual(
+            list(BankAccounts().read_account_records(self.master_file)),
+            serial_records,
+        )
+        self.assertEqual(
+            list(load_master_records(self.master_file, workers=2, chunk_bytes=100)),
+            serial_records,
+        )
+        self.assertEqual(
+            TransactionFileReader(self.transactions_file).read_transaction_records(),
+            self.transaction_records,
+        )
+
+    def test_prl04_default_chunks_split_the_master_file(self):
+        """
+        PRL04_Default_Chunks_Split_The_Master_File
+
+        Without a chunk size, a master file of a few hundred kilobytes is still split
+        into several chunks for the workers, and loads like the serial loader.
+        """
+        os.remove(self.master_file)
+        master_records = [
+            f"{number:05d} John Doe             A 00100.00 0000"
+            for number in range(1, 10001)
+        ]
+        master_records.append("00000 END OF FILE          A 00000.00 0000")
+        self.master_file = self.write_file(master_records)
+
+        chunk_results = list(
+            iter_chunk_results(parse_master_chunk, self.master_file, 2)
+        )
+
+        self.assertGreater(len(chunk_results), 1)
+        self.assertEqual(
+            list(load_master_records(self.master_file, workers=2)),
+            list(BankAccounts().read_account_records(self.master_file)),
+        )
+
+
+def build_random_workload(seed, num_records):
+    """
+    Builds random accounts and transaction records covering every transaction code.
+    Monetary transactions only target accounts that are never deleted.
+    :param seed: Random seed
+    :param num_records: Number of transaction records
+    :return: Tuple of (accounts as (account number, Account) pairs, transaction records)
+    """
+    generator = random.Random(seed)
+    holder_names = ["John Doe", "Jane Doe", "Jim Beam"]
+    accounts = [
+        (f"{number:05d}", Account(generator.choice(holder_names), "A", 10000, 0))
+        for number in range(10000, 10040)
+    ] + [
+        (f"{number:05d}", Account(generator.choice(holder_names), "A", 10000, 0))
+        for number in range(54000, 54040)
+    ]
+    stable_account_numbers = [account_number for account_number, _ in accounts]
+    next_account_number = 60000
+
+    transaction_records = []
+    for _ in range(num_records):
+        code = generator.choice(["01", "02", "03", "04", "04", "05", "06", "07", "08"])
+        account_number = generator.choice(stable_account_numbers)
+        holder_name = generator.choice(holder_names)
+        amount = generator.randint(0, 8000)
+        misc_data = "00"
+
+        if code == "02":
+            misc_data = generator.choice(["10", "54", "60"])
+        elif code == "05":
+            account_number = f"{next_account_number:05d}"
+            next_account_number += 1
+        elif code in ("06", "07") and next_account_number > 60000:
+            account_number = f"{generator.randint(60000, next_account_number - 1):05d}"
+        elif code == "08":
+            misc_data = generator.choice(["SP", "NP"])
+
+        if code == "06" and account_number in stable_account_numbers:
+            code = "07"
+
+        transaction_records.append(
+            f"{code} {holder_name:<20} {account_number} "
+            f"{amount // 100:05d}.{amount % 100:02d} {misc_data}"
+        )
+
+    return accounts, transaction_records
+
+
+class ShardedTransactionProcessorTest(unittest.TestCase):
+    """
+    Unit tests for account-sharded parallel transaction processing.
+    """
+
+    def replay(self, processor_factory, seed, rejects_file=None):
+        """
+        Replays a random workload and provides the resulting accounts and console output.
+        :param processor_factory: Function that builds a processor from a BankAccounts object
+        :param seed: Random seed
+        :param rejects_file: Rejects file path, or None to print rejections instead
+        :return: Tuple of (accounts as (account number, Account) pairs, console output)
+        """
+        account_pairs, transaction_records = build_random_workload(seed, 3000)
+        accounts = BankAccounts()
+        accounts.rejections = RejectionLog(rejects_file)
+        for account_number, account in account_pairs:
+            accounts.add_account(account_number, account)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            processor = processor_factory(accounts)
+            for line_number, transaction_record in enumerate(transaction_records, 1):
+                accounts.rejections.line_number = line_number
+                accounts.rejections.record = transaction_record
+                processor.process_transaction(transaction_record)
+            if hasattr(processor, "finish"):
+                processor.finish()
+        accounts.rejections.close()
+
+        return list(accounts.accounts.items()), output.getvalue()
+
+    def test_stp01_matches_serial_replay(self):
+        """
+        STP01_Matches_Serial_Replay
+
+        The sharded processor produces the same accounts as a serial replay.
+        """
+        for seed in range(3):
+            serial_accounts, _ = self.replay(TransactionProcessor, seed)
+            sharded_accounts, _ = self.replay(
+                lambda accounts: ShardedTransactionProcessor(accounts, 3), seed
+            )
+
+            self.assertEqual(sharded_accounts, serial_accounts)
+
+    def test_stp02_rejections_logged_in_record_order(self):
+        """
+        STP02_Rejections_Logged_In_Record_Order
+
+        The sharded processor logs the same rejection messages as a serial replay, in
+        the same order.
+        """
+        serial_accounts, serial_output = self.replay(TransactionProcessor, 0)
+        sharded_accounts, sharded_output = self.replay(
+            lambda accounts: ShardedTransactionProcessor(accounts, 3), 0
+        )
+
+        self.assertIn("ERROR:", serial_output)
+        self.assertEqual(sharded_output, serial_output)
+
+    def test_stp03_rejects_file_matches_serial_replay(self):
+        """
+        STP03_Rejects_File_Matches_Serial_Replay
+
+        The sharded processor writes the same rejects file as a serial replay.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            serial_rejects_file = os.path.join(directory, "serial_rejects.jsonl")
+            sharded_rejects_file = os.path.join(directory, "sharded_rejects.jsonl")
+            self.replay(TransactionProcessor, 1, serial_rejects_file)
+            self.replay(
+                lambda accounts: ShardedTransactionProcessor(accounts, 3),
+                1,
+                sharded_rejects_file,
+            )
+
+            with open(serial_rejects_file) as file:
+                serial_rejects = file.read()
+            with open(sharded_rejects_file) as file:
+                sharded_rejects = file.read()
+
+        self.assertIn('"line": ', serial_rejects)
+        self.assertEqual(sharded_rejects, serial_rejects)
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "NumPy is not installed")
+class VectorizedTransactionProcessorTest(unittest.TestCase):
+    """
+    Unit tests for the NumPy-vectorized monetary transaction engine.
+    """
+
+    def vectorized(self, accounts):
+        """
+        Builds a vectorized engine that applies even the shortest runs as batches.
+        :param accounts: BankAccounts object
+        :return: VectorizedTransactionProcessor object
+        """
+        return VectorizedTransactionProcessor(accounts, min_batch_size=1)
+
+    def replay(self, processor_factory, account_pairs, transaction_records):
+        """
+        Replays transaction records and provides the resulting accounts and console output.
+        :param processor_factory: Function that builds a processor from a BankAccounts object
+        :param account_pairs: List of (account number, Account) pairs
+        :param transaction_records: Transaction records
+        :return: Tuple of (accounts as (account number, Account) pairs, console output)
+        """
+        accounts = BankAccounts()
+        for account_number, account in account_pairs:
+            accounts.add_account(
+                account_number,
+                Account(
+                    account.holder_name,
+                    account.status,
+                    account.balance,
+                    account.num_transactions,
+                    account.plan,
+                ),
+            )
+
+        captured_output = io.StringIO()
+        with redirect_stdout(captured_output):
+            processor = processor_factory(accounts)
+            for transaction_record in transaction_records:
+                processor.process_transaction(transaction_record)
+            if hasattr(processor, "finish"):
+                processor.finish()
+
+        return list(accounts.accounts.items()), captured_output.getvalue()
+
+    def test_vtp01_matches_serial_replay(self):
+        """
+        VTP01_Matches_Serial_Replay
+
+        The vectorized engine produces the same accounts and error messages as a
+        serial replay, across batch boundaries and interleaved non-monetary codes,
+        whether short runs are applied as batches or processed serially.
+        """
+        for seed in range(3):
+            account_pairs, transaction_records = build_random_workload(seed, 3000)
+            serial_result = self.replay(
+                TransactionProcessor, account_pairs, transaction_records
+            )
+            for min_batch_size in (1, MIN_VECTORIZED_BATCH_SIZE):
+                vectorized_result = self.replay(
+                    lambda accounts: VectorizedTransactionProcessor(
+                        accounts, 50, min_batch_size
+                    ),
+                    account_pairs,
+                    transaction_records,
+                )
+
+                self.assertEqual(vectorized_result, serial_result)
+
+    def test_vtp02_overdrawn_account_is_replayed(self):
+        """
+        VTP02_Overdrawn_Account_Is_Replayed
+
+        An account whose running balance would go negative is replayed record by
+        record, so the rejected withdrawal and the skipped fee match a serial run.
+        """
+        account_pairs = [
+            ("12345", Account("John Doe", "A", 1000, 0)),
+            ("54321", Account("Jane Doe", "A", 1000, 0, "NP")),
+        ]
+        transaction_records = [
+            "01 John Doe             12345 00008.00 00",
+            "04 Jane Doe             54321 00001.00 00",
+            "01 John Doe             12345 00003.00 00",
+            "03 John Doe             12345 00001.85 00",
+        ]
+
+        accounts, output = self.replay(
+            self.vectorized, account_pairs, transaction_records
+        )
+
+        self.assertEqual(
+            self.replay(TransactionProcessor, account_pairs, transaction_records),
+            (accounts, output),
+        )
+        self.assertEqual(output, "ERROR: Account 12345 has insufficient funds.\n")
+        self.assertEqual(dict(accounts)["12345"].balance, 0)
+        self.assertEqual(dict(accounts)["54321"].balance, 1090)
+
+    def test_vtp03_free_form_records_match_serial_replay(self):
+        """
+        VTP03_Free_Form_Records_Match_Serial_Replay
+
+        A batch with a record outside the fixed-width layout is decoded record by
+        record and still matches a serial replay. A nonexistent account still raises
+        KeyError when its fee is applied, as it does in a serial replay.
+        """
+        account_pairs = [("12345", Account("John Doe", "A", 1000, 0))]
+        transaction_records = [
+            "04 John Doe             12345 00001.00 00",
+            "01 John Doe             12345 2.5",
+            "04 John Doe             99999 00001.00 00",
+        ]
+
+        serial_result = self.replay(
+            TransactionProcessor, account_pairs, transaction_records[:2]
+        )
+
+        self.assertEqual(
+            self.replay(self.vectorized, account_pairs, transaction_records[:2]),
+            serial_result,
+        )
+        self.assertEqual(dict(serial_result[0])["12345"].balance, 840)
+        with self.assertRaises(KeyError):
+            self.replay(self.vectorized, account_pairs, transaction_records)
+
+
+class PipelinedTransactionReaderTest(unittest.TestCase):
+    """
+    Unit tests for reading transaction records on a background thread.
+    """
+
+    def test_ptr01_pipelined_run_matches_serial_run(self):
+        """
+        PTR01_Pipelined_Run_Matches_Serial_Run
+
+        A pipelined backend run writes the same files and the same rejects as a
+        serial run.
+        """
+        account_pairs, transaction_records = build_random_workload(3, 3000)
+        with tempfile.TemporaryDirectory() as directory:
+            master_file = os.path.join(directory, "master.txt")
+            write_master_file(master_file, account_pairs)
+            transactions_file = os.path.join(directory, "transactions.txt")
+            with open(transactions_file, "w") as file:
+                file.write("\n".join(transaction_records) + "\n")
+
+            outputs = []
+            for pipelined in (False, True):
+                output_files = [
+                    os.path.join(directory, f"{pipelined}_{name}")
+                    for name in ("new_master.txt", "current.txt", "rejects.jsonl")
+                ]
+                with redirect_stdout(io.StringIO()):
+                    BankingSystemBackend(
+                        master_file,
+                        transactions_file,
+                        output_files[0],
+                        output_files[1],
+                        rejects_file=output_files[2],
+                        pipelined=pipelined,
+                    ).run()
+                contents = []
+                for output_file in output_files:
+                    with open(output_file, "r") as file:
+                        contents.append(file.read())
+                outputs.append(contents)
+
+        self.assertEqual(outputs[1], outputs[0])
+
+    def test_ptr02_reader_errors_follow_earlier_records(self):
+        """
+        PTR02_Reader_Errors_Follow_Earlier_Records
+
+        An error in the reader thread is raised only after every record read before
+        it has been handed over, through a queue smaller than the file.
+        """
+        transaction_record = "04 John Doe             00001 00010.00 00"
+
+        def iter_numbered_transaction_records():
+            for line_number in range(1, 51):
+                yield line_number, transaction_record
+            raise OSError("Read failed")
+
+        reader = types.SimpleNamespace(
+            iter_numbered_transaction_records=iter_numbered_transaction_records
+        )
+        pipeline = PipelinedTransactionReader(reader, batch_records=4, queue_batches=2)
+        line_numbers = []
+        with self.assertRaises(OSError):
+            for batch in pipeline.iter_batches():
+                time.sleep(0.001)
+                for line_number, record, transaction in batch:
+                    self.assertEqual(record, transaction_record)
+                    self.assertEqual(transaction[2], "00001")
+                    line_numbers.append(line_number)
+
+        self.assertEqual(line_numbers, list(range(1, 51)))
+
+
+class RejectionLogTest(unittest.TestCase):
+    """
+    Unit tests for the rejection log and the line numbers it records.
+    """
+
+    def setUp(self):
+        """
+        Creates a temporary rejects file path.
+        """
+        file = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False)
+        file.close()
+        self.rejects_file = file.name
+
+    def tearDown(self):
+        """
+        Removes the temporary rejects file.
+        """
+        os.remove(self.rejects_file)
+
+    def test_rl01_rejections_written_as_json_lines(self):
+        """
+        RL01_Rejections_Written_As_JSON_Lines
+
+        With a rejects file, rejections are written as JSON lines with the line number,
+        record and reason, counted by reason, and nothing is printed.
+        """
+        accounts = BankAccounts()
+        accounts.add_account("12345", Account("John Doe", "A", 500, 0))
+        accounts.add_account("54321", Account("Jane Doe", "D", 500, 0))
+        accounts.rejections = RejectionLog(self.rejects_file)
+        processor = TransactionProcessor(accounts)
+        transaction_records = [
+            "01 John Doe             12345 00010.00 00",
+            "04 Jane Doe             54321 00001.00 00",
+            "01 John Doe             12345 00001.00 00",
+        ]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            for line_number, transaction_record in enumerate(transaction_records, 1):
+                accounts.rejections.line_number = line_number
+                accounts.rejections.record = transaction_record
+                processor.process_transaction(transaction_record)
+            accounts.rejections.close()
+
+        with open(self.rejects_file, "r") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(
+            [(entry["line"], entry["record"], entry["reason"]) for entry in entries],
+            [
+                (1, transaction_records[0], INSUFFICIENT_FUNDS),
+                (2, transaction_records[1], ACCOUNT_DISABLED),
+            ],
+        )
+        self.assertEqual(
+            accounts.rejections.summary()[:3],
+            [
+                "2 transaction(s) rejected.",
+                f"  {ACCOUNT_DISABLED}: 1",
+                f"  {INSUFFICIENT_FUNDS}: 1",
+            ],
+        )
+
+    def test_rl02_line_numbers_count_blank_lines(self):
+        """
+        RL02_Line_Numbers_Count_Blank_Lines
+
+        Blank lines are skipped but still counted, both when reading records and when
+        reading them with their offsets, so line numbers match the input file.
+        """
+        with open(self.rejects_file, "w") as file:
+            file.write("04 A\n\n04 B\n" * 20)
+        expected = [(3 * index + 1, "04 A") for index in range(20)]
+        expected += [(3 * index + 3, "04 B") for index in range(20)]
+        expected.sort()
+
+        self.assertEqual(
+            list(
+                TransactionFileReader(
+                    self.rejects_file
+                ).iter_numbered_transaction_records()
+            ),
+            expected,
+        )
+        self.assertEqual(
+            [
+                (line_number, transaction_record)
+                for line_number, _, transaction_record in TransactionFileReader(
+                    self.rejects_file
+                ).iter_positioned_transaction_records()
+            ],
+            expected,
+        )
+
+    def test_rl03_invalid_transfer_source_rejected_once(self):
+        """
+        RL03_Invalid_Transfer_Source_Rejected_Once
+
+        A transfer from a disabled account is one rejection, in the rejects file and
+        in the counts, and still prints both error lines without a rejects file.
+        """
+        transaction_record = "02 Jane Doe             54321 00001.00 12"
+        outputs = []
+        for rejects_file in (self.rejects_file, None):
+            accounts = BankAccounts()
+            accounts.add_account("12345", Account("Jane Doe", "A", 500, 0))
+            accounts.add_account("54321", Account("Jane Doe", "D", 500, 0))
+            accounts.rejections = RejectionLog(rejects_file)
+            accounts.rejections.line_number = 1
+            accounts.rejections.record = transaction_record
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                TransactionProcessor(accounts).process_transaction(transaction_record)
+                accounts.rejections.close()
+            outputs.append(output.getvalue())
+            self.assertEqual(accounts.rejections.counts, {ACCOUNT_DISABLED: 1})
+            self.assertEqual(
+                accounts.rejections.summary()[0], "1 transaction(s) rejected."
+            )
+
+        with open(self.rejects_file, "r") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(
+            [(entry["line"], entry["reason"]) for entry in entries],
+            [(1, ACCOUNT_DISABLED)],
+        )
+        self.assertEqual(
+            outputs,
+            [
+                "",
+                "ERROR: Account 54321 is disabled.\n"
+                "ERROR: Source account 54321 not found.\n",
+            ],
+        )
 
 
 if __name__ == "__main__":
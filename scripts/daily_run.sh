@@ -3,11 +3,12 @@
 # Daily integration script for the Banking System.
 #
 # This script:
-# 1. Runs the frontend once for each session input file for a given day.
+# 1. Replays every session input file for a given day through the frontend, in
+#    one batch that loads the current bank accounts file once.
 # 2. Writes a separate 'bank account transaction' file for each session.
-# 3. Concatenates the session's 'bank account transaction' files into a 
-#    single 'merged bank account transactions' file.
-# 4. Runs the backend using the 'merged bank account transactions' file.
+# 3. Runs the backend over the session's 'bank account transaction' files, merged
+#    in session order as they are read. The 'merged bank account transactions'
+#    file is written alongside, for audit.
 
 set -e
 shopt -s nullglob
@@ -43,44 +44,26 @@ rm -f "$MERGED_BANK_ACCOUNT_TRANSACTIONS_FILE"
 rm -f "$NEW_MASTER_BANK_ACCOUNTS_FILE"
 rm -f "$NEW_CURRENT_BANK_ACCOUNTS_FILE"
 
-session_files=("$DAY_SESSION_INPUTS"/*.input)
-
-if [ ${#session_files[@]} -eq 0 ]; then
-    echo "ERROR: No session input files found in '$DAY_SESSION_INPUTS'."
-    exit 1
-fi
-
 echo "Running frontend session input files from '$DAY_SESSION_INPUTS'..."
 
-session_number=1
-
-for session_input in "${session_files[@]}"
-do
-    echo "Running session $session_number using '$(basename "$session_input")' file..."
-
-    (
-        cd "$FRONTEND_SRC"
-        python banking_system_frontend.py \
-            "$CURRENT_BANK_ACCOUNTS_FILE" \
-            "$FRONTEND_OUTPUTS/daily_session_outputs/session_${session_number}.txt" \
-            < "$session_input" \
-            > "$FRONTEND_OUTPUTS/daily_session_outputs/session_${session_number}.out"
-    )
-
-    session_number=$((session_number + 1))
-done
+(
+    cd "$FRONTEND_SRC"
+    python session_batch_runner.py \
+        "$CURRENT_BANK_ACCOUNTS_FILE" \
+        "$DAY_SESSION_INPUTS" \
+        "$FRONTEND_OUTPUTS/daily_session_outputs"
+)
 
-echo "Merging daily 'bank account transaction' files..."
-cat "$FRONTEND_OUTPUTS"/daily_session_outputs/session_*.txt > "$MERGED_BANK_ACCOUNT_TRANSACTIONS_FILE"
-echo "Running backend using the 'merged bank account transaction' file..."
+echo "Running backend using the merged 'bank account transaction' files..."
 
 (
     cd "$BACKEND_SRC"
-    python banking_system_backend.py \
+    python session_merge_backend.py \
         "$MASTER_BANK_ACCOUNTS_FILE" \
-        "$MERGED_BANK_ACCOUNT_TRANSACTIONS_FILE" \
         "$NEW_MASTER_BANK_ACCOUNTS_FILE" \
-        "$NEW_CURRENT_BANK_ACCOUNTS_FILE"
+        "$NEW_CURRENT_BANK_ACCOUNTS_FILE" \
+        "$FRONTEND_OUTPUTS/daily_session_outputs" \
+        --merged-file "$MERGED_BANK_ACCOUNT_TRANSACTIONS_FILE"
 )
 
 echo "Daily run completed."